@@ -30,12 +30,19 @@ target_metadata = Base.metadata
 # Remplacer l'URL de la base de données par celle de la configuration
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
+def include_name(name, type_, parent_names):
+    """Ignorer la table virtuelle FTS5 et ses tables internes (gérées par des migrations écrites à la main)."""
+    if type_ == "table":
+        return not name.startswith("book_fts")
+    return True
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -53,7 +60,8 @@ def run_migrations_online():
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
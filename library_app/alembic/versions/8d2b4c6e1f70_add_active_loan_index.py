@@ -0,0 +1,32 @@
+"""Add active loan index
+
+Revision ID: 8d2b4c6e1f70
+Revises: 5c1f0e7a9b32
+Create Date: 2026-10-18 14:05:27.318920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2b4c6e1f70'
+down_revision: Union[str, None] = '5c1f0e7a9b32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_loan_active_user_book', 'loan', ['user_id', 'book_id'], unique=False,
+        sqlite_where=sa.text('return_date IS NULL'),
+        postgresql_where=sa.text('return_date IS NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_loan_active_user_book', table_name='loan')
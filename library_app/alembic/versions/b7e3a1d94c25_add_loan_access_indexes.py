@@ -0,0 +1,37 @@
+"""Add loan access indexes
+
+Revision ID: b7e3a1d94c25
+Revises: 8d2b4c6e1f70
+Create Date: 2026-10-18 16:42:09.603417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3a1d94c25'
+down_revision: Union[str, None] = '8d2b4c6e1f70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_loan_loan_date', 'loan', ['loan_date'], unique=False)
+    op.create_index(
+        'idx_loan_active_due_date', 'loan', ['due_date'], unique=False,
+        sqlite_where=sa.text('return_date IS NULL'),
+        postgresql_where=sa.text('return_date IS NULL')
+    )
+    # Remplacé par les index partiels sur les emprunts en cours
+    op.drop_index('idx_loan_return_date', table_name='loan')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_loan_return_date', 'loan', ['return_date'], unique=False)
+    op.drop_index('idx_loan_active_due_date', table_name='loan')
+    op.drop_index('idx_loan_loan_date', table_name='loan')
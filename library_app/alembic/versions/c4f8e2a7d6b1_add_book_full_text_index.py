@@ -0,0 +1,66 @@
+"""Add book full-text index
+
+Revision ID: c4f8e2a7d6b1
+Revises: b7e3a1d94c25
+Create Date: 2026-10-18 19:27:44.150862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8e2a7d6b1'
+down_revision: Union[str, None] = 'b7e3a1d94c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS book_fts USING fts5(
+            title, author, isbn, description,
+            content='book', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_insert AFTER INSERT ON book BEGIN
+            INSERT INTO book_fts (rowid, title, author, isbn, description)
+            VALUES (new.id, new.title, new.author, new.isbn, new.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_delete AFTER DELETE ON book BEGIN
+            INSERT INTO book_fts (book_fts, rowid, title, author, isbn, description)
+            VALUES ('delete', old.id, old.title, old.author, old.isbn, old.description);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS book_fts_update AFTER UPDATE OF title, author, isbn, description ON book BEGIN
+            INSERT INTO book_fts (book_fts, rowid, title, author, isbn, description)
+            VALUES ('delete', old.id, old.title, old.author, old.isbn, old.description);
+            INSERT INTO book_fts (rowid, title, author, isbn, description)
+            VALUES (new.id, new.title, new.author, new.isbn, new.description);
+        END
+        """
+    )
+    # Indexer les livres existants
+    op.execute("INSERT INTO book_fts (book_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS book_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS book_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS book_fts_insert")
+    op.execute("DROP TABLE IF EXISTS book_fts")
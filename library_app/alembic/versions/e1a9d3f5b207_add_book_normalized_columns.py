@@ -0,0 +1,76 @@
+"""Add book normalized search columns
+
+Revision ID: e1a9d3f5b207
+Revises: c4f8e2a7d6b1
+Create Date: 2026-10-18 21:05:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import unicodedata
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a9d3f5b207'
+down_revision: Union[str, None] = 'c4f8e2a7d6b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Livres normalisés par requête lors du remplissage des colonnes (toute la migration
+# s'exécute dans une seule transaction : les lots bornent la mémoire, pas la transaction)
+BATCH_SIZE = 1000
+
+# Copie figée de src/utils/search.py:normalize_text à la date de la migration :
+# une évolution ultérieure de l'application ne change pas ce qui est rempli ici
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE"})
+
+
+def _normalize_text(text):
+    if text is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('book', sa.Column('title_norm', sa.String(length=100), nullable=True))
+    op.add_column('book', sa.Column('author_norm', sa.String(length=100), nullable=True))
+
+    # Remplissage par lots, dans l'ordre des clés : chaque lot reprend après le dernier ID traité
+    book = sa.table('book', sa.column('id'), sa.column('title'), sa.column('author'),
+                    sa.column('title_norm'), sa.column('author_norm'))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(book.c.id, book.c.title, book.c.author)
+            .where(book.c.id > last_id).order_by(book.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            book.update().where(book.c.id == sa.bindparam('book_id')).values(
+                title_norm=sa.bindparam('title_norm'), author_norm=sa.bindparam('author_norm')
+            ),
+            [
+                {'book_id': id, 'title_norm': _normalize_text(title), 'author_norm': _normalize_text(author)}
+                for id, title, author in rows
+            ]
+        )
+        last_id = rows[-1].id
+
+    op.create_index(op.f('ix_book_title_norm'), 'book', ['title_norm'], unique=False)
+    op.create_index(op.f('ix_book_author_norm'), 'book', ['author_norm'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_book_author_norm'), table_name='book')
+    op.drop_index(op.f('ix_book_title_norm'), table_name='book')
+    # ALTER TABLE ... DROP COLUMN plutôt qu'une recopie de la table : les triggers de book_fts sont conservés
+    op.drop_column('book', 'author_norm')
+    op.drop_column('book', 'title_norm')
@@ -0,0 +1,78 @@
+"""Add book trigram index
+
+Revision ID: f3b8c1d2e4a6
+Revises: e1a9d3f5b207
+Create Date: 2026-10-18 23:12:05.730214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import re
+import unicodedata
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c1d2e4a6'
+down_revision: Union[str, None] = 'e1a9d3f5b207'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Livres indexés par lot lors du remplissage de la table
+BATCH_SIZE = 1000
+
+# Copie figée de src/utils/search.py:trigrams (et de normalize_text) à la date de
+# la migration : une évolution ultérieure de l'application ne change pas ce qui est rempli ici
+_WORD = re.compile(r"\w+", re.UNICODE)
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE"})
+
+
+def _trigrams(text):
+    if text is None:
+        return set()
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    grams = set()
+    for word in _WORD.findall(" ".join(stripped.casefold().split())):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    book_trigram = op.create_table(
+        'book_trigram',
+        sa.Column('trigram', sa.String(length=3), nullable=False),
+        sa.Column('book_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['book_id'], ['book.id'], ),
+        sa.PrimaryKeyConstraint('trigram', 'book_id'),
+        sqlite_with_rowid=False
+    )
+
+    # Remplissage par lots, dans l'ordre des clés : chaque lot reprend après le dernier ID traité
+    book = sa.table('book', sa.column('id'), sa.column('title'), sa.column('author'))
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(book.c.id, book.c.title, book.c.author)
+            .where(book.c.id > last_id).order_by(book.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(book_trigram.insert(), [
+            {'trigram': gram, 'book_id': id}
+            for id, title, author in rows
+            for gram in sorted(_trigrams(title) | _trigrams(author))
+        ])
+        last_id = rows[-1].id
+
+    op.create_index('idx_book_trigram_book_id', 'book_trigram', ['book_id', 'trigram'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_book_trigram_book_id', table_name='book_trigram')
+    op.drop_table('book_trigram')
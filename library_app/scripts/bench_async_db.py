@@ -0,0 +1,139 @@
+# scripts/bench_async_db.py
+"""
+Compare le débit de GET /books/ et GET /loans/ entre les routes synchrones
+(session SQLAlchemy dans le pool de threads) et les routes asynchrones (aiosqlite).
+
+Usage : python scripts/bench_async_db.py [nombre_de_requêtes] [concurrence]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.dependencies import get_current_active_user, get_current_admin_user
+from src.api.schemas.books import Book
+from src.api.schemas.loans import Loan
+from src.db.session import get_async_db, get_db
+from src.main import app
+from src.models.base import Base
+from src.models.books import Book as BookModel
+from src.models.loans import Loan as LoanModel
+from src.models.users import User
+from src.repositories.loans import LoanRepository
+from src.utils.pagination import Page, PaginationParams, paginate
+from src.utils.security import create_access_token
+
+# Routes synchrones de référence, identiques aux routes de l'API avant le passage en async def
+sync_app = FastAPI()
+
+
+@sync_app.get("/api/v1/books/", response_model=Page[Book])
+def read_books_sync(
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    sort_by: Optional[str] = Query(None),
+    sort_desc: bool = Query(False),
+    current_user = Depends(get_current_active_user)
+) -> Any:
+    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
+    return paginate(db.query(BookModel), params, BookModel)
+
+
+@sync_app.get("/api/v1/loans/", response_model=List[Loan])
+def read_loans_sync(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = 100,
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    return LoanRepository(LoanModel, db).get_multi(skip=skip, limit=limit)
+
+
+async def run(target: FastAPI, url: str, headers: dict, requests: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=target)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(url, headers=headers)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(one() for _ in range(concurrency)))  # chauffe
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    admin = User(email="bench@example.com", hashed_password="x", full_name="Bench", is_active=True, is_admin=True)
+    db.add(admin)
+    books = [
+        BookModel(title=f"Livre {i}", author="Auteur", isbn=f"{i:013d}", publication_year=2000, quantity=1)
+        for i in range(200)
+    ]
+    db.add_all(books)
+    db.flush()
+    now = datetime.utcnow()
+    db.add_all(
+        LoanModel(user_id=admin.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14))
+        for book in books
+    )
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=admin.id)}"}
+    db.close()
+
+    def get_bench_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    async def get_bench_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    for target in (app, sync_app):
+        target.dependency_overrides[get_db] = get_bench_db
+        target.dependency_overrides[get_async_db] = get_bench_async_db
+
+    async def compare():
+        # Une seule boucle d'événements : le pool du moteur asynchrone lui est lié
+        print(f"{requests} requêtes, {concurrency} clients simultanés")
+        for url in ("/api/v1/books/?limit=20", "/api/v1/loans/?limit=20"):
+            for label, target in (("sync", sync_app), ("async", app)):
+                throughput = await run(target, url, headers, requests, concurrency)
+                print(f"{url:<26} {label:<6} {throughput:8.0f} req/s")
+        await async_engine.dispose()
+
+    asyncio.run(compare())
+
+
+if __name__ == "__main__":
+    main()
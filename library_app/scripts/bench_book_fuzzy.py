@@ -0,0 +1,134 @@
+# scripts/bench_book_fuzzy.py
+"""
+Mesure la recherche tolérante aux fautes de frappe (trigrammes, fuzzy=true de
+/books/search/) sur un catalogue généré : titres saisis avec une lettre
+doublée, omise ou remplacée, comparés à l'index plein texte et à un comptage
+des trigrammes partagés sans filtrage par préfixe (toutes les listes de livres
+des trigrammes de la saisie sont lues). Pour chaque méthode : latence et part
+des saisies dont le livre d'origine figure parmi les 10 premiers résultats.
+
+Usage : python scripts/bench_book_fuzzy.py [livres] [recherches]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book, book_trigram
+from src.repositories.books import BookRepository, trigram_rows, with_normalized_columns
+from src.utils.search import trigrams
+
+CONSONANTS = "bcdfghjlmnprstvz"
+VOWELS = "aeiouéè"
+AUTHORS = ("Hugo", "Zola", "Camus", "Sand", "Verne", "Duras", "Proust", "Colette", "Balzac", "Flaubert")
+
+
+def prepare(path: str, books: int):
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine, "bulk-load")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+
+    def word():
+        # Syllabes consonne-voyelle(-consonne) : des trigrammes variés, comme un vrai catalogue
+        return "".join(
+            rng.choice(CONSONANTS) + rng.choice(VOWELS) + (rng.choice(CONSONANTS) if rng.random() < 0.3 else "")
+            for _ in range(rng.randint(2, 3))
+        )
+
+    titles = []
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, books, batch):
+            rows = [
+                with_normalized_columns({
+                    "id": i + 1,
+                    "title": " ".join(word() for _ in range(rng.randint(1, 4))).capitalize(),
+                    "author": f"{rng.choice(AUTHORS)} {word().capitalize()}",
+                    "isbn": f"{9780000000000 + i}",
+                    "publication_year": 2000,
+                    "quantity": 1,
+                })
+                for i in range(start, min(start + batch, books))
+            ]
+            conn.execute(insert(Book), rows)
+            conn.execute(insert(book_trigram), [
+                gram for row in rows for gram in trigram_rows(row["id"], row["title"], row["author"])
+            ])
+            titles.extend(row["title"] for row in rows)
+        conn.exec_driver_sql("ANALYZE")
+    return engine, titles
+
+
+def misspell(rng: random.Random, text: str) -> str:
+    position = rng.randrange(len(text))
+    change = rng.choice(("double", "drop", "replace"))
+    if change == "double":
+        return text[:position + 1] + text[position:]
+    if change == "drop" and len(text) > 3:
+        return text[:position] + text[position + 1:]
+    return text[:position] + rng.choice("aeiou") + text[position + 1:]
+
+
+def unfiltered_scores(db: Session, query: str):
+    # Référence : comptage sur toutes les listes de livres des trigrammes de la saisie
+    grams = sorted(trigrams(query))
+    required = len(grams) * settings.FUZZY_SIMILARITY_THRESHOLD
+    shared = func.count().label("shared")
+    return db.execute(
+        select(book_trigram.c.book_id, shared).where(book_trigram.c.trigram.in_(grams))
+        .group_by(book_trigram.c.book_id).having(func.count() >= required)
+        .order_by(shared.desc(), book_trigram.c.book_id)
+    ).all()
+
+
+def measure(run, queries):
+    timings, found = [], 0
+    for query, book_id in queries:
+        start = time.perf_counter()
+        results = run(query)
+        timings.append((time.perf_counter() - start) * 1000)
+        found += book_id in results[:10]
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)], found / len(queries)
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    books = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    searches = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    engine, titles = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), books)
+    rng = random.Random(7)
+    queries = []
+    for _ in range(searches):
+        book_id = rng.randint(1, books)
+        queries.append((misspell(rng, titles[book_id - 1]), book_id))
+
+    with Session(engine) as db:
+        repository = BookRepository(Book, db)
+        trigram_count = db.scalar(select(func.count()).select_from(book_trigram))
+        print(f"{books} livres, {trigram_count} lignes de trigrammes, {searches} saisies avec une faute")
+        print(f"  {'':<28} {'médiane':>9} {'p99':>9}   livre retrouvé (10 premiers)")
+        for label, run in (
+            ("plein texte (FTS5)", lambda query: [book.id for book in repository.search(query)]),
+            ("trigrammes sans préfixe", lambda query: [book_id for book_id, _ in unfiltered_scores(db, query)]),
+            ("trigrammes (fuzzy=true)", lambda query: [book_id for book_id, _ in repository.fuzzy_scores(query)]),
+        ):
+            median, p99, found = measure(run, queries)
+            print(f"  {label:<28} {median:7.2f} ms {p99:7.2f} ms   {found:.0%}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
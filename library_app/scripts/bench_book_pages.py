@@ -0,0 +1,107 @@
+# scripts/bench_book_pages.py
+"""
+Compare la pagination par OFFSET/LIMIT (skip) à la pagination par curseur
+(next_cursor) de /books/ sur un catalogue généré de 1 000 000 livres : durée
+d'une page de 100 livres à la page 1, 100, 1 000 et 10 000, selon le tri.
+
+Le curseur de la page n est celui renvoyé avec la page n - 1 (next_cursor), comme
+le ferait un client. Les pages par OFFSET comptent le total ; les pages par curseur
+ne le comptent pas (with_total=False, valeur par défaut des routes).
+
+Usage : python scripts/bench_book_pages.py [livres]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, selectinload
+
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book
+from src.repositories.books import with_normalized_columns
+from src.utils.pagination import PaginationParams, paginate
+
+SYLLABLES = ("ma", "ri", "lo", "pe", "tu", "ca", "ne", "so", "vi", "da", "ro", "li", "mé", "zé", "fa", "gu", "pa", "te")
+AUTHORS = ("Hugo", "Zola", "Camus", "Sand", "Verne", "Duras", "Proust", "Colette", "Balzac", "Flaubert")
+PAGE_SIZE = 100
+
+
+def prepare(path: str, books: int):
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine, "bulk-load")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+
+    def word():
+        return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, books, batch):
+            conn.execute(insert(Book), [
+                with_normalized_columns({
+                    "title": " ".join(word() for _ in range(rng.randint(1, 4))).capitalize(),
+                    "author": f"{rng.choice(AUTHORS)} {word().capitalize()}",
+                    "isbn": f"{9780000000000 + i}",
+                    "publication_year": 2000,
+                    "quantity": 1,
+                })
+                for i in range(start, min(start + batch, books))
+            ])
+        conn.exec_driver_sql("ANALYZE")
+    return engine
+
+
+def timed(db: Session, params: PaginationParams, repeat: int = 3):
+    # Même requête que la route /books/ (catégories chargées avec les livres)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = paginate(db.query(Book).options(selectinload(Book.categories)), params, Book)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return page, best
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    books = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    started = time.perf_counter()
+    engine = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), books)
+    print(f"{books} livres (chargement : {time.perf_counter() - started:.0f} s), pages de {PAGE_SIZE}")
+
+    depths = [depth for depth in (1, 100, 1_000, 10_000) if (depth - 1) * PAGE_SIZE < books]
+    with Session(engine) as db:
+        print(f"  {'':<22} {'page':>7} {'offset':>10} {'curseur':>10}   (ms par page)")
+        for label, sort_by, sort_desc in (
+            ("identifiant", None, False),
+            ("titre", "title_norm", False),
+            ("auteur décroissant", "author_norm", True),
+        ):
+            for depth in depths:
+                params = PaginationParams(skip=(depth - 1) * PAGE_SIZE, limit=PAGE_SIZE, sort_by=sort_by, sort_desc=sort_desc)
+                page, offset = timed(db, params)
+                if depth == 1:
+                    print(f"  {label:<22} {depth:>7} {offset:10.1f} {'-':>10}")
+                    continue
+                # Curseur renvoyé avec la page précédente
+                previous, _ = timed(db, PaginationParams(
+                    skip=(depth - 2) * PAGE_SIZE, limit=PAGE_SIZE, sort_by=sort_by, sort_desc=sort_desc
+                ), repeat=1)
+                params = PaginationParams(limit=PAGE_SIZE, sort_by=sort_by, sort_desc=sort_desc, cursor=previous.next_cursor)
+                seek, cursor = timed(db, params)
+                assert [book.id for book in seek.items] == [book.id for book in page.items]
+                print(f"  {label:<22} {depth:>7} {offset:10.1f} {cursor:10.1f}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# scripts/bench_book_search.py
+"""
+Compare la recherche de livres par ilike('%q%') (ancien chemin de /books/search/)
+à la recherche plein texte FTS5 (match_books, classement bm25), sur un catalogue
+généré de 100 000 puis 1 000 000 livres.
+
+Chaque recherche reproduit la route : nombre total de résultats puis première page de 100.
+
+Usage : python scripts/bench_book_search.py [tailles_de_catalogue...]
+"""
+import itertools
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book
+from src.repositories.books import match_books
+from src.utils.search import fts_match_query
+
+SYLLABLES = ("ma", "ri", "lo", "pe", "tu", "ca", "ne", "so", "vi", "da", "ro", "li", "mé", "zé", "fa", "gu", "pa", "te")
+AUTHORS = ("Hugo", "Zola", "Camus", "Sand", "Verne", "Duras", "Proust", "Colette", "Balzac", "Flaubert")
+
+
+def vocabulary(rng: random.Random, size: int = 20_000):
+    # Mots de 2 à 4 syllabes : fréquences proches d'un vrai catalogue (peu de mots très fréquents)
+    words = {"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size * 2)}
+    return sorted(words)[:size]
+
+
+PAGE_SIZE = 100
+
+
+def prepare(path: str, books: int):
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine, "bulk-load")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+    words = vocabulary(rng)
+    # Loi de Zipf approchée : les premiers mots sont bien plus fréquents
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    batch = 50_000
+    with engine.begin() as conn:
+        for start in range(0, books, batch):
+            conn.execute(insert(Book), [
+                {
+                    "title": " ".join(rng.choices(words, cum_weights=weights, k=3)).capitalize(),
+                    "author": f"{rng.choice(AUTHORS)} {i}",
+                    "isbn": f"{9780000000000 + i}",
+                    "publication_year": rng.randint(1900, 2020),
+                    "description": " ".join(rng.choices(words, cum_weights=weights, k=20)),
+                    "quantity": 1,
+                }
+                for i in range(start, min(start + batch, books))
+            ])
+    return engine, words
+
+
+def ilike_search(query: str):
+    return select(Book.id).filter(or_(
+        Book.title.ilike(f"%{query}%"),
+        Book.author.ilike(f"%{query}%"),
+        Book.isbn.ilike(f"%{query}%"),
+        Book.description.ilike(f"%{query}%"),
+    ))
+
+
+def fts_search(query: str):
+    return match_books(select(Book.id), fts_match_query(query))
+
+
+def measure(engine, build, query: str, repeat: int) -> float:
+    with Session(engine) as db:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            statement = build(query)
+            db.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+            db.scalars(statement.limit(PAGE_SIZE)).all()
+        return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    sizes = [int(size) for size in sys.argv[1:]] or [100_000, 1_000_000]
+    for books in sizes:
+        started = time.perf_counter()
+        engine, words = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), books)
+        print(f"{books} livres (chargement et indexation : {time.perf_counter() - started:.0f} s)")
+        queries = (
+            ("mot présent partout", words[0]),
+            ("mot courant", words[500]),
+            ("mot rare", words[5000]),
+            ("début de mot", words[3000][:3]),
+            ("auteur", "hugo 12"),
+            ("deux mots", f"{words[10]} {words[200]}"),
+        )
+        print(f"  {'':<20} {'ilike':>10} {'fts5':>10}   (ms par recherche)")
+        for label, query in queries:
+            legacy = measure(engine, ilike_search, query, repeat=1)
+            print(f"  {label:<20} {legacy:10.1f} {measure(engine, fts_search, query, repeat=3):10.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# scripts/bench_book_suggest.py
+"""
+Mesure l'index d'autocomplétion de /books/suggest sur un catalogue généré :
+durée de construction depuis la base, mémoire occupée, latence des
+suggestions (10 meilleurs résultats) selon la longueur du préfixe saisi, et
+coût d'une mise à jour incrémentale.
+
+Usage : python scripts/bench_book_suggest.py [livres] [emprunts]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository, book_suggestions, with_normalized_columns
+from src.utils.suggest import suggestion_keys
+
+SYLLABLES = ("ma", "ri", "lo", "pe", "tu", "ca", "ne", "so", "vi", "da", "ro", "li", "mé", "zé", "fa", "gu", "pa", "te")
+AUTHORS = ("Hugo", "Zola", "Camus", "Sand", "Verne", "Duras", "Proust", "Colette", "Balzac", "Flaubert")
+
+
+def prepare(path: str, books: int, loans: int):
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine, "bulk-load")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(42)
+
+    def word():
+        return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x", "full_name": "Bench"}])
+        conn.execute(insert(Book), [
+            {
+                **with_normalized_columns({
+                    "title": " ".join(word() for _ in range(rng.randint(1, 4))).capitalize(),
+                    "author": f"{rng.choice(AUTHORS)} {word().capitalize()}",
+                }),
+                "isbn": f"{9780000000000 + i}",
+                "publication_year": 2000,
+                "quantity": 1,
+            }
+            for i in range(books)
+        ])
+        # Popularité très inégale : quelques livres concentrent les emprunts
+        conn.execute(insert(Loan), [
+            {"user_id": 1, "book_id": min(int(rng.paretovariate(1.2)), books), "loan_date": now,
+             "due_date": now + timedelta(days=14), "return_date": now}
+            for _ in range(loans)
+        ])
+    return engine
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    books = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    loans = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    engine = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), books, loans)
+
+    with Session(engine) as db:
+        start = time.perf_counter()
+        BookRepository(Book, db).rebuild_suggestions()
+        elapsed = time.perf_counter() - start
+    stats = book_suggestions.stats()
+    print(f"{books} livres, {loans} emprunts, {stats['keys']} clés")
+    print(f"construction {elapsed * 1000:.0f} ms (dont tri et arbre {stats['build_seconds'] * 1000:.0f} ms)   "
+          f"mémoire {stats['memory_bytes'] / 1024 / 1024:.1f} Mo")
+
+    rng = random.Random(7)
+    prefixes = {
+        "1 caractère": [rng.choice("mrlpcnsvdzfgt") for _ in range(500)],
+        "3 caractères": ["".join(rng.choices(SYLLABLES, k=2))[:3] for _ in range(500)],
+        "mot entier": ["".join(rng.choices(SYLLABLES, k=3)) for _ in range(500)],
+        "auteur": [rng.choice(AUTHORS)[:4] for _ in range(500)],
+        "ISBN": [f"978000{rng.randint(0, 9999)}" for _ in range(500)],
+    }
+    for label, queries in prefixes.items():
+        timings = []
+        for prefix in queries:
+            start = time.perf_counter()
+            book_suggestions.search(prefix, limit=10)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"  {label:<14} médiane {timings[len(timings) // 2]:.3f} ms   p99 {timings[int(len(timings) * 0.99)]:.3f} ms")
+
+    # Écritures : zone d'attente (fusion en arrière-plan au-delà de SUGGEST_MAX_PENDING)
+    start = time.perf_counter()
+    for book_id in range(1, 1001):
+        book_suggestions.add(book_id, suggestion_keys(f"Nouveau titre {book_id}", "Auteur"), {"id": book_id})
+    elapsed = time.perf_counter() - start
+    print(f"1000 mises à jour : {elapsed / 1000 * 1000:.3f} ms en moyenne")
+    start = time.perf_counter()
+    book_suggestions.compact()
+    print(f"fusion de la zone d'attente : {(time.perf_counter() - start) * 1000:.0f} ms (recherches servies pendant la fusion)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
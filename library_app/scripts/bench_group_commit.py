@@ -0,0 +1,106 @@
+# scripts/bench_group_commit.py
+"""
+Mesure le débit de création d'emprunts (emprunts/s) par l'écrivain unique,
+avec un commit par emprunt puis avec le commit groupé.
+
+Usage : python scripts/bench_group_commit.py [nombre_d_emprunts] [threads] [profil_sqlite]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.db.sqlite import configure_sqlite, enable_sqlite_savepoints
+from src.db.writer import WriteCoordinator
+from src.models.base import Base
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+
+
+def prepare(path: str, profile: str, loans: int) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0)
+    configure_sqlite(engine, profile)
+    enable_sqlite_savepoints(engine)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    db = factory()
+    # Un emprunt par utilisateur : la limite de 5 emprunts actifs n'intervient pas
+    db.add_all(
+        User(email=f"user{i}@example.com", hashed_password="x", full_name="Bench", is_active=True)
+        for i in range(loans)
+    )
+    db.add(Book(title="Livre", author="Auteur", isbn="9782070612758", publication_year=2000, quantity=loans))
+    db.commit()
+    db.close()
+    return factory
+
+
+def run(factory: sessionmaker, loans: int, threads: int, group_commit: bool) -> dict:
+    coordinator = WriteCoordinator(factory, group_commit=group_commit)
+    coordinator.start()
+    user_ids = iter(range(1, loans + 1))
+    lock = threading.Lock()
+
+    def create_loan(user_id: int):
+        def unit(session: Session) -> Loan:
+            service = LoanService(
+                LoanRepository(Loan, session), BookRepository(Book, session), UserRepository(User, session)
+            )
+            return service.create_loan(user_id=user_id, book_id=1)
+        return unit
+
+    def worker():
+        while True:
+            with lock:
+                user_id = next(user_ids, None)
+            if user_id is None:
+                return
+            coordinator.run(create_loan(user_id))
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    coordinator.stop()
+    stats = coordinator.stats()
+    stats["loans_per_second"] = loans / elapsed
+    return stats
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    loans = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    profile = sys.argv[3] if len(sys.argv) > 3 else "safe"
+
+    print(f"{loans} emprunts, {threads} threads, profil SQLite {profile}")
+    for label, group_commit in (("commit par emprunt", False), ("commit groupé", True)):
+        factory = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), profile, loans)
+        stats = run(factory, loans, threads, group_commit)
+        print(
+            f"{label:<20} {stats['loans_per_second']:8.0f} emprunts/s   "
+            f"commits {stats['commits']:5d}   lot moyen {stats['avg_batch_size']:5.1f}   "
+            f"attente moyenne {stats['avg_wait_ms']:6.2f} ms"
+        )
+        factory.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    main()
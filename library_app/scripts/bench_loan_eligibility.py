@@ -0,0 +1,116 @@
+# scripts/bench_loan_eligibility.py
+"""
+Mesure le coût des vérifications d'éligibilité de create_loan (emprunt déjà en
+cours, limite de 5 emprunts actifs) sur une base de 100 000 emprunts actifs :
+chargement de tous les emprunts actifs, requêtes EXISTS/COUNT sans index,
+puis avec l'index partiel idx_loan_active_user_book.
+
+Usage : python scripts/bench_loan_eligibility.py [emprunts_actifs] [vérifications]
+"""
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.loans import LoanRepository
+
+LOANS_PER_USER = 4
+BOOKS = 1000
+
+
+def prepare(path: str, active_loans: int) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine, "bulk-load")
+    Base.metadata.create_all(bind=engine)
+    users = active_loans // LOANS_PER_USER
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "full_name": "Bench",
+             "is_active": True, "is_admin": False}
+            for i in range(users)
+        ])
+        conn.execute(insert(Book), [
+            {"title": f"Livre {i}", "author": "Auteur", "isbn": f"{9780000000000 + i}",
+             "publication_year": 2000, "quantity": 10}
+            for i in range(BOOKS)
+        ])
+        conn.execute(insert(Loan), [
+            {"user_id": user_id, "book_id": (user_id * LOANS_PER_USER + n) % BOOKS + 1,
+             "loan_date": now, "due_date": now + timedelta(days=14), "extended": False}
+            for user_id in range(1, users + 1)
+            for n in range(LOANS_PER_USER)
+        ])
+    return sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def legacy_check(repository: LoanRepository, user_id: int, book_id: int) -> bool:
+    # Ancienne implémentation : tous les emprunts actifs chargés puis filtrés en Python
+    active_loans = repository.get_active_loans()
+    duplicate = any(loan.user_id == user_id and loan.book_id == book_id for loan in active_loans)
+    return duplicate or len([loan for loan in active_loans if loan.user_id == user_id]) >= 5
+
+
+def indexed_check(repository: LoanRepository, user_id: int, book_id: int) -> bool:
+    return (
+        repository.has_active_loan(user_id=user_id, book_id=book_id)
+        or repository.count_active_loans_by_user(user_id=user_id) >= 5
+    )
+
+
+def measure(factory: sessionmaker, check, checks: int, users: int) -> float:
+    rng = random.Random(42)
+    db = factory()
+    repository = LoanRepository(Loan, db)
+    start = time.perf_counter()
+    for _ in range(checks):
+        check(repository, rng.randint(1, users), rng.randint(1, BOOKS))
+        # Chaque vérification dans sa propre session, comme une requête
+        db.expunge_all()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return elapsed / checks * 1000
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    active_loans = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    checks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    users = active_loans // LOANS_PER_USER
+
+    factory = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), active_loans)
+    engine = factory.kw["bind"]
+    print(f"{active_loans} emprunts actifs, {users} utilisateurs, {checks} vérifications")
+
+    legacy_checks = max(checks // 20, 3)
+    print(f"{'chargement des emprunts actifs':<34} {measure(factory, legacy_check, legacy_checks, users):9.3f} ms/vérification")
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX idx_loan_active_user_book"))
+    print(f"{'EXISTS + COUNT sans index partiel':<34} {measure(factory, indexed_check, checks, users):9.3f} ms/vérification")
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX idx_loan_active_user_book ON loan (user_id, book_id) WHERE return_date IS NULL"
+        ))
+        conn.execute(text("ANALYZE"))
+    print(f"{'EXISTS + COUNT avec index partiel':<34} {measure(factory, indexed_check, checks, users):9.3f} ms/vérification")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/bench_principal_cache.py
+"""
+Mesure la latence par requête de GET /books/ avec et sans le cache des identités (tokens vérifiés).
+
+Usage : python scripts/bench_principal_cache.py [nombre_de_requêtes]
+"""
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.dependencies import get_current_principal
+from src.config import settings
+from src.db.session import get_db
+from src.main import app
+from src.models.base import Base
+from src.models.books import Book
+from src.models.users import User
+from src.utils.cache import invalidate_cache
+from src.utils.security import create_access_token
+
+
+def run(client: TestClient, headers: dict, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get("/api/v1/books/?limit=10", headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.text
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    print(
+        f"{label:<14} moyenne {statistics.mean(timings):6.3f} ms   "
+        f"p50 {timings[len(timings) // 2]:6.3f} ms   "
+        f"p95 {timings[int(len(timings) * 0.95)]:6.3f} ms"
+    )
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    user = User(email="bench@example.com", hashed_password="x", full_name="Bench", is_active=True)
+    db.add(user)
+    db.add_all(
+        Book(title=f"Livre {i}", author="Auteur", isbn=f"{i:013d}", publication_year=2000, quantity=1)
+        for i in range(200)
+    )
+    db.commit()
+    token = create_access_token(subject=user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+    db.close()
+
+    # Coût de l'authentification seule (dépendance appelée directement)
+    print("Dépendance get_current_principal :")
+    for label, ttl in (("sans cache", 0), ("avec cache", 60)):
+        settings.PRINCIPAL_CACHE_TTL = ttl
+        invalidate_cache()
+        timings = []
+        for _ in range(requests):
+            session = SessionLocal()
+            start = time.perf_counter()
+            get_current_principal(db=session, token=token)
+            timings.append((time.perf_counter() - start) * 1000)
+            session.close()
+        report(label, timings)
+
+    def get_bench_db():
+        session = SessionLocal()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = get_bench_db
+    print("Requête complète GET /books/?limit=10 :")
+    with TestClient(app) as client:
+        for label, ttl in (("sans cache", 0), ("avec cache", 60)):
+            settings.PRINCIPAL_CACHE_TTL = ttl
+            invalidate_cache()
+            run(client, headers, 100)  # chauffe
+            report(label, run(client, headers, requests))
+    app.dependency_overrides = {}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# scripts/bench_stock_reservation.py
+"""
+Mesure la création concurrente d'emprunts sur des livres en stock limité :
+débit (tentatives/s) et nombre d'exemplaires prêtés au-delà du stock.
+
+Chaque thread a sa propre session, comme des requêtes HTTP concurrentes.
+
+Usage : python scripts/bench_stock_reservation.py [tentatives] [threads] [exemplaires_par_livre] [profil_sqlite]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from src.db.sqlite import configure_sqlite
+from src.models.base import Base
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+
+BOOKS = 10
+
+
+def prepare(path: str, profile: str, attempts: int, copies: int) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    configure_sqlite(engine, profile)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    db = factory()
+    # Un emprunt par utilisateur : la limite de 5 emprunts actifs n'intervient pas
+    db.add_all(
+        User(email=f"user{i}@example.com", hashed_password="x", full_name="Bench", is_active=True)
+        for i in range(attempts)
+    )
+    db.add_all(
+        Book(title=f"Livre {i}", author="Auteur", isbn=f"{9780000000000 + i}", publication_year=2000, quantity=copies)
+        for i in range(BOOKS)
+    )
+    db.commit()
+    db.close()
+    return factory
+
+
+def run(factory: sessionmaker, attempts: int, threads: int) -> dict:
+    user_ids = iter(range(1, attempts + 1))
+    lock = threading.Lock()
+    outcomes = {"created": 0, "refused": 0, "errors": 0}
+
+    def worker():
+        while True:
+            with lock:
+                user_id = next(user_ids, None)
+            if user_id is None:
+                return
+            session = factory()
+            service = LoanService(
+                LoanRepository(Loan, session), BookRepository(Book, session), UserRepository(User, session)
+            )
+            try:
+                service.create_loan(user_id=user_id, book_id=user_id % BOOKS + 1)
+                outcome = "created"
+            except ValueError:
+                outcome = "refused"
+            except Exception:
+                outcome = "errors"
+            finally:
+                session.close()
+            with lock:
+                outcomes[outcome] += 1
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    outcomes["attempts_per_second"] = attempts / elapsed
+    return outcomes
+
+
+def main():
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.ERROR)
+    attempts = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    copies = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    profile = sys.argv[4] if len(sys.argv) > 4 else "safe"
+
+    print(f"{attempts} tentatives, {threads} threads, {BOOKS} livres x {copies} exemplaires, profil SQLite {profile}")
+    factory = prepare(os.path.join(tempfile.mkdtemp(), "bench.db"), profile, attempts, copies)
+    outcomes = run(factory, attempts, threads)
+
+    db = factory()
+    loans = db.query(func.count(Loan.id)).scalar()
+    stock = db.query(func.sum(Book.quantity)).scalar()
+    db.close()
+    print(
+        f"{outcomes['attempts_per_second']:8.0f} tentatives/s   créés {outcomes['created']:4d}   "
+        f"refusés {outcomes['refused']:4d}   erreurs {outcomes['errors']:4d}"
+    )
+    print(
+        f"emprunts en base {loans}   stock restant {stock}   "
+        f"survente {max(loans - BOOKS * copies, 0)}   écart de stock {BOOKS * copies - loans - stock}"
+    )
+    factory.kw["bind"].dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,43 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db.session import get_db
+from ..db.session import get_async_db, get_db, get_read_db
 from ..models.users import User
-from ..repositories.users import UserRepository
+from ..repositories.users import AsyncUserRepository, UserRepository, token_versions
 from ..services.users import UserService
-from ..api.schemas.token import TokenPayload
-from ..utils.security import ALGORITHM
+from ..api.schemas.token import Principal, TokenPayload
+from ..utils.security import ALGORITHM, cache_principal, get_cached_principal, principal_stamp
 from ..config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+def decode_token(token: str) -> TokenPayload:
     """
-    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    Vérifie et décode un token JWT.
     """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Impossible de valider les informations d'identification",
         )
 
+
+def _get_user(db: Session, user_id: int) -> User:
     repository = UserRepository(User, db)
     service = UserService(repository)
-    user = service.get(id=token_data.sub)
+    user = service.get(id=user_id)
 
     if not user:
         raise HTTPException(
@@ -45,11 +47,129 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    """
+    token_data = decode_token(token)
+    return _get_user(db, token_data.sub)
+
+
+def get_current_principal(
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Dépendance pour obtenir l'identité de l'utilisateur actuel, mise en cache par token.
+
+    Un token déjà vérifié ne provoque ni décodage JWT ni requête sur la table user
+    tant que l'entrée est en cache et que l'utilisateur n'a pas été modifié.
+    """
+    principal = get_cached_principal(token)
+    if principal is not None:
+        return principal
+
+    token_data = decode_token(token)
+    # Générations lues avant la requête : une modification concurrente invalidera l'entrée
+    stamp = principal_stamp(token_data.sub)
+    principal = _get_principal_from_claims(db, token_data)
+    if principal is None:
+        user = _get_user(db, token_data.sub)
+        principal = Principal(id=user.id, is_active=user.is_active, is_admin=user.is_admin)
+    cache_principal(token, principal, stamp, expires_at=token_data.exp)
+    return principal
+
+
+async def get_async_principal(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Variante de get_current_principal pour les routes async def : l'éventuelle lecture de la table user passe par la session asynchrone.
+    """
+    principal = get_cached_principal(token)
+    if principal is not None:
+        return principal
+
+    token_data = decode_token(token)
+    stamp = principal_stamp(token_data.sub)
+    repository = AsyncUserRepository(User, db)
+    if _uses_claims(token_data) and token_versions.needs_reload():
+        await repository.reload_token_versions()
+    principal = _principal_from_claims(token_data)
+    if principal is None:
+        user = await repository.get(token_data.sub)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Utilisateur non trouvé",
+            )
+        principal = Principal(id=user.id, is_active=user.is_active, is_admin=user.is_admin)
+    cache_principal(token, principal, stamp, expires_at=token_data.exp)
+    return principal
+
+
+def _uses_claims(token_data: TokenPayload) -> bool:
+    return settings.TOKEN_FAST_PATH and token_data.ver is not None
+
+
+def _get_principal_from_claims(db: Session, token_data: TokenPayload) -> Optional[Principal]:
+    """
+    Construit l'identité à partir des droits embarqués dans le token (mode TOKEN_FAST_PATH).
+
+    Retourne None si le mode est désactivé, si le token ne porte pas de droits
+    ou si sa version n'est plus celle de l'utilisateur : l'appelant lit alors la base.
+    """
+    if _uses_claims(token_data) and token_versions.needs_reload():
+        UserRepository(User, db).reload_token_versions()
+    return _principal_from_claims(token_data)
+
+
+def _principal_from_claims(token_data: TokenPayload) -> Optional[Principal]:
+    if not _uses_claims(token_data) or not token_versions.matches(token_data.sub, token_data.ver):
+        return None
+    return Principal(
+        id=token_data.sub,
+        is_active=bool(token_data.is_active),
+        is_admin=bool(token_data.is_admin),
+    )
+
+
 def get_current_active_user(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur actif actuel.
+    """
+    return _require_active(current_user)
+
+
+async def get_async_active_user(
+    current_user: Principal = Depends(get_async_principal),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur actif actuel (routes async def).
+    """
+    return _require_active(current_user)
+
+
+def _require_active(current_user: Principal) -> Principal:
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Utilisateur inactif",
+        )
+    return current_user
+
+
+def get_current_active_db_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     """
-    Dépendance pour obtenir l'utilisateur actif actuel.
+    Dépendance pour obtenir l'utilisateur actif actuel sous forme d'objet ORM complet.
     """
     if not current_user.is_active:
         raise HTTPException(
@@ -60,14 +180,27 @@ def get_current_active_user(
 
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Dépendance pour obtenir l'utilisateur administrateur actuel.
     """
+    return _require_admin(current_user)
+
+
+async def get_async_admin_user(
+    current_user: Principal = Depends(get_async_active_user),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur administrateur actuel (routes async def).
+    """
+    return _require_admin(current_user)
+
+
+def _require_admin(current_user: Principal) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Privilèges insuffisants",
         )
-    return current_user
\ No newline at end of file
+    return current_user
@@ -6,16 +6,16 @@ from datetime import timedelta
 from ...db.session import get_db
 from ...models.users import User as UserModel
 from ..schemas.token import Token
-from ...repositories.users import UserRepository
+from ...repositories.users import UserRepository, token_versions
 from ...services.users import UserService
-from ...utils.security import create_access_token
+from ...utils.security import PasswordHashingBusy, create_access_token
 from ...config import settings
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
@@ -25,7 +25,16 @@ def login_access_token(
     repository = UserRepository(UserModel, db)
     service = UserService(repository)
 
-    user = service.authenticate(email=form_data.username, password=form_data.password)
+    try:
+        user = await service.authenticate_async(
+            email=form_data.username, password=form_data.password
+        )
+    except PasswordHashingBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Trop de connexions en cours, réessayez plus tard",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,9 +50,14 @@ def login_access_token(
         )
 
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    claims = None
+    if settings.TOKEN_FAST_PATH:
+        # Droits embarqués : les requêtes suivantes ne liront pas la table user
+        claims = {"is_active": user.is_active, "is_admin": user.is_admin, "ver": user.token_version}
+        token_versions.set(user.id, user.token_version)
     return {
         "access_token": create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=user.id, expires_delta=access_token_expires, claims=claims
         ),
         "token_type": "bearer",
     }
\ No newline at end of file
@@ -1,37 +1,56 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import case
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from typing import List, Any
-from ...utils.pagination import PaginationParams, paginate, Page
-from ...db.session import get_db
+from ...utils.pagination import PaginationParams, paginate_async, Page
+from ...utils.search import fts_match_query
+from ...db.session import get_async_db, get_db, get_read_db
+from ...db.writer import run_write
 from ...models.books import Book as BookModel
-from ..schemas.books import Book, BookCreate, BookUpdate
-from ...repositories.books import BookRepository
+from ..schemas.books import Book, BookCreate, BookSuggestion, BookUpdate
+from ...repositories.books import (
+    NORMALIZED_COLUMNS, AsyncBookRepository, BookRepository, book_suggestions, match_books
+)
 from ...services.books import BookService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ..dependencies import get_async_active_user, get_current_active_user, get_current_admin_user
 from typing import Optional
 
 
 router = APIRouter()
 
+# Pagination par curseur : pages profondes sans OFFSET
+CURSOR_DESCRIPTION = "next_cursor ou prev_cursor d'une page précédente, avec le même tri (remplace skip)"
+WITH_TOTAL_DESCRIPTION = "Avec cursor : compte aussi total et pages (COUNT de tout l'ensemble, coût fixe par page)"
+
 
 @router.get("/", response_model=Page[Book])
-def read_books(
-    db: Session = Depends(get_db),
+async def read_books(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
     sort_desc: bool = Query(False),
-    current_user = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: bool = Query(False, description=WITH_TOTAL_DESCRIPTION),
+    current_user = Depends(get_async_active_user)
 ) -> Any:
     """
     Récupère la liste des livres avec pagination.
     """
-    repository = BookRepository(BookModel, db)
-    query = db.query(BookModel)
-    
-    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
-    return paginate(query, params, BookModel)
+    repository = AsyncBookRepository(BookModel, db)
+    query = repository.select_with_categories()
+
+    params = PaginationParams(
+        skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc, cursor=cursor, with_total=with_total
+    )
+    try:
+        return await paginate_async(db, query, params, BookModel)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/", response_model=Book, status_code=status.HTTP_201_CREATED)
@@ -44,11 +63,14 @@ def create_book(
     """
     Crée un nouveau livre.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
-    
+    def unit(session: Session) -> BookModel:
+        book = BookService(BookRepository(BookModel, session)).create(obj_in=book_in)
+        # Catégories chargées avant de rendre l'objet (la session de l'écrivain sera fermée)
+        book.categories
+        return book
+
     try:
-        book = service.create(obj_in=book_in)
+        book = run_write(db, unit)
         return book
     except ValueError as e:
         raise HTTPException(
@@ -57,19 +79,35 @@ def create_book(
         )
 
 
+@router.get("/suggest", response_model=List[BookSuggestion])
+async def suggest_books(
+    db: AsyncSession = Depends(get_async_db),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    current_user = Depends(get_async_active_user)
+) -> Any:
+    """
+    Suggestions de livres pendant la saisie (début de mot du titre, de l'auteur ou de l'ISBN), les plus empruntés d'abord.
+    """
+    # Index en mémoire ; la base n'est interrogée que s'il n'a pas encore été construit
+    if book_suggestions.ready:
+        return book_suggestions.search(q, limit=limit)
+    repository = AsyncBookRepository(BookModel, db)
+    return await repository.suggest(q, limit=limit)
+
+
 @router.get("/{id}", response_model=Book)
-def read_book(
+async def read_book(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     id: int,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_async_active_user)
 ) -> Any:
     """
     Récupère un livre par son ID.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
-    book = service.get(id=id)
+    repository = AsyncBookRepository(BookModel, db)
+    book = await repository.get(id=id)
     if not book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,23 +127,27 @@ def update_book(
     """
     Met à jour un livre.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
-    book = service.get(id=id)
-    if not book:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Livre non trouvé"
-        )
-    
-    try:
-        book = service.update(db_obj=book, obj_in=book_in)
+    def unit(session: Session) -> Optional[BookModel]:
+        service = BookService(BookRepository(BookModel, session))
+        book = service.get(id=id)
+        if book:
+            book = service.update(db_obj=book, obj_in=book_in)
+            book.categories
         return book
+
+    try:
+        book = run_write(db, unit)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    if not book:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Livre non trouvé"
+        )
+    return book
 
 
 @router.delete("/{id}", response_model=Book)
@@ -118,22 +160,27 @@ def delete_book(
     """
     Supprime un livre.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
-    book = service.get(id=id)
+    def unit(session: Session) -> Optional[BookModel]:
+        service = BookService(BookRepository(BookModel, session))
+        book = service.get(id=id)
+        if book:
+            book.categories
+            book = service.remove(id=id)
+        return book
+
+    book = run_write(db, unit)
     if not book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Livre non trouvé"
         )
-    book = service.remove(id=id)
     return book
 
 
 @router.get("/search/title/{title}", response_model=List[Book])
 def search_books_by_title(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     title: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -149,7 +196,7 @@ def search_books_by_title(
 @router.get("/search/author/{author}", response_model=List[Book])
 def search_books_by_author(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     author: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -165,7 +212,7 @@ def search_books_by_author(
 @router.get("/search/isbn/{isbn}", response_model=Book)
 def search_book_by_isbn(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     isbn: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -183,39 +230,61 @@ def search_book_by_isbn(
     return book
 
 @router.get("/search/", response_model=Page[Book])
-def search_books(
-    db: Session = Depends(get_db),
+async def search_books(
+    db: AsyncSession = Depends(get_async_db),
     query: Optional[str] = Query(None, min_length=1),
     author: Optional[str] = Query(None),
     publication_year: Optional[int] = Query(None),
+    fuzzy: bool = Query(False, description="Tolérer les fautes de frappe dans query (titre et auteur)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
     sort_desc: bool = Query(False),
-    current_user = Depends(get_current_active_user)
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    with_total: bool = Query(False, description=WITH_TOTAL_DESCRIPTION),
+    current_user = Depends(get_async_active_user)
 ) -> Any:
     """
     Recherche de livres.
     """
-    repository = BookRepository(BookModel, db)
-    
-    search_query = db.query(BookModel)
-    
-    # Apply filter
-    if query:
-        search_query = search_query.filter(or_( 
-            BookModel.title.ilike(f"%{query}%"),
-            BookModel.author.ilike(f"%{query}%"),
-            BookModel.isbn.ilike(f"%{query}%"),
-            BookModel.description.ilike(f"%{query}%"),
-        )
-        )
+    repository = AsyncBookRepository(BookModel, db)
+
+    search_query = repository.select_with_categories()
+
+    if query and fuzzy:
+        # Livres proches par trigrammes, du plus similaire au moins similaire sauf tri demandé
+        ranking = [book_id for book_id, _ in await repository.fuzzy_scores(query)]
+        search_query = search_query.filter(BookModel.id.in_(ranking))
+        if ranking and not sort_by:
+            search_query = search_query.order_by(
+                case({book_id: rank for rank, book_id in enumerate(ranking)}, value=BookModel.id)
+            )
     
+    # Recherche plein texte (titre, auteur, ISBN, description) et filtre sur l'auteur
+    # combinés dans une seule expression MATCH ; classement par pertinence sauf tri demandé
+    expressions = []
+    if query and not fuzzy:
+        expressions.append(fts_match_query(query))
     if author:
-        search_query = search_query.filter(BookModel.author.ilike(f"%{author}%"))
+        expressions.append(fts_match_query(author, columns=("author",)))
+    if expressions:
+        search_query = match_books(search_query, *expressions, ranked=not sort_by and not fuzzy)
     
     if publication_year:
         search_query = search_query.filter(BookModel.publication_year == publication_year)
     
-    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
-    return paginate(search_query, params, BookModel)
\ No newline at end of file
+    # Tri alphabétique sans tenir compte des accents ("Élève" parmi les E, pas après "Zola")
+    if sort_by in NORMALIZED_COLUMNS:
+        sort_by = NORMALIZED_COLUMNS[sort_by]
+    # Classement par pertinence (plein texte ou trigrammes) : pas de curseur possible
+    ranked = not sort_by and bool(expressions or (query and fuzzy))
+    params = PaginationParams(
+        skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc, cursor=cursor, with_total=with_total
+    )
+    try:
+        return await paginate_async(db, search_query, params, BookModel, keyset=not ranked)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
\ No newline at end of file
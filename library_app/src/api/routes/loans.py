@@ -1,37 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Any
 from datetime import datetime, timedelta
 
-from ...db.session import get_db
+from ...db.session import get_async_db, get_db
+from ...db.writer import run_write
 from ...models.loans import Loan as LoanModel
 from ...models.books import Book as BookModel
 from ...models.users import User as UserModel
 from ..schemas.loans import Loan, LoanCreate, LoanUpdate
-from ...repositories.loans import LoanRepository
+from ...repositories.loans import AsyncLoanRepository, LoanRepository
 from ...repositories.books import BookRepository
 from ...repositories.users import UserRepository
 from ...services.loans import LoanService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ..dependencies import get_async_active_user, get_async_admin_user, get_current_admin_user
 
 router = APIRouter()
 
 
+def _loan_service(db: Session) -> LoanService:
+    loan_repository = LoanRepository(LoanModel, db)
+    book_repository = BookRepository(BookModel, db)
+    user_repository = UserRepository(UserModel, db)
+    return LoanService(loan_repository, book_repository, user_repository)
+
+
 @router.get("/", response_model=List[Loan])
-def read_loans(
-    db: Session = Depends(get_db),
+async def read_loans(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
-    current_user = Depends(get_current_admin_user)
+    current_user = Depends(get_async_admin_user)
 ) -> Any:
     """
     Récupère la liste des emprunts.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-    loans = service.get_multi(skip=skip, limit=limit)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
+    loans = await loan_repository.get_multi(skip=skip, limit=limit)
     return loans
 
 
@@ -47,17 +53,15 @@ def create_loan(
     """
     Crée un nouvel emprunt.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
-    try:
-        loan = service.create_loan(
+    def unit(session: Session) -> LoanModel:
+        return _loan_service(session).create_loan(
             user_id=user_id,
             book_id=book_id,
             loan_period_days=loan_period_days
         )
+
+    try:
+        loan = run_write(db, unit)
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -67,21 +71,18 @@ def create_loan(
 
 
 @router.get("/{id}", response_model=Loan)
-def read_loan(
+async def read_loan(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     id: int,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_async_active_user)
 ) -> Any:
     """
     Récupère un emprunt par son ID.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
 
-    loan = service.get(id=id)
+    loan = await loan_repository.get(id=id)
     if not loan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,13 +109,8 @@ def return_loan(
     """
     Marque un emprunt comme retourné.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
     try:
-        loan = service.return_loan(loan_id=id)
+        loan = run_write(db, lambda session: _loan_service(session).return_loan(loan_id=id))
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -134,13 +130,11 @@ def extend_loan(
     """
     Prolonge la durée d'un emprunt.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
     try:
-        loan = service.extend_loan(loan_id=id, extension_days=extension_days)
+        loan = run_write(
+            db,
+            lambda session: _loan_service(session).extend_loan(loan_id=id, extension_days=extension_days)
+        )
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -150,45 +144,39 @@ def extend_loan(
 
 
 @router.get("/active/", response_model=List[Loan])
-def read_active_loans(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_admin_user)
+async def read_active_loans(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_async_admin_user)
 ) -> Any:
     """
     Récupère les emprunts actifs (non retournés).
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
 
-    loans = service.get_active_loans()
+    loans = await loan_repository.get_active_loans()
     return loans
 
 
 @router.get("/overdue/", response_model=List[Loan])
-def read_overdue_loans(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_admin_user)
+async def read_overdue_loans(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_async_admin_user)
 ) -> Any:
     """
     Récupère les emprunts en retard.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
 
-    loans = service.get_overdue_loans()
+    loans = await loan_repository.get_overdue_loans()
     return loans
 
 
 @router.get("/user/{user_id}", response_model=List[Loan])
-def read_user_loans(
+async def read_user_loans(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: int,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_async_active_user)
 ) -> Any:
     """
     Récupère les emprunts d'un utilisateur.
@@ -200,29 +188,23 @@ def read_user_loans(
             detail="Accès non autorisé"
         )
 
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
 
-    loans = service.get_loans_by_user(user_id=user_id)
+    loans = await loan_repository.get_loans_by_user(user_id=user_id)
     return loans
 
 
 @router.get("/book/{book_id}", response_model=List[Loan])
-def read_book_loans(
+async def read_book_loans(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     book_id: int,
-    current_user = Depends(get_current_admin_user)
+    current_user = Depends(get_async_admin_user)
 ) -> Any:
     """
     Récupère les emprunts d'un livre.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
+    loan_repository = AsyncLoanRepository(LoanModel, db)
 
-    loans = service.get_loans_by_book(book_id=book_id)
+    loans = await loan_repository.get_loans_by_book(book_id=book_id)
     return loans
\ No newline at end of file
@@ -2,8 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
 
-from ...db.session import get_db
+from ...db.session import get_read_db
+from ...db import writer
 from ...services.stats import StatsService
+from ...utils.cache import cache_info
+from ...repositories.books import book_suggestions, isbn_filter
+from ...repositories.users import email_filter, token_versions
+from ...utils.security import hashing_info
 from ..dependencies import get_current_admin_user
 
 router = APIRouter()
@@ -11,7 +16,7 @@ router = APIRouter()
 
 @router.get("/general", response_model=Dict[str, Any])
 def get_general_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
@@ -23,7 +28,7 @@ def get_general_stats(
 
 @router.get("/most-borrowed-books", response_model=List[Dict[str, Any]])
 def get_most_borrowed_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -36,7 +41,7 @@ def get_most_borrowed_books(
 
 @router.get("/most-active-users", response_model=List[Dict[str, Any]])
 def get_most_active_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -49,7 +54,7 @@ def get_most_active_users(
 
 @router.get("/monthly-loans", response_model=List[Dict[str, Any]])
 def get_monthly_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     months: int = 12,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -57,4 +62,67 @@ def get_monthly_loans(
     Récupère le nombre d'emprunts par mois pour les derniers mois.
     """
     service = StatsService(db)
-    return service.get_monthly_loans(months=months)
\ No newline at end of file
+    return service.get_monthly_loans(months=months)
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+def get_cache_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques du cache applicatif (taille, évictions, taux de succès).
+    """
+    return cache_info()
+
+
+@router.get("/existence-filters", response_model=List[Dict[str, Any]])
+def get_existence_filter_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques des filtres d'existence (ISBN, email).
+    """
+    return [isbn_filter.stats(), email_filter.stats()]
+
+
+@router.get("/suggestions", response_model=Dict[str, Any])
+def get_suggestion_index_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques de l'index d'autocomplétion (mémoire, durée de construction, dernière recherche).
+    """
+    return book_suggestions.stats()
+
+
+@router.get("/password-hashing", response_model=Dict[str, Any])
+def get_password_hashing_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques du pool de hachage des mots de passe (file d'attente, durées).
+    """
+    return hashing_info()
+
+
+@router.get("/token-versions", response_model=Dict[str, Any])
+def get_token_version_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques de la table des versions de token (mode TOKEN_FAST_PATH).
+    """
+    return token_versions.stats()
+
+
+@router.get("/write-queue", response_model=Dict[str, Any])
+def get_write_queue_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les métriques du coordinateur d'écriture (profondeur de file, attente, taille des lots).
+    """
+    coordinator = writer.write_coordinator
+    if coordinator is None:
+        return {"running": False}
+    return coordinator.stats()
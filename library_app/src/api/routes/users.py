@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Any
 
-from ...db.session import get_db
+from ...db.session import get_db, get_read_db
 from ...models.users import User as UserModel
 from ..schemas.users import User, UserCreate, UserUpdate
 from ...repositories.users import UserRepository
 from ...services.users import UserService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ...utils.security import PasswordHashingBusy
+from ..dependencies import get_current_active_db_user, get_current_admin_user
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[User])
 def read_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(get_current_admin_user)
@@ -29,7 +31,7 @@ def read_users(
 
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -42,18 +44,24 @@ def create_user(
     service = UserService(repository)
 
     try:
-        user = service.create(obj_in=user_in)
+        user = await service.create_async(obj_in=user_in)
         return user
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
 
 
 @router.get("/me", response_model=User)
 def read_user_me(
-    current_user = Depends(get_current_active_user),
+    current_user = Depends(get_current_active_db_user),
 ) -> Any:
     """
     Récupère l'utilisateur connecté.
@@ -62,11 +70,11 @@ def read_user_me(
 
 
 @router.put("/me", response_model=User)
-def update_user_me(
+async def update_user_me(
     *,
     db: Session = Depends(get_db),
     user_in: UserUpdate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_active_db_user)
 ) -> Any:
     """
     Met à jour l'utilisateur connecté.
@@ -75,19 +83,25 @@ def update_user_me(
     service = UserService(repository)
 
     try:
-        user = service.update(db_obj=current_user, obj_in=user_in)
+        user = await service.update_async(db_obj=current_user, obj_in=user_in)
         return user
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
 
 
 @router.get("/{id}", response_model=User)
 def read_user(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     id: int,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -106,7 +120,7 @@ def read_user(
 
 
 @router.put("/{id}", response_model=User)
-def update_user(
+async def update_user(
     *,
     db: Session = Depends(get_db),
     id: int,
@@ -118,7 +132,7 @@ def update_user(
     """
     repository = UserRepository(UserModel, db)
     service = UserService(repository)
-    user = service.get(id=id)
+    user = await run_in_threadpool(service.get, id=id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,13 +140,19 @@ def update_user(
         )
 
     try:
-        user = service.update(db_obj=user, obj_in=user_in)
+        user = await service.update_async(db_obj=user, obj_in=user_in)
         return user
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
 
 
 @router.delete("/{id}", response_model=User)
@@ -168,7 +188,7 @@ def delete_user(
 @router.get("/by-email/{email}", response_model=User)
 def get_user_by_email(
     email: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
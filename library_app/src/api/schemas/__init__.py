@@ -1,4 +1,4 @@
 from .books import Book, BookCreate, BookUpdate
 from .users import User, UserCreate, UserUpdate
 from .loans import Loan, LoanCreate, LoanUpdate
-from .token import Token, TokenPayload
\ No newline at end of file
+from .token import Token, TokenPayload, Principal
\ No newline at end of file
@@ -68,4 +68,12 @@ class BookInDBBase(BookBase):
 
 
 class Book(BookInDBBase):
-    categories: List[Category] = []
\ No newline at end of file
+    categories: List[Category] = []
+
+
+class BookSuggestion(BaseModel):
+    id: int
+    title: str
+    author: str
+    isbn: str
+    popularity: int = Field(0, description="Nombre d'emprunts du livre")
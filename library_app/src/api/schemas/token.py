@@ -8,4 +8,18 @@ class Token(BaseModel):
 
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None
\ No newline at end of file
+    sub: Optional[int] = None
+    exp: Optional[int] = None
+    # Droits embarqués par les tokens « fast path »
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+    ver: Optional[int] = None
+
+
+class Principal(BaseModel):
+    """
+    Identité minimale de l'utilisateur authentifié, suffisante pour les contrôles d'accès.
+    """
+    id: int
+    is_active: bool
+    is_admin: bool
\ No newline at end of file
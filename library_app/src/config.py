@@ -9,6 +9,17 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 jours
+    # Durée de mise en cache des tokens vérifiés (0 pour désactiver)
+    PRINCIPAL_CACHE_TTL: int = 60  # secondes
+    # Tokens porteurs des droits (is_active, is_admin) et d'une version par
+    # utilisateur : les contrôles d'accès se font sans lire la table user
+    TOKEN_FAST_PATH: bool = False
+    TOKEN_VERSION_REFRESH_INTERVAL: int = 30  # secondes
+
+    # Hachage des mots de passe (bcrypt), exécuté dans un pool dédié
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = ["http://localhost:8000", "http://localhost:5005", "http://127.0.0.1:5005"]
@@ -16,6 +27,33 @@ class Settings(BaseSettings):
     # Base de données
     DATABASE_URL: str = "sqlite:///./library.db"
 
+    # Cache applicatif ("memory" : propre à chaque processus, "sqlite" : partagé
+    # entre les workers d'une même machine)
+    CACHE_BACKEND: str = "memory"
+    CACHE_SQLITE_PATH: str = "./cache.db"
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64 Mo
+    CACHE_LOCK_TIMEOUT: float = 10.0  # secondes
+    CACHE_REFRESH_WORKERS: int = 2
+    CACHE_REFRESH_QUEUE_SIZE: int = 32
+
+    # Filtres d'existence (ISBN, email) : filtre de Bloom et cache négatif
+    BLOOM_EXPECTED_ITEMS: int = 100_000
+    BLOOM_FALSE_POSITIVE_RATE: float = 0.01
+    NEGATIVE_CACHE_TTL: int = 300  # secondes
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Autocomplétion (/books/suggest) : livres modifiés depuis la dernière
+    # construction de l'index avant fusion dans le tableau trié
+    SUGGEST_MAX_PENDING: int = 1000
+
+    # Recherche tolérante aux fautes (/books/search/?fuzzy=true) : part minimale
+    # des trigrammes de la saisie présents dans le livre ; lignes de book_trigram
+    # lues et livres candidats vérifiés au plus (bornent le coût d'une recherche)
+    FUZZY_SIMILARITY_THRESHOLD: float = 0.5
+    FUZZY_MAX_POSTINGS: int = 20_000
+    FUZZY_MAX_CANDIDATES: int = 500
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -1,8 +1,23 @@
+from typing import Any, Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./library.db"  # Or your actual DB URL
     SQL_ECHO: bool = False  # Activer l'écho SQL pour le débogage
+    # URL du moteur asynchrone (déduite de DATABASE_URL si absente)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Profil de pragmas SQLite ("safe", "fast" ou "bulk-load") et surcharges éventuelles
+    SQLITE_PROFILE: str = "safe"
+    SQLITE_PRAGMAS: Dict[str, Any] = {}
+    # Écrivain unique : les écritures des emprunts et des livres passent par une file
+    WRITE_COORDINATOR: bool = False
+    WRITE_QUEUE_SIZE: int = 1000
+    WRITE_TIMEOUT: float = 30.0  # secondes
+    # Commit groupé : les écritures arrivées dans la fenêtre (ou jusqu'à N) partagent une transaction
+    WRITE_GROUP_COMMIT: bool = False
+    WRITE_GROUP_MAX_SIZE: int = 64
+    WRITE_GROUP_WINDOW_MS: float = 2.0
     # ...
 
 settings = Settings()
\ No newline at end of file
@@ -1,12 +1,16 @@
 # src/db/init_db.py
 import logging
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
 from ..models.users import User
-from ..models.books import Book
+from ..models.books import Book, book_trigram
 from ..models.loans import Loan
 from ..models.categories import Category
+from ..repositories.books import BookRepository, trigram_rows, with_normalized_columns
+from ..repositories.users import UserRepository
 from ..utils.security import get_password_hash
 
 logger = logging.getLogger(__name__)
@@ -112,9 +116,10 @@ def init_db(db: Session) -> None:
         categories = book_data.pop("categories")
         book = db.query(Book).filter(Book.isbn == book_data["isbn"]).first()
         if not book:
-            book = Book(**book_data)
+            book = Book(**with_normalized_columns(book_data))
             db.add(book)
             db.flush()  # Pour obtenir l'ID du livre
+            db.execute(insert(book_trigram), trigram_rows(book.id, book.title, book.author))
 
             # Ajouter les catégories
             for category in categories:
@@ -188,4 +193,44 @@ def init_db(db: Session) -> None:
             db.add(loan2)
 
         db.commit()
-        logger.info("Emprunts créés")
\ No newline at end of file
+        logger.info("Emprunts créés")
+
+
+def rebuild_existence_filters(db: Session) -> None:
+    """
+    Reconstruit les filtres d'existence des ISBN et des emails à partir de la base.
+    """
+    try:
+        BookRepository(Book, db).rebuild_isbn_filter()
+        UserRepository(User, db).rebuild_email_filter()
+        logger.info("Filtres d'existence reconstruits")
+    except SQLAlchemyError:
+        # Base non initialisée : les vérifications passeront par la base
+        logger.warning("Impossible de reconstruire les filtres d'existence", exc_info=True)
+        db.rollback()
+
+
+def rebuild_suggestion_index(db: Session) -> None:
+    """
+    Construit l'index d'autocomplétion des livres à partir de la base.
+    """
+    try:
+        BookRepository(Book, db).rebuild_suggestions()
+        logger.info("Index d'autocomplétion construit")
+    except SQLAlchemyError:
+        # Base non initialisée : les suggestions seront lues en base
+        logger.warning("Impossible de construire l'index d'autocomplétion", exc_info=True)
+        db.rollback()
+
+
+def load_token_versions(db: Session) -> None:
+    """
+    Charge la table des versions de token (mode TOKEN_FAST_PATH).
+    """
+    try:
+        UserRepository(User, db).reload_token_versions()
+        logger.info("Versions de token chargées")
+    except SQLAlchemyError:
+        # Table non chargée : elle le sera à la première requête
+        logger.warning("Impossible de charger les versions de token", exc_info=True)
+        db.rollback()
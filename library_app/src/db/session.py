@@ -1,10 +1,15 @@
 # src/db/session.py
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from ..core.config import settings
 from ..utils import logging  # Importer le module de journalisation
+from .sqlite import configure_sqlite, enable_sqlite_query_only
 
 # Création de l'URL de connexion à partir des paramètres de configuration
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -16,9 +21,46 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {},
     echo=settings.SQL_ECHO  # Activer l'écho SQL en fonction de la configuration
 )
+configure_sqlite(engine, settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS)
+
+# Création de la classe SessionLocal pour les sessions de base de données.
+# Les objets restent chargés après commit : pas de SELECT pour relire ce qui vient d'être écrit
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Moteur des lectures : pool distinct, connexions en lecture seule (PRAGMA query_only).
+# Les écritures passent par l'écrivain unique (db/writer.py) ou, s'il n'est pas démarré, par engine
+read_engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {},
+    echo=settings.SQL_ECHO
+)
+configure_sqlite(read_engine, settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS)
+enable_sqlite_query_only(read_engine)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
+
 
-# Création de la classe SessionLocal pour les sessions de base de données
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def make_async_url(url: str) -> str:
+    """
+    Convertit une URL synchrone vers le pilote asynchrone correspondant (sqlite -> aiosqlite).
+    """
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Moteur asynchrone : les routes async def attendent la base sans occuper de thread
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or make_async_url(SQLALCHEMY_DATABASE_URL),
+    echo=settings.SQL_ECHO
+)
+configure_sqlite(async_engine.sync_engine, settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS)
+# Les routes asynchrones ne font que lire
+enable_sqlite_query_only(async_engine.sync_engine)
+
+# Les objets restent lisibles après commit : un rechargement implicite est impossible en asynchrone
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Création de la classe de base pour les modèles déclaratifs
 Base = declarative_base()
@@ -29,4 +71,19 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Dépendance pour obtenir une session en lecture seule (routes sans écriture)
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dépendance pour obtenir une session asynchrone (lecture seule)
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
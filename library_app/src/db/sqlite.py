@@ -0,0 +1,145 @@
+# src/db/sqlite.py
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Profils de performance SQLite, appliqués à chaque nouvelle connexion.
+# - safe : WAL (les lecteurs ne bloquent plus l'écrivain), fsync à chaque commit
+# - fast : WAL, fsync aux checkpoints seulement, cache et mmap plus grands
+# - bulk-load : chargements hors ligne (scripts), sans journal sur disque ni fsync
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "safe": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "busy_timeout": 5000,
+        "cache_size": -16_000,  # en Kio
+        "mmap_size": 0,
+        "temp_store": "default",
+    },
+    "fast": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "busy_timeout": 5000,
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+    },
+    "bulk-load": {
+        "journal_mode": "memory",
+        "synchronous": "off",
+        "busy_timeout": 30_000,
+        "cache_size": -256_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+    },
+}
+
+
+def resolve_pragmas(profile: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Retourne les pragmas d'un profil, complétés par les valeurs surchargées.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"Profil SQLite inconnu : {profile} (attendu : {', '.join(SQLITE_PROFILES)})"
+        )
+    return dict(SQLITE_PROFILES[profile], **(overrides or {}))
+
+
+def configure_sqlite(engine: Engine, profile: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Applique un profil de pragmas à chaque connexion ouverte par le moteur.
+
+    Accepte aussi le moteur synchrone sous-jacent d'un moteur asynchrone
+    (async_engine.sync_engine). Sans effet pour une base autre que SQLite.
+    """
+    pragmas = resolve_pragmas(profile, overrides)
+    if engine.dialect.name != "sqlite":
+        return pragmas
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return pragmas
+
+
+def enable_sqlite_savepoints(engine: Engine) -> None:
+    """
+    Laisse SQLAlchemy piloter les transactions SQLite (BEGIN explicite).
+
+    Le module sqlite3 n'ouvre la transaction qu'à la première écriture : un
+    SAVEPOINT émis avant ouvre alors sa propre transaction, et sa libération
+    valide tout. Nécessaire dès que l'on utilise begin_nested().
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def disable_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def enable_sqlite_query_only(engine: Engine) -> None:
+    """
+    Réserve les connexions du moteur à la lecture (PRAGMA query_only).
+
+    À appliquer après configure_sqlite : le profil (journal_mode) doit être
+    posé avant que la connexion ne refuse toute écriture. Une écriture
+    égarée sur le moteur échoue (« attempt to write a readonly database »)
+    au lieu de disputer le verrou à l'écrivain.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_query_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def read_pragmas(engine: Engine, names) -> Dict[str, Any]:
+    """
+    Lit la valeur effective des pragmas sur une connexion du moteur.
+    """
+    with engine.connect() as conn:
+        return {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in names
+        }
+
+
+def log_sqlite_pragmas(
+    engine: Engine, profile: str, overrides: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Vérification au démarrage : journalise les pragmas effectifs et signale les écarts au profil.
+    """
+    if engine.dialect.name != "sqlite":
+        return {}
+    expected = resolve_pragmas(profile, overrides)
+    effective = read_pragmas(engine, expected)
+    logger.info("Profil SQLite %s : %s", profile, effective)
+    # Une base en mémoire ne passe jamais en WAL, par exemple
+    if str(effective.get("journal_mode", "")).lower() != str(expected.get("journal_mode", "")).lower():
+        logger.warning(
+            "journal_mode effectif %s au lieu de %s",
+            effective.get("journal_mode"), expected.get("journal_mode")
+        )
+    return effective
@@ -0,0 +1,50 @@
+# src/db/unit_of_work.py
+from typing import Optional
+
+from sqlalchemy.orm import Session, SessionTransaction
+
+from ..repositories.base import DEFER_COMMIT
+
+
+class UnitOfWork:
+    """
+    Regroupe les écritures d'une opération dans une seule transaction.
+
+    Dans l'unité la plus externe, les repositories se contentent d'un flush et
+    un seul commit est fait à la sortie (rollback en cas d'exception). Une
+    unité ouverte à l'intérieur d'une autre (ou d'un lot de l'écrivain unique)
+    travaille dans un point de sauvegarde : son échec n'annule que ses propres
+    écritures, et le commit reste à la charge de l'unité englobante.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self._outermost = False
+        self._savepoint: Optional[SessionTransaction] = None
+
+    def __enter__(self) -> "UnitOfWork":
+        if self.db.info.get(DEFER_COMMIT):
+            self._savepoint = self.db.begin_nested()
+        else:
+            self._outermost = True
+            self.db.info[DEFER_COMMIT] = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._outermost:
+            savepoint = self._savepoint
+            if savepoint is not None and savepoint.is_active:
+                if exc_type is None:
+                    savepoint.commit()
+                else:
+                    savepoint.rollback()
+            return
+
+        self.db.info.pop(DEFER_COMMIT, None)
+        if exc_type is None:
+            try:
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        else:
+            self.db.rollback()
@@ -0,0 +1,328 @@
+# src/db/writer.py
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..core.config import settings
+from ..repositories.base import DEFER_COMMIT
+from .sqlite import configure_sqlite, enable_sqlite_savepoints
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Unité d'écriture : reçoit la session de l'écrivain et retourne un résultat
+WriteUnit = Callable[[Session], T]
+
+_STOP = object()
+
+
+class WriteQueueFull(RuntimeError):
+    """
+    Levée lorsque la file d'écriture est pleine.
+    """
+
+
+class _Job:
+    __slots__ = ("unit", "future", "submitted_at")
+
+    def __init__(self, unit: WriteUnit, future: Future):
+        self.unit = unit
+        self.future = future
+        self.submitted_at = time.perf_counter()
+
+
+def create_writer_session_factory() -> sessionmaker:
+    """
+    Crée la fabrique de sessions de l'écrivain : une seule connexion, réservée aux écritures.
+    """
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
+        pool_size=1,
+        max_overflow=0,
+        echo=settings.SQL_ECHO
+    )
+    configure_sqlite(engine, settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS)
+    # Points de sauvegarde par unité en mode commit groupé
+    enable_sqlite_savepoints(engine)
+    # Les objets retournés aux appelants restent lisibles une fois la session fermée
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+class WriteCoordinator:
+    """
+    Écrivain unique : exécute dans l'ordre les unités d'écriture soumises par les requêtes.
+
+    SQLite n'accepte qu'un écrivain à la fois ; plutôt que de laisser les
+    threads se disputer le verrou (« database is locked », latences extrêmes),
+    les écritures passent par une file et un thread dédié muni de sa propre
+    connexion. Les lectures passent par un pool distinct de connexions en
+    lecture seule (read_engine et async_engine, voir db/session.py).
+
+    En mode commit groupé, les unités arrivées dans une courte fenêtre
+    partagent une transaction (un seul fsync) ; chacune s'exécute dans un
+    point de sauvegarde, si bien qu'une unité en échec n'affecte pas les autres.
+    La fabrique de sessions doit alors permettre les points de sauvegarde
+    (voir enable_sqlite_savepoints).
+    """
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_queue: int = settings.WRITE_QUEUE_SIZE,
+        group_commit: bool = settings.WRITE_GROUP_COMMIT,
+        group_max_size: int = settings.WRITE_GROUP_MAX_SIZE,
+        group_window: float = settings.WRITE_GROUP_WINDOW_MS / 1000
+    ):
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.group_commit = group_commit
+        self.group_max_size = group_max_size
+        self.group_window = group_window
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "commits": 0,
+            "group_fallbacks": 0,
+            "wait_seconds": 0.0,
+            "run_seconds": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Démarre le thread écrivain.
+        """
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Arrête le thread écrivain après avoir traité les unités déjà soumises.
+        """
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        # Unités arrivées après le signal d'arrêt
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not _STOP:
+                job.future.set_exception(WriteQueueFull("Le coordinateur d'écriture est arrêté"))
+
+    def submit(self, unit: WriteUnit) -> Future:
+        """
+        Soumet une unité d'écriture et retourne un Future portant son résultat.
+        """
+        future: Future = Future()
+        with self._lock:
+            depth = self._queue.qsize()
+            if not self.running or depth >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise WriteQueueFull("La file d'écriture est pleine")
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth + 1)
+            self._queue.put(_Job(unit, future))
+        return future
+
+    def run(self, unit: Callable[[Session], T], timeout: Optional[float] = settings.WRITE_TIMEOUT) -> T:
+        """
+        Soumet une unité d'écriture et attend son résultat (les exceptions sont propagées).
+        """
+        return self.submit(unit).result(timeout)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            stop = self._collect(batch)
+            jobs = [job for job in batch if job.future.set_running_or_notify_cancel()]
+            self._record_batch(len(jobs))
+            if self.group_commit and len(jobs) > 1:
+                self._execute_group(jobs)
+            else:
+                for job in jobs:
+                    self._execute(job)
+            if stop:
+                break
+
+    def _collect(self, batch: list) -> bool:
+        """
+        Complète le lot avec les unités en attente ; retourne True si l'arrêt a été demandé.
+        """
+        if not self.group_commit:
+            # Tout ce qui attend déjà forme un lot, traité dans l'ordre d'arrivée
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    return False
+                if item is _STOP:
+                    return True
+                batch.append(item)
+
+        # Commit groupé : attendre d'autres unités pendant la fenêtre, dans la limite du lot
+        deadline = time.perf_counter() + self.group_window
+        while len(batch) < self.group_max_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _execute(self, job: _Job) -> None:
+        started_at = time.perf_counter()
+        session = self.session_factory()
+        try:
+            result = job.unit(session)
+            # Valider ce que l'unité aurait laissé en attente
+            session.commit()
+        except BaseException as exc:
+            session.rollback()
+            self._finish(job, started_at, exc=exc)
+        else:
+            self._finish(job, started_at, result=result)
+        finally:
+            session.close()
+        with self._lock:
+            self._stats["commits"] += 1
+
+    def _execute_group(self, jobs: list) -> None:
+        """
+        Exécute un lot dans une seule transaction, chaque unité dans son point de sauvegarde.
+        """
+        started_at = time.perf_counter()
+        session = self.session_factory()
+        session.info[DEFER_COMMIT] = True
+        outcomes = []
+        try:
+            for job in jobs:
+                savepoint = session.begin_nested()
+                try:
+                    result = job.unit(session)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                except BaseException as exc:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    outcomes.append((job, None, exc))
+                else:
+                    outcomes.append((job, result, None))
+            session.commit()
+        except BaseException:
+            # Échec du commit commun : les unités réussies sont rejouées seules pour isoler
+            # l'erreur ; celles déjà en échec gardent leur exception (sans second passage)
+            logger.warning("Échec du commit groupé, exécution unitaire du lot", exc_info=True)
+            session.rollback()
+            session.close()
+            with self._lock:
+                self._stats["group_fallbacks"] += 1
+            failed = {id(job): exc for job, _, exc in outcomes if exc is not None}
+            for job in jobs:
+                if id(job) in failed:
+                    self._finish(job, started_at, exc=failed[id(job)])
+                else:
+                    self._execute(job)
+            return
+        session.close()
+        with self._lock:
+            self._stats["commits"] += 1
+        for job, result, exc in outcomes:
+            self._finish(job, started_at, result=result, exc=exc)
+
+    def _finish(self, job: _Job, started_at: float, result: Any = None, exc: Optional[BaseException] = None) -> None:
+        if exc is not None:
+            job.future.set_exception(exc)
+        else:
+            job.future.set_result(result)
+        with self._lock:
+            self._stats["failed" if exc is not None else "completed"] += 1
+            self._stats["wait_seconds"] += started_at - job.submitted_at
+            self._stats["run_seconds"] += time.perf_counter() - started_at
+
+    def _record_batch(self, size: int) -> None:
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], size)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques de la file (profondeur, attente, taille des lots).
+        """
+        with self._lock:
+            info: Dict[str, Any] = dict(self._stats)
+        done = info["completed"] + info["failed"]
+        info.update({
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "avg_wait_ms": info["wait_seconds"] * 1000 / done if done else 0.0,
+            "avg_run_ms": info["run_seconds"] * 1000 / done if done else 0.0,
+            "avg_batch_size": done / info["batches"] if info["batches"] else 0.0,
+        })
+        return info
+
+
+# Coordinateur actif (None : les écritures se font sur la session de la requête)
+write_coordinator: Optional[WriteCoordinator] = None
+
+
+def start_write_coordinator(session_factory: Optional[sessionmaker] = None) -> WriteCoordinator:
+    """
+    Démarre le coordinateur d'écriture (au démarrage de l'application si WRITE_COORDINATOR est actif).
+    """
+    global write_coordinator
+    if write_coordinator is None:
+        write_coordinator = WriteCoordinator(session_factory or create_writer_session_factory())
+        write_coordinator.start()
+        logger.info("Coordinateur d'écriture démarré")
+    return write_coordinator
+
+
+def stop_write_coordinator() -> None:
+    """
+    Arrête le coordinateur d'écriture (à l'arrêt de l'application).
+    """
+    global write_coordinator
+    coordinator, write_coordinator = write_coordinator, None
+    if coordinator is not None:
+        coordinator.stop()
+
+
+def run_write(db: Session, unit: Callable[[Session], T]) -> T:
+    """
+    Exécute une unité d'écriture : par l'écrivain unique s'il est démarré, sinon sur la session de la requête.
+    """
+    coordinator = write_coordinator
+    if coordinator is None:
+        return unit(db)
+    return coordinator.run(unit)
@@ -1,15 +1,57 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .config import settings
 from .api.routes import api_router
 from .models import base, books, users, loans  # Importer les modèles pour Alembic
+from .db.init_db import load_token_versions, rebuild_existence_filters, rebuild_suggestion_index
+from .core.config import settings as db_settings
+from .db.session import SessionLocal, async_engine, engine
+from .db.sqlite import log_sqlite_pragmas
+from .db.writer import WriteQueueFull, start_write_coordinator, stop_write_coordinator
+from .utils.cache import shutdown_cache
+from .utils.security import shutdown_password_hashing
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_sqlite_pragmas(engine, db_settings.SQLITE_PROFILE, db_settings.SQLITE_PRAGMAS)
+    db = SessionLocal()
+    try:
+        rebuild_existence_filters(db)
+        rebuild_suggestion_index(db)
+        if settings.TOKEN_FAST_PATH:
+            load_token_versions(db)
+    finally:
+        db.close()
+    if db_settings.WRITE_COORDINATOR:
+        start_write_coordinator()
+    yield
+    stop_write_coordinator()
+    # Arrêter les pools de rafraîchissement du cache et de hachage avec l'application
+    shutdown_cache()
+    shutdown_password_hashing()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
+@app.exception_handler(WriteQueueFull)
+async def write_queue_full_handler(request: Request, exc: WriteQueueFull):
+    # File d'écriture saturée : le client peut réessayer
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
 # Configuration CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
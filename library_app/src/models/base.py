@@ -10,6 +10,9 @@ class Base:
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Valeurs générées par la base relues dans le même INSERT/UPDATE (RETURNING), sans SELECT de rafraîchissement
+    __mapper_args__ = {"eager_defaults": True}
+
     # Génère automatiquement le nom de table à partir du nom de la classe
     @declared_attr
     def __tablename__(cls) -> str:
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, Index, CheckConstraint
+from sqlalchemy import DDL, Column, ForeignKey, Integer, String, Table, Text, Index, CheckConstraint, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..models.categories import Category, book_category
+from ..utils.search import normalize_text
 
 
 from .base import Base
@@ -17,6 +18,10 @@ class Book(Base):
     publisher = Column(String(100), nullable=True)
     language = Column(String(50), nullable=True)
     pages = Column(Integer, nullable=True)
+    # Titre et auteur sans accents ni majuscules (utils/search.py:normalize_text),
+    # tenus à jour à chaque écriture ORM (voir set_normalized_columns) pour les recherches et les tris
+    title_norm = Column(String(100), nullable=True, index=True)
+    author_norm = Column(String(100), nullable=True, index=True)
 
     # Contraintes
     __table_args__ = (
@@ -33,4 +38,64 @@ class Book(Base):
         "Category",
         secondary=book_category,
         back_populates="books"
-    )
\ No newline at end of file
+    )
+
+
+@event.listens_for(Book, "before_insert")
+@event.listens_for(Book, "before_update")
+def set_normalized_columns(mapper, connection, target: Book) -> None:
+    # Toute écriture ORM d'un livre, repository ou non (scripts, données de test) ;
+    # les INSERT/UPDATE Core passent par with_normalized_columns (repositories/books.py)
+    target.title_norm = normalize_text(target.title)
+    target.author_norm = normalize_text(target.author)
+
+
+# Trigrammes des mots du titre et de l'auteur (utils/search.py:trigrams), pour la
+# recherche tolérante aux fautes de frappe ; tenus à jour par BookRepository
+book_trigram = Table(
+    "book_trigram",
+    Base.metadata,
+    Column("trigram", String(3), primary_key=True),
+    Column("book_id", Integer, ForeignKey("book.id"), primary_key=True),
+    # Vérification des candidats : trigrammes d'un livre donné
+    Index("idx_book_trigram_book_id", "book_id", "trigram"),
+    sqlite_with_rowid=False,
+)
+
+
+# Index plein texte FTS5 du catalogue : table externe (le texte reste dans book),
+# tenue à jour par des triggers. Les accents et la casse sont ignorés par le
+# tokenizer ; les index de préfixes accélèrent la recherche au fil de la frappe.
+BOOK_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS book_fts USING fts5(
+        title, author, isbn, description,
+        content='book', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS book_fts_insert AFTER INSERT ON book BEGIN
+        INSERT INTO book_fts (rowid, title, author, isbn, description)
+        VALUES (new.id, new.title, new.author, new.isbn, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS book_fts_delete AFTER DELETE ON book BEGIN
+        INSERT INTO book_fts (book_fts, rowid, title, author, isbn, description)
+        VALUES ('delete', old.id, old.title, old.author, old.isbn, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS book_fts_update AFTER UPDATE OF title, author, isbn, description ON book BEGIN
+        INSERT INTO book_fts (book_fts, rowid, title, author, isbn, description)
+        VALUES ('delete', old.id, old.title, old.author, old.isbn, old.description);
+        INSERT INTO book_fts (rowid, title, author, isbn, description)
+        VALUES (new.id, new.title, new.author, new.isbn, new.description);
+    END
+    """,
+)
+
+for statement in BOOK_FTS_DDL:
+    event.listen(Book.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Book.__table__, "before_drop", DDL("DROP TABLE IF EXISTS book_fts").execute_if(dialect="sqlite"))
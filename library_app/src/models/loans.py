@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index, Boolean, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -20,7 +20,21 @@ class Loan(Base):
         # Index pour les recherches fréquentes
         Index('idx_loan_user_id', 'user_id'),
         Index('idx_loan_book_id', 'book_id'),
-        Index('idx_loan_return_date', 'return_date'),
+        # Emprunts par mois (statistiques)
+        Index('idx_loan_loan_date', 'loan_date'),
+        # Index partiels sur les seuls emprunts en cours (return_date IS NULL) :
+        # - par utilisateur et livre : éligibilité à l'emprunt, emprunts en cours d'un utilisateur
+        # - par échéance : emprunts en retard, nombre d'emprunts en cours
+        Index(
+            'idx_loan_active_user_book', 'user_id', 'book_id',
+            sqlite_where=text('return_date IS NULL'),
+            postgresql_where=text('return_date IS NULL')
+        ),
+        Index(
+            'idx_loan_active_due_date', 'due_date',
+            sqlite_where=text('return_date IS NULL'),
+            postgresql_where=text('return_date IS NULL')
+        ),
     )
 
     # Relations
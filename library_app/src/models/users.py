@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, CheckConstraint
 from sqlalchemy.orm import relationship
 
 from .base import Base
@@ -10,6 +10,8 @@ class User(Base):
     full_name = Column(String(100), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
+    # Incrémentée quand les droits changent : invalide les tokens « fast path »
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     phone = Column(String(20), nullable=True)
     address = Column(String(200), nullable=True)
 
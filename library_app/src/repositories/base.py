@@ -1,7 +1,9 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models.base import Base
@@ -12,6 +14,83 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Clé de Session.info : les repositories ne valident pas eux-mêmes, le commit
+# est fait plus tard pour toute l'opération (voir db/unit_of_work.py et db/writer.py)
+DEFER_COMMIT = "defer_commit"
+
+# Clé de Session.info : callbacks de after_commit en attente, avec la transaction
+# (ou le point de sauvegarde) dans laquelle chacun a été enregistré
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def _within(transaction, ancestor) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    # Point de sauvegarde (ou transaction) annulé : ses callbacks ne doivent jamais s'exécuter
+    pending = session.info.get(_AFTER_COMMIT)
+    if pending:
+        pending[:] = [
+            (transaction, callback) for transaction, callback in pending
+            if not _within(transaction, previous_transaction)
+        ]
+
+
+@event.listens_for(Session, "after_commit")
+def _run_committed(session: Session) -> None:
+    # after_commit est aussi émis à la validation d'un point de sauvegarde : seul le commit réel compte
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_AFTER_COMMIT, None)
+    for _, callback in pending or ():
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_unfinished(session: Session, transaction) -> None:
+    # Fin de la transaction sans commit (fermeture de la session) : callbacks abandonnés
+    if transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT, None)
+
+
+# Noms des colonnes par modèle, lus une fois dans les métadonnées du mapper
+_column_keys: Dict[type, Tuple[str, ...]] = {}
+
+
+def column_keys(model: Type[Base]) -> Tuple[str, ...]:
+    """
+    Retourne les noms des attributs colonnes d'un modèle.
+    """
+    keys = _column_keys.get(model)
+    if keys is None:
+        keys = _column_keys[model] = tuple(inspect(model).column_attrs.keys())
+    return keys
+
+
+def diff_columns(
+    model: Type[Base],
+    db_obj: Any,
+    obj_in: Union[BaseModel, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Retourne les colonnes dont la valeur reçue diffère de celle de l'objet.
+    """
+    if isinstance(obj_in, dict):
+        update_data = obj_in
+    else:
+        update_data = obj_in.dict(exclude_unset=True)
+    return {
+        key: update_data[key]
+        for key in column_keys(model)
+        if key in update_data and getattr(db_obj, key) != update_data[key]
+    }
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType], db: Session):
@@ -21,6 +100,36 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
         self.db = db
 
+    def commit(self) -> None:
+        """
+        Valide la transaction, ou se contente d'un flush quand le commit est différé.
+        """
+        if self.db.info.get(DEFER_COMMIT):
+            self.db.flush()
+        else:
+            self.db.commit()
+
+    def rollback(self) -> None:
+        """
+        Annule la transaction, ou seulement le point de sauvegarde courant quand le commit est différé.
+        """
+        nested = self.db.get_nested_transaction()
+        if self.db.info.get(DEFER_COMMIT) and nested is not None:
+            nested.rollback()
+        else:
+            self.db.rollback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Exécute callback une fois les écritures validées (immédiatement si le commit n'est pas différé).
+        """
+        if self.db.info.get(DEFER_COMMIT):
+            # Rattaché au point de sauvegarde courant : abandonné s'il est annulé
+            transaction = self.db.get_nested_transaction() or self.db.get_transaction()
+            self.db.info.setdefault(_AFTER_COMMIT, []).append((transaction, callback))
+        else:
+            callback()
+
     def get(self, id: Any) -> Optional[ModelType]:
         """
         Récupère un objet par son ID.
@@ -47,8 +156,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         db_obj = self.model(**obj_in_data)
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self.commit()
         return db_obj
 
     def update(
@@ -58,22 +166,18 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """
-        Met à jour un objet existant.
+        Met à jour un objet existant : seules les colonnes modifiées sont écrites.
         """
-        obj_data = jsonable_encoder(db_obj)
-
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        changes = diff_columns(self.model, db_obj, obj_in)
+        if not changes:
+            # Rien à écrire : ni UPDATE ni mise à jour de updated_at
+            return db_obj
 
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in changes.items():
+            setattr(db_obj, field, value)
 
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self.commit()
         return db_obj
 
     def remove(self, *, id: int) -> ModelType:
@@ -82,5 +186,68 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = self.db.query(self.model).get(id)
         self.db.delete(obj)
-        self.db.commit()
-        return obj
\ No newline at end of file
+        self.commit()
+        return obj
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        """
+        Initialise le repository asynchrone avec un modèle et une session asynchrone.
+        """
+        self.model = model
+        self.db = db
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        """
+        Récupère un objet par son ID.
+        """
+        return await self.db.get(self.model, id)
+
+    async def get_multi(
+        self, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """
+        Récupère plusieurs objets avec pagination.
+        """
+        result = await self.db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def create(self, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
+        """
+        Crée un nouvel objet.
+        """
+        obj_in_data = obj_in if isinstance(obj_in, dict) else jsonable_encoder(obj_in)
+        db_obj = self.model(**obj_in_data)
+        self.db.add(db_obj)
+        await self.db.commit()
+        return db_obj
+
+    async def update(
+        self,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Met à jour un objet existant : seules les colonnes modifiées sont écrites.
+        """
+        changes = diff_columns(self.model, db_obj, obj_in)
+        if not changes:
+            return db_obj
+
+        for field, value in changes.items():
+            setattr(db_obj, field, value)
+
+        await self.db.commit()
+        return db_obj
+
+    async def remove(self, *, id: int) -> Optional[ModelType]:
+        """
+        Supprime un objet.
+        """
+        obj = await self.db.get(self.model, id)
+        if obj is not None:
+            await self.db.delete(obj)
+            await self.db.commit()
+        return obj
@@ -1,16 +1,183 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import List, Optional, Dict, Any
-from ..utils.cache import cache, invalidate_cache
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, column, delete, false, func, insert, literal_column, or_, select, table, update
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+import math
 
-from .base import BaseRepository
-from ..models.books import Book
+from ..config import settings
+from ..utils.cache import cache, invalidate_tags
+from ..utils.bloom import ExistenceFilter
+from ..utils.search import fts_match_query, normalize_text, trigrams
+from ..utils.suggest import PrefixIndex, suggestion_keys
+
+from .base import AsyncBaseRepository, BaseRepository, diff_columns
+from ..models.books import Book, book_trigram
 from ..models.categories import Category, book_category
+from ..models.loans import Loan
+
+# Filtre d'existence des ISBN, reconstruit au démarrage de l'application
+isbn_filter = ExistenceFilter("book.isbn")
+
+# Index d'autocomplétion de /books/suggest (titres, auteurs, ISBN), construit au
+# démarrage de l'application, classé par nombre d'emprunts
+book_suggestions = PrefixIndex("book.suggest")
+
+# Champs indexés pour l'autocomplétion : une modification réindexe le livre
+SUGGESTION_FIELDS = {"title", "author", "isbn"}
+# Champs dont dérivent les trigrammes de book_trigram
+TRIGRAM_FIELDS = {"title", "author"}
+
+# Table virtuelle FTS5 (voir models/books.py), déclarée hors des métadonnées
+# pour que create_all ne la crée pas comme une table ordinaire
+book_fts = table("book_fts", column("rowid"))
+
+# Colonnes de BookRepository.search et poids bm25 (titre, auteur, ISBN, description)
+BOOK_SEARCH_COLUMNS = ("title", "author", "isbn")
+BOOK_FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+# Colonnes normalisées (models/books.py) et colonnes dont elles dérivent
+NORMALIZED_COLUMNS = {"title": "title_norm", "author": "author_norm"}
+# Borne supérieure des chaînes commençant par un préfixe donné
+_PREFIX_END = "\U0010ffff"
+
+
+def index_suggestion(book: Book) -> None:
+    """
+    Ajoute ou met à jour un livre dans l'index d'autocomplétion.
+    """
+    book_suggestions.add(
+        book.id,
+        suggestion_keys(book.title, book.author, book.isbn),
+        {"id": book.id, "title": book.title, "author": book.author, "isbn": book.isbn}
+    )
+
+
+def trigram_rows(book_id: int, title: Optional[str], author: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Lignes de book_trigram d'un livre : trigrammes de son titre et de son auteur.
+    """
+    return [{"trigram": gram, "book_id": book_id} for gram in sorted(trigrams(title) | trigrams(author))]
+
+
+def trigram_frequencies(grams: Sequence[str], cap: int):
+    """
+    Requête du nombre de livres contenant chaque trigramme, compté jusqu'à cap au plus (lecture d'index bornée).
+    """
+    return select(*(
+        select(func.count()).select_from(
+            select(book_trigram.c.book_id).where(book_trigram.c.trigram == gram).limit(cap).subquery()
+        ).scalar_subquery()
+        for gram in grams
+    ))
+
+
+def fuzzy_candidates(grams: Sequence[str], frequencies: Sequence[int], threshold: float, max_candidates: int):
+    """
+    Requête des livres contenant au moins threshold des trigrammes, avec le nombre de trigrammes partagés.
+
+    Filtrage par préfixe : un livre qui atteint le seuil contient forcément l'un des
+    len(grams) - ceil(threshold * len(grams)) + 1 trigrammes les plus rares. Seuls
+    ces trigrammes sont lus, du plus rare au plus fréquent tant que le total reste
+    sous FUZZY_MAX_POSTINGS lignes (saisies faites de trigrammes très courants) ;
+    les max_candidates livres qui en partagent le plus sont ensuite vérifiés sur
+    tous les trigrammes par l'index (book_id, trigram).
+    """
+    required = max(1, math.ceil(threshold * len(grams)))
+    rarest, postings = [], 0
+    for frequency, gram in sorted(zip(frequencies, grams))[:len(grams) - required + 1]:
+        if rarest and postings + frequency > settings.FUZZY_MAX_POSTINGS:
+            break
+        rarest.append(gram)
+        postings += frequency
+    candidates = (
+        select(book_trigram.c.book_id).where(book_trigram.c.trigram.in_(rarest))
+        .group_by(book_trigram.c.book_id)
+        .order_by(func.count().desc()).limit(max_candidates)
+    )
+    shared = func.count().label("shared")
+    return (
+        select(book_trigram.c.book_id, shared)
+        .where(book_trigram.c.book_id.in_(candidates), book_trigram.c.trigram.in_(grams))
+        .group_by(book_trigram.c.book_id)
+        .having(func.count() >= required)
+        .order_by(shared.desc(), book_trigram.c.book_id)
+    )
+
+
+def with_normalized_columns(obj_in: Any) -> Dict[str, Any]:
+    """
+    Retourne les données d'un livre complétées par les colonnes normalisées des champs présents.
+    """
+    data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    for field, normalized in NORMALIZED_COLUMNS.items():
+        if field in data:
+            data[normalized] = normalize_text(data[field])
+    return data
+
+
+def normalized_prefix(column, text: str):
+    """
+    Condition "la colonne normalisée commence par text", résolue par un parcours d'intervalle de son index.
+    """
+    prefix = normalize_text(text)
+    if not prefix:
+        return false()
+    return and_(column >= prefix, column < prefix + _PREFIX_END)
+
+
+def normalized_contains(column, text: str):
+    """
+    Condition "la colonne normalisée contient text" (fragment en milieu de mot) : parcours complet, sans index.
+    """
+    fragment = normalize_text(text)
+    if not fragment:
+        return false()
+    return column.contains(fragment, autoescape=True)
+
+
+def isbn_prefix(text: str):
+    """
+    Condition "l'ISBN commence par text" sur la colonne brute : saisie seulement débarrassée
+    des espaces, la clé de contrôle X acceptée en minuscule comme dans l'index d'autocomplétion.
+    """
+    prefix = text.strip()
+    if not prefix:
+        return false()
+    prefixes = {prefix, prefix.upper()}
+    return or_(*(and_(Book.isbn >= value, Book.isbn < value + _PREFIX_END) for value in sorted(prefixes)))
+
+
+def fts_ids(expression: Optional[str]):
+    """
+    Condition "le livre correspond à l'expression FTS5", sans classement.
+    """
+    if expression is None:
+        return false()
+    return Book.id.in_(
+        select(book_fts.c.rowid).where(literal_column("book_fts").match(expression))
+    )
+
+
+def match_books(statement, *expressions: Optional[str], ranked: bool = True):
+    """
+    Restreint une requête sur Book aux livres de l'index plein texte correspondant à toutes les expressions.
+
+    Les expressions viennent de fts_match_query (None : saisie sans aucun mot,
+    aucun résultat). Les résultats sont classés par pertinence (bm25) si ranked.
+    """
+    if not expressions or any(expression is None for expression in expressions):
+        return statement.where(false())
+    statement = statement.join(book_fts, book_fts.c.rowid == Book.id).where(
+        literal_column("book_fts").match(" AND ".join(f"({expression})" for expression in expressions))
+    )
+    if ranked:
+        statement = statement.order_by(func.bm25(literal_column("book_fts"), *BOOK_FTS_WEIGHTS))
+    return statement
 
 
 class BookRepository(BaseRepository[Book, None, None]):
 
-    @cache(expiry=60)  # Cache pendant 1 minute
+    # Frais pendant 1 minute, puis servi en recalculant en arrière-plan (5 minutes au plus)
+    @cache(expiry=300, stale_after=60, tags=("books",), single_flight=True)
     def get_stats(self) -> Dict[str, Any]:
         """
         Récupère des statistiques sur les livres.
@@ -30,48 +197,143 @@ class BookRepository(BaseRepository[Book, None, None]):
         Crée un nouveau livre et invalide le cache.
         """
         # Remove category_ids if present
-        obj_in_data = obj_in.dict() if hasattr(obj_in, "dict") else dict(obj_in)
+        obj_in_data = with_normalized_columns(obj_in.dict() if hasattr(obj_in, "dict") else obj_in)
         obj_in_data.pop("category_ids", None)
         book = self.model(**obj_in_data)
         self.db.add(book)
-        self.db.commit()
-        self.db.refresh(book)
-        invalidate_cache("src.repositories.books")
+        self.db.flush()
+        self.db.execute(insert(book_trigram), trigram_rows(book.id, book.title, book.author))
+        self.commit()
+        self.after_commit(lambda: invalidate_tags("books"))
+        self.after_commit(lambda: index_suggestion(book))
+        isbn_filter.add(book.isbn)
         return book
 
     def update(self, *, db_obj: Book, obj_in: Any) -> Book:
         """
-        Met à jour un livre et invalide le cache.
+        Met à jour un livre et invalide le cache (sauf si rien n'a changé).
         """
+        obj_in = with_normalized_columns(obj_in)
+        changes = diff_columns(self.model, db_obj, obj_in)
+        if not changes:
+            return db_obj
+        if TRIGRAM_FIELDS & changes.keys():
+            # Trigrammes remplacés dans la même transaction que le livre
+            self.db.execute(delete(book_trigram).where(book_trigram.c.book_id == db_obj.id))
+            self.db.execute(insert(book_trigram), trigram_rows(
+                db_obj.id, obj_in.get("title", db_obj.title), obj_in.get("author", db_obj.author)
+            ))
         book = super().update(db_obj=db_obj, obj_in=obj_in)
-        invalidate_cache("src.repositories.books")
+        self.after_commit(lambda: invalidate_tags("books"))
+        if SUGGESTION_FIELDS & changes.keys():
+            self.after_commit(lambda: index_suggestion(book))
+        isbn_filter.add(book.isbn)
         return book
 
     def remove(self, *, id: int) -> Book:
         """
         Supprime un livre et invalide le cache.
         """
+        self.db.execute(delete(book_trigram).where(book_trigram.c.book_id == id))
         book = super().remove(id=id)
-        invalidate_cache("src.repositories.books")
+        self.after_commit(lambda: invalidate_tags("books"))
+        self.after_commit(lambda: book_suggestions.remove(id))
         return book
 
+    def adjust_quantity(self, *, book_id: int, delta: int) -> bool:
+        """
+        Modifie le stock d'un livre en un seul UPDATE conditionnel, sans lecture préalable.
+
+        Un retrait n'est appliqué que s'il reste assez d'exemplaires : la condition
+        est évaluée par la base au moment de l'écriture, deux emprunts concurrents
+        ne peuvent donc pas prendre le même dernier exemplaire. Retourne False si
+        le stock est insuffisant ou si le livre n'existe pas.
+        """
+        statement = update(Book).where(Book.id == book_id)
+        if delta < 0:
+            statement = statement.where(Book.quantity >= -delta)
+        result = self.db.execute(
+            statement.values(quantity=Book.quantity + delta)
+            .execution_options(synchronize_session="fetch")
+        )
+        if result.rowcount != 1:
+            return False
+        self.commit()
+        self.after_commit(lambda: invalidate_tags("books"))
+        return True
+
     def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
         """
         Récupère un livre par son ISBN.
         """
         return self.db.query(Book).filter(Book.isbn == isbn).first()
 
+    def isbn_exists(self, *, isbn: str) -> bool:
+        """
+        Vérifie si un ISBN est déjà utilisé, sans requête quand le filtre d'existence suffit.
+        """
+        if not isbn_filter.might_exist(isbn):
+            return False
+        exists = self.db.query(Book.id).filter(Book.isbn == isbn).first() is not None
+        if not exists:
+            isbn_filter.record_missing(isbn)
+        return exists
+
+    def rebuild_isbn_filter(self) -> None:
+        """
+        Reconstruit le filtre d'existence des ISBN à partir de la table book.
+        """
+        count = self.db.query(func.count(Book.id)).scalar() or 0
+        isbns = (isbn for (isbn,) in self.db.query(Book.isbn).yield_per(10_000))
+        isbn_filter.rebuild(isbns, count=count)
+
+    def rebuild_suggestions(self) -> None:
+        """
+        Reconstruit l'index d'autocomplétion à partir des livres et de leur nombre d'emprunts.
+        """
+        popularity = dict(self.db.query(Loan.book_id, func.count(Loan.id)).group_by(Loan.book_id).all())
+        rows = self.db.query(
+            Book.id, Book.title, Book.author, Book.isbn, Book.title_norm, Book.author_norm
+        ).yield_per(10_000)
+        book_suggestions.rebuild(
+            (
+                (
+                    id,
+                    # Colonnes normalisées en base : pas de renormalisation (sauf lignes non renseignées)
+                    suggestion_keys(title_norm or normalize_text(title), author_norm or normalize_text(author),
+                                    isbn.lower(), normalized=True),
+                    {"id": id, "title": title, "author": author, "isbn": isbn}
+                )
+                for id, title, author, isbn, title_norm, author_norm in rows
+            ),
+            popularity
+        )
+
     def get_by_title(self, *, title: str) -> List[Book]:
         """
-        Récupère des livres par leur titre (recherche partielle).
+        Récupère des livres dont le titre commence par title ou en contient les mots, sans tenir compte des accents.
+
+        Sans résultat, repli sur les titres qui contiennent title n'importe où (fragment en milieu de mot).
         """
-        return self.db.query(Book).filter(Book.title.ilike(f"%{title}%")).all()
+        query = self.db.query(Book).order_by(Book.title_norm)
+        books = query.filter(or_(
+            normalized_prefix(Book.title_norm, title),
+            fts_ids(fts_match_query(title, columns=("title",)))
+        )).all()
+        return books or query.filter(normalized_contains(Book.title_norm, title)).all()
 
     def get_by_author(self, *, author: str) -> List[Book]:
         """
-        Récupère des livres par leur auteur (recherche partielle).
+        Récupère des livres dont l'auteur commence par author ou en contient les mots, sans tenir compte des accents.
+
+        Sans résultat, repli sur les auteurs qui contiennent author n'importe où (fragment en milieu de mot).
         """
-        return self.db.query(Book).filter(Book.author.ilike(f"%{author}%")).all()
+        query = self.db.query(Book).order_by(Book.author_norm, Book.title_norm)
+        books = query.filter(or_(
+            normalized_prefix(Book.author_norm, author),
+            fts_ids(fts_match_query(author, columns=("author",)))
+        )).all()
+        return books or query.filter(normalized_contains(Book.author_norm, author)).all()
 
     def get_with_categories(self, *, id: int) -> Optional[Book]:
         """
@@ -87,15 +349,32 @@ class BookRepository(BaseRepository[Book, None, None]):
 
     def search(self, query: str) -> List[Book]:
         """
-        Recherche des livres par titre, auteur ou ISBN.
+        Recherche des livres par titre, auteur ou ISBN (index plein texte, par pertinence puis par titre).
+        """
+        return match_books(
+            self.db.query(Book), fts_match_query(query, columns=BOOK_SEARCH_COLUMNS)
+        ).order_by(Book.title_norm).all()
+
+    def fuzzy_scores(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Identifiants des livres proches de la saisie (fautes de frappe), avec leur similarité, les plus proches d'abord.
+        """
+        grams = sorted(trigrams(query))
+        if not grams:
+            return []
+        frequencies = self.db.execute(trigram_frequencies(grams, settings.FUZZY_MAX_POSTINGS)).one()
+        rows = self.db.execute(fuzzy_candidates(
+            grams, frequencies, settings.FUZZY_SIMILARITY_THRESHOLD, settings.FUZZY_MAX_CANDIDATES
+        ))
+        return [(book_id, shared / len(grams)) for book_id, shared in rows]
+
+    def fuzzy_search(self, query: str) -> List[Book]:
+        """
+        Recherche des livres par titre ou auteur en tolérant les fautes de frappe, les plus proches d'abord.
         """
-        return self.db.query(Book).filter(
-            or_(
-                Book.title.ilike(f"%{query}%"),
-                Book.author.ilike(f"%{query}%"),
-                Book.isbn.ilike(f"%{query}%")
-            )
-        ).all()
+        ranking = [book_id for book_id, _ in self.fuzzy_scores(query)]
+        books = {book.id: book for book in self.db.query(Book).filter(Book.id.in_(ranking))}
+        return [books[book_id] for book_id in ranking if book_id in books]
 
     def get_by_category(self, *, category_id: int, skip: int = 0, limit: int = 100) -> List[Book]:
         """
@@ -118,7 +397,7 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise ValueError(f"Catégorie avec l'ID {category_id} non trouvée")
 
         book.categories.append(category)
-        self.db.commit()
+        self.commit()
 
     def remove_category(self, *, book_id: int, category_id: int) -> None:
         """
@@ -133,18 +412,136 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise ValueError(f"Catégorie avec l'ID {category_id} non trouvée")
 
         book.categories.remove(category)
-        self.db.commit()
+        self.commit()
 
-    def get_stats(self) -> Dict[str, Any]:
+
+class AsyncBookRepository(AsyncBaseRepository[Book, None, None]):
+    """
+    Variante asynchrone de BookRepository pour les routes async def.
+
+    Les catégories sont chargées avec les livres : un chargement paresseux
+    est impossible une fois la session asynchrone rendue à la route.
+    """
+
+    def select_with_categories(self):
         """
-        Récupère des statistiques sur les livres.
+        Construit la requête des livres avec chargement de leurs catégories.
         """
-        total_books = self.db.query(func.sum(Book.quantity)).scalar() or 0
-        unique_books = self.db.query(func.count(Book.id)).scalar() or 0
-        avg_publication_year = self.db.query(func.avg(Book.publication_year)).scalar() or 0
+        return select(Book).options(selectinload(Book.categories))
 
-        return {
-            "total_books": total_books,
-            "unique_books": unique_books,
-            "avg_publication_year": avg_publication_year
-        }
\ No newline at end of file
+    async def get(self, id: Any) -> Optional[Book]:
+        """
+        Récupère un livre avec ses catégories.
+        """
+        result = await self.db.scalars(self.select_with_categories().filter(Book.id == id))
+        return result.first()
+
+    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[Book]:
+        """
+        Récupère plusieurs livres avec leurs catégories.
+        """
+        result = await self.db.scalars(self.select_with_categories().offset(skip).limit(limit))
+        return list(result)
+
+    async def create(self, *, obj_in: Any) -> Book:
+        """
+        Crée un nouveau livre et invalide le cache.
+        """
+        obj_in_data = with_normalized_columns(obj_in.dict() if hasattr(obj_in, "dict") else obj_in)
+        obj_in_data.pop("category_ids", None)
+        book = self.model(**obj_in_data, categories=[])
+        self.db.add(book)
+        await self.db.flush()
+        await self.db.execute(insert(book_trigram), trigram_rows(book.id, book.title, book.author))
+        await self.db.commit()
+        invalidate_tags("books")
+        index_suggestion(book)
+        isbn_filter.add(book.isbn)
+        return book
+
+    async def update(self, *, db_obj: Book, obj_in: Any) -> Book:
+        """
+        Met à jour un livre et invalide le cache (sauf si rien n'a changé).
+        """
+        obj_in = with_normalized_columns(obj_in)
+        changes = diff_columns(self.model, db_obj, obj_in)
+        if not changes:
+            return db_obj
+        if TRIGRAM_FIELDS & changes.keys():
+            await self.db.execute(delete(book_trigram).where(book_trigram.c.book_id == db_obj.id))
+            await self.db.execute(insert(book_trigram), trigram_rows(
+                db_obj.id, obj_in.get("title", db_obj.title), obj_in.get("author", db_obj.author)
+            ))
+        book = await super().update(db_obj=db_obj, obj_in=obj_in)
+        invalidate_tags("books")
+        if SUGGESTION_FIELDS & changes.keys():
+            index_suggestion(book)
+        isbn_filter.add(book.isbn)
+        return book
+
+    async def remove(self, *, id: int) -> Optional[Book]:
+        """
+        Supprime un livre et invalide le cache.
+        """
+        await self.db.execute(delete(book_trigram).where(book_trigram.c.book_id == id))
+        book = await super().remove(id=id)
+        invalidate_tags("books")
+        book_suggestions.remove(id)
+        return book
+
+    async def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
+        """
+        Récupère un livre par son ISBN.
+        """
+        result = await self.db.scalars(self.select_with_categories().filter(Book.isbn == isbn))
+        return result.first()
+
+    async def isbn_exists(self, *, isbn: str) -> bool:
+        """
+        Vérifie si un ISBN est déjà utilisé, sans requête quand le filtre d'existence suffit.
+        """
+        if not isbn_filter.might_exist(isbn):
+            return False
+        exists = await self.db.scalar(select(Book.id).filter(Book.isbn == isbn).limit(1)) is not None
+        if not exists:
+            isbn_filter.record_missing(isbn)
+        return exists
+
+    async def search(self, query: str) -> List[Book]:
+        """
+        Recherche des livres par titre, auteur ou ISBN (index plein texte, par pertinence puis par titre).
+        """
+        result = await self.db.scalars(match_books(
+            self.select_with_categories(), fts_match_query(query, columns=BOOK_SEARCH_COLUMNS)
+        ).order_by(Book.title_norm))
+        return list(result)
+
+    async def fuzzy_scores(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Identifiants des livres proches de la saisie (fautes de frappe), avec leur similarité, les plus proches d'abord.
+        """
+        grams = sorted(trigrams(query))
+        if not grams:
+            return []
+        frequencies = (await self.db.execute(trigram_frequencies(grams, settings.FUZZY_MAX_POSTINGS))).one()
+        rows = await self.db.execute(fuzzy_candidates(
+            grams, frequencies, settings.FUZZY_SIMILARITY_THRESHOLD, settings.FUZZY_MAX_CANDIDATES
+        ))
+        return [(book_id, shared / len(grams)) for book_id, shared in rows]
+
+    async def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Suggestions par début de titre, d'auteur ou d'ISBN lues en base, tant que l'index d'autocomplétion n'est pas construit.
+        """
+        popularity = select(func.count(Loan.id)).where(Loan.book_id == Book.id).scalar_subquery()
+        result = await self.db.execute(
+            select(Book.id, Book.title, Book.author, Book.isbn, popularity.label("popularity"))
+            .where(or_(
+                normalized_prefix(Book.title_norm, prefix),
+                normalized_prefix(Book.author_norm, prefix),
+                isbn_prefix(prefix)
+            ))
+            .order_by(popularity.desc(), Book.title_norm)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result]
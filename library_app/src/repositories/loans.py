@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 from ..models.loans import Loan
 from ..models.books import Book
 from ..models.users import User
@@ -16,6 +16,36 @@ class LoanRepository(BaseRepository[Loan, None, None]):
         """
         return self.db.query(Loan).filter(Loan.return_date == None).all()
 
+    def get_active_loans_by_user(self, *, user_id: int) -> List[Loan]:
+        """
+        Récupère les emprunts actifs (non retournés) d'un utilisateur.
+        """
+        return self.db.query(Loan).filter(
+            Loan.user_id == user_id,
+            Loan.return_date == None
+        ).all()
+
+    def has_active_loan(self, *, user_id: int, book_id: int) -> bool:
+        """
+        Indique si l'utilisateur a un emprunt non rendu de ce livre (EXISTS sur l'index partiel).
+        """
+        return self.db.query(
+            self.db.query(Loan.id).filter(
+                Loan.user_id == user_id,
+                Loan.book_id == book_id,
+                Loan.return_date == None
+            ).exists()
+        ).scalar()
+
+    def count_active_loans_by_user(self, *, user_id: int) -> int:
+        """
+        Compte les emprunts non rendus d'un utilisateur (COUNT sur l'index partiel).
+        """
+        return self.db.query(func.count(Loan.id)).filter(
+            Loan.user_id == user_id,
+            Loan.return_date == None
+        ).scalar() or 0
+
     def get_overdue_loans(self) -> List[Loan]:
         """
         Récupère les emprunts en retard.
@@ -86,4 +116,41 @@ class LoanRepository(BaseRepository[Loan, None, None]):
             "active_loans": active_loans,
             "overdue_loans": overdue_loans,
             "loans_by_month": loans_by_month_dict
-        }
\ No newline at end of file
+        }
+
+
+class AsyncLoanRepository(AsyncBaseRepository[Loan, None, None]):
+    """
+    Variante asynchrone de LoanRepository pour les routes async def.
+    """
+    async def get_active_loans(self) -> List[Loan]:
+        """
+        Récupère les emprunts actifs (non retournés).
+        """
+        result = await self.db.scalars(select(Loan).filter(Loan.return_date == None))
+        return list(result)
+
+    async def get_overdue_loans(self) -> List[Loan]:
+        """
+        Récupère les emprunts en retard.
+        """
+        now = datetime.utcnow()
+        result = await self.db.scalars(select(Loan).filter(
+            Loan.return_date == None,
+            Loan.due_date < now
+        ))
+        return list(result)
+
+    async def get_loans_by_user(self, *, user_id: int) -> List[Loan]:
+        """
+        Récupère les emprunts d'un utilisateur.
+        """
+        result = await self.db.scalars(select(Loan).filter(Loan.user_id == user_id))
+        return list(result)
+
+    async def get_loans_by_book(self, *, book_id: int) -> List[Loan]:
+        """
+        Récupère les emprunts d'un livre.
+        """
+        result = await self.db.scalars(select(Loan).filter(Loan.book_id == book_id))
+        return list(result)
@@ -1,12 +1,132 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from typing import Any, Optional
 
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository
 from ..models.users import User
+from ..config import settings
+from ..utils.bloom import ExistenceFilter
+from ..utils.token_versions import TokenVersionTable
+
+# Filtre d'existence des emails, reconstruit au démarrage de l'application
+email_filter = ExistenceFilter("user.email")
+
+# Versions de token des utilisateurs, rechargées périodiquement (mode TOKEN_FAST_PATH)
+token_versions = TokenVersionTable(settings.TOKEN_VERSION_REFRESH_INTERVAL)
 
 
 class UserRepository(BaseRepository[User, None, None]):
+    def create(self, *, obj_in: Any) -> User:
+        """
+        Crée un utilisateur et enregistre son email dans le filtre d'existence.
+        """
+        user = super().create(obj_in=obj_in)
+        email_filter.add(user.email)
+        return user
+
+    def update(self, *, db_obj: User, obj_in: Any) -> User:
+        """
+        Met à jour un utilisateur et enregistre son email dans le filtre d'existence.
+        """
+        user = super().update(db_obj=db_obj, obj_in=obj_in)
+        # Le filtre peut être en avance sur la base (faux positif sans conséquence),
+        # jamais en retard ; la version de token, elle, ne change qu'une fois validée
+        email_filter.add(user.email)
+        self.after_commit(lambda: token_versions.set(user.id, user.token_version))
+        return user
+
+    def remove(self, *, id: int) -> User:
+        """
+        Supprime un utilisateur et retire sa version de token.
+        """
+        user = super().remove(id=id)
+        # Retrait immédiat, même avant validation : au pire le token repasse par la base
+        token_versions.revoke(id)
+        return user
+
     def get_by_email(self, *, email: str) -> User:
         """
         Récupère un utilisateur par son email.
         """
-        return self.db.query(User).filter(User.email == email).first()
\ No newline at end of file
+        return self.db.query(User).filter(User.email == email).first()
+
+    def email_exists(self, *, email: str) -> bool:
+        """
+        Vérifie si un email est déjà utilisé, sans requête quand le filtre d'existence suffit.
+        """
+        if not email_filter.might_exist(email):
+            return False
+        exists = self.db.query(User.id).filter(User.email == email).first() is not None
+        if not exists:
+            email_filter.record_missing(email)
+        return exists
+
+    def rebuild_email_filter(self) -> None:
+        """
+        Reconstruit le filtre d'existence des emails à partir de la table user.
+        """
+        count = self.db.query(func.count(User.id)).scalar() or 0
+        emails = (email for (email,) in self.db.query(User.email).yield_per(10_000))
+        email_filter.rebuild(emails, count=count)
+
+    def reload_token_versions(self) -> None:
+        """
+        Recharge la table des versions de token à partir de la table user.
+        """
+        token_versions.load(self.db.query(User.id, User.token_version).yield_per(10_000))
+
+
+class AsyncUserRepository(AsyncBaseRepository[User, None, None]):
+    """
+    Variante asynchrone de UserRepository pour les routes async def.
+    """
+    async def create(self, *, obj_in: Any) -> User:
+        """
+        Crée un utilisateur et enregistre son email dans le filtre d'existence.
+        """
+        user = await super().create(obj_in=obj_in)
+        email_filter.add(user.email)
+        return user
+
+    async def update(self, *, db_obj: User, obj_in: Any) -> User:
+        """
+        Met à jour un utilisateur et enregistre son email dans le filtre d'existence.
+        """
+        user = await super().update(db_obj=db_obj, obj_in=obj_in)
+        email_filter.add(user.email)
+        # AsyncBaseRepository.update valide lui-même : la version est déjà en base
+        token_versions.set(user.id, user.token_version)
+        return user
+
+    async def remove(self, *, id: int) -> Optional[User]:
+        """
+        Supprime un utilisateur et retire sa version de token.
+        """
+        user = await super().remove(id=id)
+        token_versions.revoke(id)
+        return user
+
+    async def get_by_email(self, *, email: str) -> Optional[User]:
+        """
+        Récupère un utilisateur par son email.
+        """
+        result = await self.db.scalars(select(User).filter(User.email == email))
+        return result.first()
+
+    async def email_exists(self, *, email: str) -> bool:
+        """
+        Vérifie si un email est déjà utilisé, sans requête quand le filtre d'existence suffit.
+        """
+        if not email_filter.might_exist(email):
+            return False
+        exists = await self.db.scalar(select(User.id).filter(User.email == email).limit(1)) is not None
+        if not exists:
+            email_filter.record_missing(email)
+        return exists
+
+    async def reload_token_versions(self) -> None:
+        """
+        Recharge la table des versions de token à partir de la table user.
+        """
+        result = await self.db.execute(select(User.id, User.token_version))
+        token_versions.load(result.all())
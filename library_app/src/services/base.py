@@ -1,15 +1,29 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import wraps
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from ..db.unit_of_work import UnitOfWork
 from ..models.base import Base
 from ..repositories.base import BaseRepository
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def transactional(method: F) -> F:
+    """
+    Exécute une méthode de service dans une unité de travail : un seul commit à la fin, rollback en cas d'erreur.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.unit_of_work():
+            return method(self, *args, **kwargs)
+    return wrapper  # type: ignore[return-value]
 
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
@@ -19,6 +33,12 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, repository: BaseRepository):
         self.repository = repository
 
+    def unit_of_work(self) -> UnitOfWork:
+        """
+        Ouvre une unité de travail sur la session du repository.
+        """
+        return UnitOfWork(self.repository.db)
+
     def get(self, id: Any) -> Optional[ModelType]:
         """
         Récupère un objet par son ID.
@@ -31,6 +51,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return self.repository.get_multi(skip=skip, limit=limit)
 
+    @transactional
     def create(self, *, obj_in: CreateSchemaType) -> ModelType:
         """
         Crée un nouvel objet.
@@ -48,6 +69,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return self.repository.update(db_obj=db_obj, obj_in=obj_in)
 
+    @transactional
     def remove(self, *, id: int) -> ModelType:
         """
         Supprime un objet.
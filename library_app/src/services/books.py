@@ -1,10 +1,11 @@
 from typing import List, Optional, Any, Dict, Union
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..repositories.books import BookRepository
 from ..models.books import Book
 from ..api.schemas.books import BookCreate, BookUpdate
-from .base import BaseService
+from .base import BaseService, transactional
 
 
 class BookService(BaseService[Book, BookCreate, BookUpdate]):
@@ -33,17 +34,25 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
         """
         return self.repository.get_by_author(author=author)
 
+    @transactional
     def create(self, *, obj_in: BookCreate) -> Book:
         """
         Crée un nouveau livre, en vérifiant que l'ISBN n'est pas déjà utilisé.
         """
-        # Vérifier si l'ISBN est déjà utilisé
-        existing_book = self.get_by_isbn(isbn=obj_in.isbn)
-        if existing_book:
+        # Vérifier si l'ISBN est déjà utilisé (le filtre d'existence évite la requête le plus souvent)
+        if self.repository.isbn_exists(isbn=obj_in.isbn):
             raise ValueError("L'ISBN est déjà utilisé")
 
-        return self.repository.create(obj_in=obj_in)
+        try:
+            return self.repository.create(obj_in=obj_in)
+        except IntegrityError:
+            # ISBN inséré entre-temps (autre requête ou autre worker)
+            self.repository.rollback()
+            if self.get_by_isbn(isbn=obj_in.isbn):
+                raise ValueError("L'ISBN est déjà utilisé")
+            raise
 
+    @transactional
     def update_quantity(self, *, book_id: int, quantity_change: int) -> Book:
         """
         Met à jour la quantité d'un livre.
@@ -52,11 +61,10 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
         if not book:
             raise ValueError(f"Livre avec l'ID {book_id} non trouvé")
 
-        new_quantity = book.quantity + quantity_change
-        if new_quantity < 0:
+        # Vérification et écriture en un seul UPDATE conditionnel (sûr face aux emprunts concurrents)
+        if not self.repository.adjust_quantity(book_id=book_id, delta=quantity_change):
             raise ValueError("La quantité ne peut pas être négative")
-
-        return self.repository.update(db_obj=book, obj_in={"quantity": new_quantity})
+        return book
 
     def search(self, query: str):
         return self.repository.search(query)
\ No newline at end of file
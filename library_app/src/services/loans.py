@@ -3,13 +3,14 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
 from ..repositories.loans import LoanRepository
-from ..repositories.books import BookRepository
+from ..repositories.books import BookRepository, book_suggestions
 from ..repositories.users import UserRepository
 from ..models.loans import Loan
 from ..models.books import Book
 from ..models.users import User
 from ..api.schemas.loans import LoanCreate, LoanUpdate
-from .base import BaseService
+from ..utils.cache import invalidate_tags
+from .base import BaseService, transactional
 
 
 class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
@@ -37,10 +38,7 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         """
         Récupère les emprunts actifs (non retournés) d'un utilisateur.
         """
-        return [
-            loan for loan in self.repository.get_loans_by_user(user_id=user_id)
-            if loan.return_date is None
-        ]
+        return self.loan_repository.get_active_loans_by_user(user_id=user_id)
 
     def get_overdue_loans(self) -> List[Loan]:
         """
@@ -60,6 +58,7 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         """
         return self.loan_repository.get_loans_by_book(book_id=book_id)
 
+    @transactional
     def create_loan(
         self,
         *,
@@ -79,24 +78,19 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         if not user.is_active:
             raise ValueError("L'utilisateur est inactif et ne peut pas emprunter de livres")
 
-        # Vérifier que le livre existe
-        book = self.book_repository.get(id=book_id)
-        if not book:
-            raise ValueError(f"Livre avec l'ID {book_id} non trouvé")
-
-        # Vérifier que le livre est disponible
-        if book.quantity <= 0:
+        # Réserver un exemplaire : décrément conditionnel, annulé avec la transaction si une règle échoue
+        if not self.book_repository.adjust_quantity(book_id=book_id, delta=-1):
+            # Distinguer le livre inexistant du livre indisponible
+            if not self.book_repository.get(id=book_id):
+                raise ValueError(f"Livre avec l'ID {book_id} non trouvé")
             raise ValueError("Le livre n'est pas disponible pour l'emprunt")
 
         # Vérifier si l'utilisateur a déjà emprunté ce livre et ne l'a pas rendu
-        active_loans = self.loan_repository.get_active_loans()
-        for loan in active_loans:
-            if loan.user_id == user_id and loan.book_id == book_id:
-                raise ValueError("L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu")
+        if self.loan_repository.has_active_loan(user_id=user_id, book_id=book_id):
+            raise ValueError("L'utilisateur a déjà emprunté ce livre et ne l'a pas encore rendu")
 
         # Vérifier le nombre d'emprunts actifs de l'utilisateur (limite à 5 par exemple)
-        user_active_loans = [loan for loan in active_loans if loan.user_id == user_id]
-        if len(user_active_loans) >= 5:
+        if self.loan_repository.count_active_loans_by_user(user_id=user_id) >= 5:
             raise ValueError("L'utilisateur a atteint la limite d'emprunts simultanés (5)")
 
         # Créer l'emprunt
@@ -109,13 +103,12 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         }
 
         loan = self.loan_repository.create(obj_in=loan_data)
-
-        # Mettre à jour la quantité de livres disponibles
-        book.quantity -= 1
-        self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
-
+        # Popularité du livre pour l'autocomplétion, une fois l'emprunt validé
+        self.loan_repository.after_commit(lambda: book_suggestions.increment(book_id))
+        self.loan_repository.after_commit(lambda: invalidate_tags("loans"))
         return loan
 
+    @transactional
     def return_loan(self, *, loan_id: int) -> Loan:
         """
         Marque un emprunt comme retourné et met à jour la quantité de livres disponibles.
@@ -133,14 +126,13 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         loan_data = {"return_date": datetime.utcnow()}
         loan = self.loan_repository.update(db_obj=loan, obj_in=loan_data)
 
-        # Mettre à jour la quantité de livres disponibles
-        book = self.book_repository.get(id=loan.book_id)
-        if book:
-            book.quantity += 1
-            self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
+        # Remettre l'exemplaire en stock (incrément atomique, sans lecture du livre)
+        self.book_repository.adjust_quantity(book_id=loan.book_id, delta=1)
+        self.loan_repository.after_commit(lambda: invalidate_tags("loans"))
 
         return loan
 
+    @transactional
     def extend_loan(self, *, loan_id: int, extension_days: int = 7) -> Loan:
         """
         Prolonge la durée d'un emprunt, en vérifiant les règles métier.
@@ -170,4 +162,7 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
             "extended": True
         }
 
-        return self.loan_repository.update(db_obj=loan, obj_in=loan_data)
\ No newline at end of file
+        loan = self.loan_repository.update(db_obj=loan, obj_in=loan_data)
+        # Échéance modifiée : le nombre d'emprunts en retard peut changer
+        self.loan_repository.after_commit(lambda: invalidate_tags("loans"))
+        return loan
\ No newline at end of file
@@ -6,6 +6,13 @@ from sqlalchemy.orm import Session
 from ..models.books import Book
 from ..models.users import User
 from ..models.loans import Loan
+from ..utils.cache import cache
+
+# Les statistiques sont servies depuis le cache et recalculées en arrière-plan
+# après STATS_STALE_AFTER secondes ; au-delà de STATS_EXPIRY, le recalcul est bloquant.
+# Chaque méthode est étiquetée par les tables lues : une écriture validée l'invalide (invalidate_tags).
+STATS_STALE_AFTER = 30
+STATS_EXPIRY = 300
 
 
 class StatsService:
@@ -15,6 +22,7 @@ class StatsService:
     def __init__(self, db: Session):
         self.db = db
 
+    @cache(expiry=STATS_EXPIRY, stale_after=STATS_STALE_AFTER, tags=("books", "users", "loans"), single_flight=True)
     def get_general_stats(self) -> Dict[str, Any]:
         """
         Récupère des statistiques générales sur la bibliothèque.
@@ -40,6 +48,7 @@ class StatsService:
             "overdue_loans": overdue_loans
         }
 
+    @cache(expiry=STATS_EXPIRY, stale_after=STATS_STALE_AFTER, tags=("books", "loans"), single_flight=True)
     def get_most_borrowed_books(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Récupère les livres les plus empruntés.
@@ -61,6 +70,7 @@ class StatsService:
             for book in result
         ]
 
+    @cache(expiry=STATS_EXPIRY, stale_after=STATS_STALE_AFTER, tags=("users", "loans"), single_flight=True)
     def get_most_active_users(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Récupère les utilisateurs les plus actifs.
@@ -82,6 +92,7 @@ class StatsService:
             for user in result
         ]
 
+    @cache(expiry=STATS_EXPIRY, stale_after=STATS_STALE_AFTER, tags=("loans",), single_flight=True)
     def get_monthly_loans(self, months: int = 12) -> List[Dict[str, Any]]:
         """
         Récupère le nombre d'emprunts par mois pour les derniers mois.
@@ -1,11 +1,20 @@
 from typing import Optional, List, Any, Dict, Union
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..repositories.users import UserRepository
 from ..models.users import User
 from ..api.schemas.users import UserCreate, UserUpdate
-from ..utils.security import get_password_hash, verify_password
-from .base import BaseService
+from ..utils.cache import invalidate_tags
+from ..utils.security import (
+    get_password_hash,
+    get_password_hash_async,
+    invalidate_user_principals,
+    verify_password,
+    verify_password_async,
+)
+from .base import BaseService, transactional
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate]):
@@ -26,18 +35,38 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """
         Crée un nouvel utilisateur avec un mot de passe hashé.
         """
-        # Vérifier si l'email est déjà utilisé
-        existing_user = self.get_by_email(email=obj_in.email)
-        if existing_user:
+        self._check_email_available(obj_in.email)
+        return self._insert(obj_in, get_password_hash(obj_in.password))
+
+    async def create_async(self, *, obj_in: UserCreate) -> User:
+        """
+        Variante de create pour les routes asynchrones : le hachage passe par le pool dédié.
+        """
+        await run_in_threadpool(self._check_email_available, obj_in.email)
+        hashed_password = await get_password_hash_async(obj_in.password)
+        return await run_in_threadpool(self._insert, obj_in, hashed_password)
+
+    def _check_email_available(self, email: str) -> None:
+        # Vérifier si l'email est déjà utilisé (le filtre d'existence évite la requête le plus souvent)
+        if self.repository.email_exists(email=email):
             raise ValueError("L'email est déjà utilisé")
 
-        # Hasher le mot de passe
-        hashed_password = get_password_hash(obj_in.password)
+    @transactional
+    def _insert(self, obj_in: UserCreate, hashed_password: str) -> User:
         user_data = obj_in.dict()
         del user_data["password"]
         user_data["hashed_password"] = hashed_password
 
-        return self.repository.create(obj_in=user_data)
+        try:
+            user = self.repository.create(obj_in=user_data)
+        except IntegrityError:
+            # Email inséré entre-temps (autre requête ou autre worker)
+            self.repository.rollback()
+            if self.get_by_email(email=obj_in.email):
+                raise ValueError("L'email est déjà utilisé")
+            raise
+        self.repository.after_commit(lambda: invalidate_tags("users"))
+        return user
 
     def update(
         self,
@@ -48,20 +77,58 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """
         Met à jour un utilisateur, en hashant le nouveau mot de passe si fourni.
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        update_data = self._update_data(obj_in)
+        password = update_data.pop("password", None)
+        if password:
+            update_data["hashed_password"] = get_password_hash(password)
+        return self._apply_update(db_obj, update_data)
+
+    async def update_async(
+        self,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        """
+        Variante de update pour les routes asynchrones : le hachage passe par le pool dédié.
+        """
+        update_data = self._update_data(obj_in)
+        password = update_data.pop("password", None)
+        if password:
+            update_data["hashed_password"] = await get_password_hash_async(password)
+        return await run_in_threadpool(self._apply_update, db_obj, update_data)
 
-        if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
-            update_data["hashed_password"] = hashed_password
-            del update_data["password"]
+    @staticmethod
+    def _update_data(obj_in: Union[UserUpdate, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(obj_in, dict):
+            return dict(obj_in)
+        return obj_in.dict(exclude_unset=True)
 
-        super().update(db_obj=db_obj, obj_in=update_data)
-        self.repository.db.refresh(db_obj)  # <-- Add this line
+    @transactional
+    def _apply_update(self, db_obj: User, update_data: Dict[str, Any]) -> User:
+        if any(
+            field in update_data and update_data[field] != getattr(db_obj, field)
+            for field in ("is_active", "is_admin")
+        ):
+            # Droits modifiés : les tokens déjà émis repassent par la base
+            update_data["token_version"] = db_obj.token_version + 1
+        self.repository.update(db_obj=db_obj, obj_in=update_data)
+        # Les identités en cache de cet utilisateur ne sont plus à jour
+        user_id = db_obj.id
+        self.repository.after_commit(lambda: invalidate_user_principals(user_id))
+        self.repository.after_commit(lambda: invalidate_tags("users"))
         return db_obj
 
+    def remove(self, *, id: int) -> User:
+        """
+        Supprime un utilisateur et invalide ses identités en cache.
+        """
+        user = super().remove(id=id)
+        invalidate_user_principals(id)
+        # Emprunts supprimés avec l'utilisateur
+        invalidate_tags("users", "loans")
+        return user
+
     def authenticate(self, *, email: str, password: str) -> Optional[User]:
         """
         Authentifie un utilisateur par email et mot de passe.
@@ -73,6 +140,17 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
             return None
         return user
 
+    async def authenticate_async(self, *, email: str, password: str) -> Optional[User]:
+        """
+        Variante de authenticate pour les routes asynchrones : bcrypt passe par le pool dédié.
+        """
+        user = await run_in_threadpool(self.get_by_email, email=email)
+        if not user:
+            return None
+        if not await verify_password_async(password, user.hashed_password):
+            return None
+        return user
+
     def is_active(self, *, user: User) -> bool:
         """
         Vérifie si un utilisateur est actif.
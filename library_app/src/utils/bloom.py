@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, Optional
+import hashlib
+import math
+import threading
+
+from ..config import settings
+from .cache import LRUCache
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom : répond « absent » avec certitude, « présent » avec un taux de faux positifs borné.
+    """
+    def __init__(self, expected_items: int, false_positive_rate: float):
+        expected_items = max(expected_items, 1)
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        # Double hachage : k positions dérivées de deux hachages de 64 bits
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        """
+        Ajoute un élément au filtre.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def estimated_false_positive_rate(self) -> float:
+        """
+        Estime le taux de faux positifs compte tenu du nombre d'éléments ajoutés.
+        """
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class ExistenceFilter:
+    """
+    Couche de vérification d'existence pour une colonne unique (ISBN, email).
+
+    Combine un filtre de Bloom reconstruit au démarrage à partir de la base
+    et un cache négatif des absences confirmées. Tant que le filtre n'a pas
+    été construit, toutes les vérifications passent par la base.
+    """
+    def __init__(
+        self,
+        name: str,
+        expected_items: int = settings.BLOOM_EXPECTED_ITEMS,
+        false_positive_rate: float = settings.BLOOM_FALSE_POSITIVE_RATE,
+        negative_ttl: float = settings.NEGATIVE_CACHE_TTL
+    ):
+        self.name = name
+        self.expected_items = expected_items
+        self.false_positive_rate = false_positive_rate
+        self.negative_ttl = negative_ttl
+        self._bloom: Optional[BloomFilter] = None
+        self._negative = LRUCache(max_entries=settings.NEGATIVE_CACHE_MAX_ENTRIES)
+        self._lock = threading.Lock()
+        self._stats = {
+            "checks": 0,
+            "bloom_negatives": 0,
+            "negative_cache_hits": 0,
+            "database_checks": 0,
+            "false_positives": 0,
+        }
+
+    @property
+    def ready(self) -> bool:
+        return self._bloom is not None
+
+    def rebuild(self, values: Iterable[str], count: int = 0) -> None:
+        """
+        Reconstruit le filtre à partir de toutes les valeurs présentes en base.
+        """
+        # Prévoir de la marge pour les insertions à venir avant le prochain redémarrage
+        bloom = BloomFilter(max(self.expected_items, 2 * count), self.false_positive_rate)
+        for value in values:
+            bloom.add(value)
+        with self._lock:
+            self._bloom = bloom
+            self._negative.clear()
+
+    def reset(self) -> None:
+        """
+        Désactive le filtre : les vérifications repassent par la base.
+        """
+        with self._lock:
+            self._bloom = None
+            self._negative.clear()
+
+    def might_exist(self, value: str) -> bool:
+        """
+        Retourne False si la valeur est certainement absente, True s'il faut vérifier en base.
+        """
+        with self._lock:
+            self._stats["checks"] += 1
+            bloom = self._bloom
+        if bloom is None:
+            self._count("database_checks")
+            return True
+        if value not in bloom:
+            self._count("bloom_negatives")
+            return False
+        if self._negative.get(value) is not None:
+            self._count("negative_cache_hits")
+            return False
+        self._count("database_checks")
+        return True
+
+    def record_missing(self, value: str) -> None:
+        """
+        Mémorise une absence confirmée en base (faux positif du filtre).
+        """
+        if self._bloom is not None:
+            self._count("false_positives")
+            self._negative.set(value, True, self.negative_ttl)
+
+    def add(self, value: str) -> None:
+        """
+        Enregistre une valeur nouvellement insérée.
+        """
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(value)
+        self._negative.delete(value)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du filtre (mémoire, taux de faux positifs, vérifications évitées).
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats, name=self.name, ready=self._bloom is not None)
+            bloom = self._bloom
+        if bloom is not None:
+            stats.update({
+                "items": bloom.count,
+                "bits": bloom.size,
+                "hash_count": bloom.hash_count,
+                "memory_bytes": bloom.memory_bytes,
+                "target_false_positive_rate": bloom.false_positive_rate,
+                "estimated_false_positive_rate": bloom.estimated_false_positive_rate(),
+            })
+        stats["negative_cache"] = self._negative.stats()
+        return stats
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
@@ -1,45 +1,754 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import copy
+import heapq
+import inspect
+import logging
+import sys
+import threading
 import time
-import hashlib
-import json
 
-# Cache en mémoire simple
-cache_store: Dict[str, Tuple[float, Any]] = {}
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
 DEFAULT_EXPIRY = 300  # 5 minutes
 
+# Nombre maximal d'entrées expirées retirées à chaque écriture
+SWEEP_BATCH = 64
+
+# Génération globale, incrémentée par invalidate_cache() sans préfixe
+GLOBAL_NAMESPACE = "*"
+
+# Délai d'attente maximal du résultat d'un autre appelant en mode single-flight
+DEFAULT_LOCK_TIMEOUT = settings.CACHE_LOCK_TIMEOUT
+
+# Arguments ignorés par défaut dans les clés de cache
+SKIPPED_KEY_ARGS = frozenset({"self", "cls", "db"})
+
+_MISSING = object()
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estime la taille en octets d'une valeur mise en cache.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class CacheBackend(ABC):
+    """
+    Interface commune des moteurs de stockage du cache.
+
+    Un moteur stocke les valeurs avec un TTL strict, un TTL souple optionnel
+    et les générations sous lesquelles elles ont été calculées ; il conserve
+    aussi les compteurs de génération utilisés pour l'invalidation.
+    """
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, _count=False) is not _MISSING
+
+    def get(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None,
+        _count: bool = True
+    ) -> Any:
+        """
+        Récupère une valeur non expirée.
+
+        Si `stamp` est fourni, une entrée calculée sous d'autres générations est ignorée.
+        """
+        return self.lookup(key, default, stamp, _count)[0]
+
+    @abstractmethod
+    def lookup(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None,
+        _count: bool = True
+    ) -> Tuple[Any, bool]:
+        """
+        Comme get(), mais indique aussi si la valeur est encore fraîche (TTL souple non dépassé).
+        """
+
+    @abstractmethod
+    def peek(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None
+    ) -> Any:
+        """
+        Retourne la dernière valeur connue, même expirée, sans toucher aux compteurs.
+        """
+
+    @abstractmethod
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float = DEFAULT_EXPIRY,
+        stamp: Optional[Tuple[int, ...]] = None,
+        stale_after: Optional[float] = None
+    ) -> None:
+        """
+        Stocke une valeur pour `ttl` secondes.
+
+        Au-delà de `stale_after` secondes, la valeur est encore servie mais signalée comme périmée.
+        """
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> bool:
+        """
+        Supprime une entrée.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Vide le cache.
+        """
+
+    @abstractmethod
+    def generations(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        """
+        Retourne les générations courantes des espaces de noms donnés.
+        """
+
+    @abstractmethod
+    def bump(self, *names: str) -> None:
+        """
+        Incrémente la génération des espaces de noms donnés (invalidation en O(1)).
+        """
+
+    @abstractmethod
+    def sweep(self, max_items: Optional[int] = None) -> int:
+        """
+        Retire les entrées expirées, au plus `max_items` si précisé.
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du cache.
+        """
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "fresh_until", "size", "stamp")
+
+    def __init__(
+        self,
+        value: Any,
+        expires_at: float,
+        fresh_until: float,
+        size: int,
+        stamp: Optional[Tuple[int, ...]]
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.fresh_until = fresh_until
+        self.size = size
+        self.stamp = stamp
+
+
+class LRUCache(CacheBackend):
+    """
+    Cache en mémoire borné en nombre d'entrées et en octets.
+
+    Les lectures et écritures sont en O(1). Les entrées expirées sont retirées
+    par petits lots à chaque écriture (tas des dates d'expiration), de sorte
+    qu'aucun balayage complet ne bloque les requêtes.
+
+    L'invalidation repose sur des compteurs de génération : chaque entrée
+    mémorise les générations sous lesquelles elle a été calculée, et une
+    entrée dont les générations ont changé est traitée comme absente.
+    """
+    def __init__(
+        self,
+        max_entries: int = settings.CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.CACHE_MAX_BYTES,
+        sweep_batch: int = SWEEP_BATCH
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_batch = sweep_batch
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = 0
+        self._bytes = 0
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def lookup(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None,
+        _count: bool = True
+    ) -> Tuple[Any, bool]:
+        """
+        Comme get(), mais indique aussi si la valeur est encore fraîche (TTL souple non dépassé).
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                if _count:
+                    self.misses += 1
+                return default, False
+            now = time.monotonic()
+            if entry.expires_at <= now:
+                # L'entrée expirée reste disponible pour peek() jusqu'au prochain balayage
+                if _count:
+                    self.misses += 1
+                return default, False
+            if stamp is not None and entry.stamp != stamp:
+                self._remove(key, entry)
+                self.invalidations += 1
+                if _count:
+                    self.misses += 1
+                return default, False
+            self._data.move_to_end(key)
+            fresh = entry.fresh_until > now
+            if _count:
+                self.hits += 1
+                if not fresh:
+                    self.stale_hits += 1
+            return entry.value, fresh
+
+    def peek(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None
+    ) -> Any:
+        """
+        Retourne la dernière valeur connue, même expirée, sans toucher aux compteurs.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (stamp is not None and entry.stamp != stamp):
+                return default
+            return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float = DEFAULT_EXPIRY,
+        stamp: Optional[Tuple[int, ...]] = None,
+        stale_after: Optional[float] = None
+    ) -> None:
+        """
+        Stocke une valeur pour `ttl` secondes, en évinçant les entrées les moins récentes si besoin.
+
+        Au-delà de `stale_after` secondes, la valeur est encore servie mais signalée comme périmée.
+        """
+        size = estimate_size(value)
+        now = time.monotonic()
+        expires_at = now + ttl
+        fresh_until = now + stale_after if stale_after is not None else expires_at
+        with self._lock:
+            previous = self._data.get(key)
+            if previous is not None:
+                self._remove(key, previous)
+
+            # Une valeur plus grande que le budget total n'est pas mise en cache
+            if size > self.max_bytes:
+                return
+
+            self._data[key] = _Entry(value, expires_at, fresh_until, size, stamp)
+            self._bytes += size
+            self._counter += 1
+            heapq.heappush(self._expiry_heap, (expires_at, self._counter, key))
+
+            self._sweep_locked(self.sweep_batch)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                old_key, old_entry = self._data.popitem(last=False)
+                self._bytes -= old_entry.size
+                self.evictions += 1
+
+            # Le tas contient des références obsolètes après les évictions : on le compacte
+            if len(self._expiry_heap) > 2 * len(self._data) + self.sweep_batch:
+                self._rebuild_heap()
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Supprime une entrée.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            self._remove(key, entry)
+            return True
+
+    def clear(self) -> None:
+        """
+        Vide le cache (les compteurs sont conservés).
+        """
+        with self._lock:
+            self._data.clear()
+            self._expiry_heap.clear()
+            self._bytes = 0
+
+    def generations(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        """
+        Retourne les générations courantes des espaces de noms donnés.
+        """
+        generations = self._generations
+        return tuple(generations.get(name, 0) for name in names)
+
+    def bump(self, *names: str) -> None:
+        """
+        Incrémente la génération des espaces de noms donnés (invalidation en O(1)).
+        """
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def sweep(self, max_items: Optional[int] = None) -> int:
+        """
+        Retire les entrées expirées, au plus `max_items` si précisé.
+        """
+        with self._lock:
+            return self._sweep_locked(max_items)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+            }
+
+    def _remove(self, key: Hashable, entry: _Entry) -> None:
+        del self._data[key]
+        self._bytes -= entry.size
+
+    def _sweep_locked(self, max_items: Optional[int]) -> int:
+        now = time.monotonic()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now and (max_items is None or removed < max_items):
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            # Ignorer les références obsolètes (clé réécrite ou déjà évincée)
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key, entry)
+                self.expirations += 1
+                removed += 1
+        return removed
+
+    def _rebuild_heap(self) -> None:
+        self._expiry_heap = [
+            (entry.expires_at, index, key)
+            for index, (key, entry) in enumerate(self._data.items())
+        ]
+        heapq.heapify(self._expiry_heap)
+        self._counter = len(self._expiry_heap)
+
+
+def create_backend(name: str = settings.CACHE_BACKEND) -> CacheBackend:
+    """
+    Instancie le moteur de cache configuré ("memory" ou "sqlite").
+    """
+    if name == "memory":
+        return LRUCache()
+    if name == "sqlite":
+        from .cache_sqlite import SQLiteCacheBackend
+        return SQLiteCacheBackend(settings.CACHE_SQLITE_PATH)
+    raise ValueError(f"Moteur de cache inconnu : {name}")
+
+
+# Cache partagé par le décorateur (en mémoire par défaut)
+cache_store: CacheBackend = create_backend()
+
+# Espaces de noms des fonctions décorées, pour l'invalidation par préfixe
+_namespaces: Set[str] = set()
+
+
+class ReprKeyPart(str):
+    """
+    Représentation d'un argument non hachable dans une clé de cache.
+
+    Le repr peut contenir une adresse mémoire : la valeur n'est stable que dans
+    le processus, les moteurs partagés entre workers ne la persistent pas.
+    """
+    __slots__ = ()
+
 
-def cache_key(*args, **kwargs) -> str:
+def normalize_key_part(value: Any) -> Hashable:
+    """
+    Convertit un argument en valeur hachable et stable pour la clé de cache.
+    """
+    value_type = type(value)
+    if value is None or value_type in (str, int, float, bytes):
+        return value
+    if value_type is bool:
+        # Distinguer True/False de 1/0
+        return ("bool", value)
+    if isinstance(value, dict):
+        items = [(normalize_key_part(k), normalize_key_part(v)) for k, v in value.items()]
+        try:
+            items.sort()
+        except TypeError:
+            items.sort(key=repr)
+        return ("dict", tuple(items))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_key_part(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(normalize_key_part(item) for item in value)
+    if hasattr(value, "model_dump"):
+        # Schéma Pydantic
+        return (value_type.__name__, normalize_key_part(value.model_dump()))
+    if hasattr(value, "__table__"):
+        # Objet ORM : identifié par son modèle et sa clé primaire
+        return (value_type.__name__, getattr(value, "id", None))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ReprKeyPart(repr(value))
+
+
+def cache_key(*args, **kwargs) -> Tuple[Hashable, ...]:
     """
     Génère une clé de cache à partir des arguments.
     """
-    key_dict = {"args": args, "kwargs": kwargs}
-    key_str = json.dumps(key_dict, sort_keys=True)
-    return hashlib.md5(key_str.encode()).hexdigest()
+    parts = tuple(normalize_key_part(arg) for arg in args)
+    if kwargs:
+        parts += tuple(sorted((name, normalize_key_part(value)) for name, value in kwargs.items()))
+    return parts
+
+
+def _make_key_builder(
+    func: Callable,
+    key_args: Optional[Iterable[str]]
+) -> Callable[[tuple, dict], Tuple[Hashable, ...]]:
+    """
+    Prépare, une fois pour toutes, la construction des clés d'une fonction décorée.
+
+    Seuls les arguments de `key_args` sont retenus ; par défaut, tous sauf
+    `self`, `cls` et `db` (l'instance de repository et la session ne doivent pas
+    faire varier la clé).
+    """
+    parameters = [
+        p for p in inspect.signature(func).parameters.values()
+        if p.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+    ]
+    names = [p.name for p in parameters]
+    positions = {name: index for index, name in enumerate(names)}
+    defaults = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+
+    if key_args is None:
+        selected = [name for name in names if name not in SKIPPED_KEY_ARGS]
+        include_extra = True
+    else:
+        selected = list(key_args)
+        unknown = [name for name in selected if name not in positions]
+        if unknown:
+            raise ValueError(f"Arguments de clé inconnus pour {func.__qualname__} : {unknown}")
+        include_extra = False
+
+    selected_positions = [(name, positions[name]) for name in selected]
+    known = set(names)
+
+    def build(args: tuple, kwargs: dict) -> Tuple[Hashable, ...]:
+        parts = []
+        for name, index in selected_positions:
+            if index < len(args):
+                value = args[index]
+            elif name in kwargs:
+                value = kwargs[name]
+            else:
+                value = defaults.get(name)
+            parts.append(normalize_key_part(value))
+        if include_extra:
+            # Arguments *args / **kwargs non déclarés
+            if len(args) > len(names):
+                parts.append(cache_key(*args[len(names):]))
+            extra = {name: value for name, value in kwargs.items() if name not in known}
+            if extra:
+                parts.append(cache_key(**extra))
+        return tuple(parts)
+
+    return build
+
+
+class _Flight:
+    """
+    Calcul en cours pour une clé, partagé entre les appelants concurrents.
+    """
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+# Calculs en cours par clé (verrous par clé du mode single-flight)
+_flights: Dict[Hashable, _Flight] = {}
+_flights_lock = threading.Lock()
+_flight_stats = {"leaders": 0, "coalesced": 0, "stale_served": 0, "timeouts": 0}
+
+
+def _single_flight(
+    key: Hashable,
+    compute: Callable[[], Any],
+    timeout: float,
+    stale: Callable[[], Any]
+) -> Any:
+    """
+    Exécute `compute` une seule fois pour les appelants concurrents d'une même clé.
+
+    Les autres appelants attendent le résultat au plus `timeout` secondes, puis
+    reçoivent la valeur précédente si elle existe, ou calculent eux-mêmes.
+    """
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+            _flight_stats["leaders"] += 1
+        else:
+            _flight_stats["coalesced"] += 1
+
+    if leader:
+        try:
+            flight.result = compute()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with _flights_lock:
+                _flights.pop(key, None)
+            flight.event.set()
+
+    if flight.event.wait(timeout):
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    previous = stale()
+    with _flights_lock:
+        if previous is not _MISSING:
+            _flight_stats["stale_served"] += 1
+        else:
+            _flight_stats["timeouts"] += 1
+    if previous is not _MISSING:
+        return previous
+    return compute()
+
+
+# Rafraîchissements en arrière-plan (stale-while-revalidate)
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refreshing: Set[Hashable] = set()
+_refresh_lock = threading.Lock()
+_refresh_stats = {"scheduled": 0, "completed": 0, "failed": 0, "dropped": 0}
+
+
+def _rebind_session(args: tuple, kwargs: dict) -> Tuple[tuple, dict, Optional[Session]]:
+    """
+    Remplace la session de la requête par une session neuve sur le même moteur.
+
+    La session de la requête est fermée à la fin de celle-ci et n'est pas
+    thread-safe : un rafraîchissement en arrière-plan ne doit pas la réutiliser.
+    Gère `self.db` (repositories, services) et un argument `db` explicite.
+    """
+    session = None
+    args = list(args)
+    kwargs = dict(kwargs)
+
+    def fresh(db: Session) -> Session:
+        nonlocal session
+        if session is None:
+            session = Session(bind=db.get_bind())
+        return session
+
+    if args and isinstance(getattr(args[0], "db", None), Session):
+        receiver = copy.copy(args[0])
+        receiver.db = fresh(args[0].db)
+        args[0] = receiver
+    for index, value in enumerate(args):
+        if isinstance(value, Session):
+            args[index] = fresh(value)
+    for name, value in kwargs.items():
+        if isinstance(value, Session):
+            kwargs[name] = fresh(value)
+    return tuple(args), kwargs, session
+
+
+def _schedule_refresh(key: Hashable, job: Callable[[], None]) -> None:
+    """
+    Planifie le recalcul d'une clé périmée, au plus une fois par clé et dans la limite de la file.
+    """
+    global _refresh_executor
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        if len(_refreshing) >= settings.CACHE_REFRESH_QUEUE_SIZE:
+            _refresh_stats["dropped"] += 1
+            return
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=settings.CACHE_REFRESH_WORKERS,
+                thread_name_prefix="cache-refresh"
+            )
+        _refreshing.add(key)
+        _refresh_stats["scheduled"] += 1
+
+    def run() -> None:
+        try:
+            job()
+            outcome = "completed"
+        except Exception:
+            logger.exception("Échec du rafraîchissement en arrière-plan de %s", key)
+            outcome = "failed"
+        with _refresh_lock:
+            _refreshing.discard(key)
+            _refresh_stats[outcome] += 1
+
+    try:
+        _refresh_executor.submit(run)
+    except RuntimeError:
+        # Pool en cours d'arrêt
+        with _refresh_lock:
+            _refreshing.discard(key)
+            _refresh_stats["dropped"] += 1
+
+
+def shutdown_cache(wait: bool = True) -> None:
+    """
+    Arrête le pool de rafraîchissement en arrière-plan (à l'arrêt de l'application).
+    """
+    global _refresh_executor
+    with _refresh_lock:
+        executor, _refresh_executor = _refresh_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    with _refresh_lock:
+        _refreshing.clear()
 
 
-def cache(expiry: int = DEFAULT_EXPIRY):
+def tag_namespace(tag: str) -> str:
+    """
+    Retourne l'espace de noms de génération associé à un tag.
+    """
+    return f"tag:{tag}"
+
+
+def cache(
+    expiry: int = DEFAULT_EXPIRY,
+    tags: Iterable[str] = (),
+    key_args: Optional[Iterable[str]] = None,
+    single_flight: bool = False,
+    lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    stale_after: Optional[float] = None
+):
     """
     Décorateur pour mettre en cache le résultat d'une fonction.
+
+    Les `tags` (par exemple "books") permettent d'invalider le résultat
+    avec invalidate_tags() sans parcourir le cache. `key_args` restreint
+    les arguments qui composent la clé. Avec `single_flight`, un seul
+    appelant recalcule une clé manquante ; les autres attendent son résultat
+    (au plus `lock_timeout` secondes) ou reçoivent la valeur précédente.
+
+    `stale_after` définit un TTL souple : passé ce délai, la valeur est
+    servie immédiatement et recalculée en arrière-plan ; passé `expiry`
+    (TTL strict), les appelants attendent le recalcul.
     """
     def decorator(func: Callable) -> Callable:
+        namespace = f"{func.__module__}.{func.__qualname__}"
+        scopes = (GLOBAL_NAMESPACE, namespace) + tuple(tag_namespace(tag) for tag in tags)
+        build_key = _make_key_builder(func, key_args)
+        _namespaces.add(namespace)
+
+        def refresh(args: tuple, kwargs: dict) -> None:
+            key = (namespace, build_key(args, kwargs))
+            stamp = cache_store.generations(scopes)
+            args, kwargs, session = _rebind_session(args, kwargs)
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                if session is not None:
+                    session.close()
+            cache_store.set(key, result, expiry, stamp=stamp, stale_after=stale_after)
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            # Générer la clé de cache
-            key = f"{func.__module__}.{func.__name__}:{cache_key(*args, **kwargs)}"
+            # Générer la clé de cache (sans self ni la session)
+            key = (namespace, build_key(args, kwargs))
 
-            # Vérifier si la valeur est dans le cache et n'a pas expiré
-            now = time.time()
-            if key in cache_store:
-                expiry_time, value = cache_store[key]
-                if expiry_time > now:
-                    return value
+            # Vérifier si la valeur est dans le cache, n'a pas expiré et n'a pas été invalidée
+            stamp = cache_store.generations(scopes)
+            value, fresh = cache_store.lookup(key, _MISSING, stamp=stamp)
+            if value is not _MISSING:
+                if not fresh:
+                    _schedule_refresh(key, lambda: refresh(args, kwargs))
+                return value
 
-            # Exécuter la fonction et mettre en cache le résultat
-            result = func(*args, **kwargs)
-            cache_store[key] = (now + expiry, result)
+            # Exécuter la fonction et mettre en cache le résultat sous les générations lues
+            # avant le calcul : une invalidation concurrente le rendra obsolète
+            def compute() -> Any:
+                if single_flight:
+                    # Un autre appelant a pu terminer le calcul entre-temps
+                    value = cache_store.get(key, _MISSING, stamp=stamp, _count=False)
+                    if value is not _MISSING:
+                        return value
+                result = func(*args, **kwargs)
+                cache_store.set(key, result, expiry, stamp=stamp, stale_after=stale_after)
+                return result
 
-            return result
+            if single_flight:
+                return _single_flight(
+                    key,
+                    compute,
+                    lock_timeout,
+                    lambda: cache_store.peek(key, _MISSING, stamp=stamp)
+                )
+            return compute()
         return wrapper
     return decorator
 
@@ -48,10 +757,28 @@ def invalidate_cache(prefix: str = None) -> None:
     """
     Invalide le cache.
     """
-    global cache_store
     if prefix:
-        # Invalider uniquement les clés qui commencent par le préfixe
-        cache_store = {k: v for k, v in cache_store.items() if not k.startswith(prefix)}
+        # Invalider uniquement les fonctions dont l'espace de noms commence par le préfixe
+        cache_store.bump(*[ns for ns in list(_namespaces) if ns.startswith(prefix)])
     else:
         # Invalider tout le cache
-        cache_store = {}
\ No newline at end of file
+        cache_store.bump(GLOBAL_NAMESPACE)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Invalide les résultats mis en cache avec l'un des tags donnés.
+    """
+    cache_store.bump(*[tag_namespace(tag) for tag in tags])
+
+
+def cache_info() -> Dict[str, Any]:
+    """
+    Retourne les métriques du cache partagé (taille, évictions, taux de succès).
+    """
+    info = cache_store.stats()
+    with _flights_lock:
+        info["single_flight"] = dict(_flight_stats, in_flight=len(_flights))
+    with _refresh_lock:
+        info["background_refresh"] = dict(_refresh_stats, pending=len(_refreshing))
+    return info
@@ -0,0 +1,301 @@
+from datetime import date, time as time_of_day, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+
+from ..config import settings
+from .cache import DEFAULT_EXPIRY, CacheBackend
+
+logger = logging.getLogger(__name__)
+
+# Types atomiques des clés normalisées (normalize_key_part), dont le repr est identique d'un processus à l'autre
+_ATOMIC_KEY_TYPES = (type(None), bool, int, float, str, bytes)
+# Autres valeurs hachables à représentation stable (arguments de date, identifiants, énumérations)
+_STABLE_KEY_TYPES = (date, time_of_day, timedelta, Decimal, UUID, Enum)
+
+# Nombre d'écritures entre deux nettoyages (entrées expirées et dépassement de capacité)
+TRIM_INTERVAL = 64
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entry (
+        key BLOB PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires_at REAL NOT NULL,
+        fresh_until REAL NOT NULL,
+        stamp TEXT,
+        size INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_cache_entry_expires_at ON cache_entry (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS cache_generation (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+
+def stable_key_repr(key: Hashable) -> Optional[str]:
+    """
+    Représentation d'une clé identique dans tous les workers, ou None.
+
+    Seules les valeurs produites par normalize_key_part à partir de types
+    connus sont acceptées : un repr arbitraire (object.__repr__ contient une
+    adresse mémoire) donnerait une clé différente dans chaque processus. Les
+    éléments d'un frozenset sont ordonnés, l'ordre d'itération dépendant du
+    hachage aléatoire des chaînes.
+    """
+    key_type = type(key)
+    if key_type in _ATOMIC_KEY_TYPES:
+        return repr(key)
+    if key_type is tuple or key_type is frozenset:
+        parts = [stable_key_repr(part) for part in key]
+        if any(part is None for part in parts):
+            return None
+        if key_type is frozenset:
+            return "frozenset({" + ", ".join(sorted(parts)) + "})"
+        return "(" + ", ".join(parts) + ",)"
+    if isinstance(key, _STABLE_KEY_TYPES):
+        return f"{key_type.__module__}.{key_type.__qualname__}:{key!r}"
+    return None
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache partagé par les workers d'une même machine, stocké dans un fichier SQLite.
+
+    Les valeurs sont sérialisées avec pickle et les compteurs de génération
+    sont stockés dans la même base : une invalidation faite par un worker est
+    vue par tous les autres. La capacité est bornée en nombre d'entrées et en
+    octets ; au-delà, les entrées qui expirent le plus tôt sont évincées.
+    """
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = settings.CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.CACHE_MAX_BYTES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_hits = 0
+
+        with self._connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Une connexion par thread : les connexions sqlite3 ne sont pas partagées
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(key: Hashable) -> Optional[bytes]:
+        # None si la clé n'a pas de représentation stable : l'appel n'est pas mis en cache
+        text = stable_key_repr(key)
+        if text is None:
+            return None
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _stamp(stamp: Optional[Tuple[int, ...]]) -> Optional[str]:
+        return None if stamp is None else ",".join(map(str, stamp))
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def lookup(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None,
+        _count: bool = True
+    ) -> Tuple[Any, bool]:
+        stored_key = self._key(key)
+        row = None
+        if stored_key is not None:
+            row = self._connection().execute(
+                "SELECT value, expires_at, fresh_until, stamp FROM cache_entry WHERE key = ?",
+                (stored_key,)
+            ).fetchone()
+        now = time.time()
+        if row is None or row[1] <= now:
+            if _count:
+                self._count("misses")
+            return default, False
+        if stamp is not None and row[3] != self._stamp(stamp):
+            self.delete(key)
+            if _count:
+                self._count("invalidations")
+                self._count("misses")
+            return default, False
+        fresh = row[2] > now
+        if _count:
+            self._count("hits")
+            if not fresh:
+                self._count("stale_hits")
+        return pickle.loads(row[0]), fresh
+
+    def peek(
+        self,
+        key: Hashable,
+        default: Any = None,
+        stamp: Optional[Tuple[int, ...]] = None
+    ) -> Any:
+        stored_key = self._key(key)
+        if stored_key is None:
+            return default
+        row = self._connection().execute(
+            "SELECT value, stamp FROM cache_entry WHERE key = ?",
+            (stored_key,)
+        ).fetchone()
+        if row is None or (stamp is not None and row[1] != self._stamp(stamp)):
+            return default
+        return pickle.loads(row[0])
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float = DEFAULT_EXPIRY,
+        stamp: Optional[Tuple[int, ...]] = None,
+        stale_after: Optional[float] = None
+    ) -> None:
+        stored_key = self._key(key)
+        if stored_key is None:
+            # Clé propre au processus (adresse mémoire dans un repr, etc.) : non mise en cache
+            logger.debug("Clé sans représentation stable, non mise en cache : %r", key)
+            return
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Valeur non sérialisable (objet ORM attaché à une session, etc.) : non mise en cache
+            logger.debug("Valeur non sérialisable, non mise en cache : %r", key)
+            return
+        if len(data) > self.max_bytes:
+            return
+
+        now = time.time()
+        expires_at = now + ttl
+        fresh_until = now + stale_after if stale_after is not None else expires_at
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache_entry (key, value, expires_at, fresh_until, stamp, size) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (stored_key, data, expires_at, fresh_until, self._stamp(stamp), len(data))
+        )
+
+        with self._lock:
+            self._writes += 1
+            trim = self._writes % TRIM_INTERVAL == 0
+        if trim:
+            self.sweep()
+            self._trim()
+
+    def delete(self, key: Hashable) -> bool:
+        stored_key = self._key(key)
+        if stored_key is None:
+            return False
+        cursor = self._connection().execute(
+            "DELETE FROM cache_entry WHERE key = ?", (stored_key,)
+        )
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache_entry")
+
+    def generations(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        placeholders = ",".join("?" * len(names))
+        rows = self._connection().execute(
+            f"SELECT name, value FROM cache_generation WHERE name IN ({placeholders})",
+            names
+        ).fetchall()
+        current = dict(rows)
+        return tuple(current.get(name, 0) for name in names)
+
+    def bump(self, *names: str) -> None:
+        if not names:
+            return
+        self._connection().executemany(
+            "INSERT INTO cache_generation (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            [(name,) for name in names]
+        )
+
+    def sweep(self, max_items: Optional[int] = None) -> int:
+        if max_items is None:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entry WHERE expires_at <= ?", (time.time(),)
+            )
+        else:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entry WHERE key IN ("
+                "SELECT key FROM cache_entry WHERE expires_at <= ? ORDER BY expires_at LIMIT ?)",
+                (time.time(), max_items)
+            )
+        self._count("expirations", max(cursor.rowcount, 0))
+        return max(cursor.rowcount, 0)
+
+    def _trim(self) -> None:
+        """
+        Évince les entrées qui expirent le plus tôt tant que la capacité est dépassée.
+        """
+        conn = self._connection()
+        entries, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry"
+        ).fetchone()
+        excess = entries - self.max_entries
+        if total > self.max_bytes:
+            average = total / entries if entries else 1
+            excess = max(excess, int((total - self.max_bytes) / average) + 1)
+        if excess > 0:
+            cursor = conn.execute(
+                "DELETE FROM cache_entry WHERE key IN ("
+                "SELECT key FROM cache_entry ORDER BY expires_at LIMIT ?)",
+                (excess,)
+            )
+            self._count("evictions", max(cursor.rowcount, 0))
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry"
+        ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "path": self.path,
+                "entries": entries,
+                "bytes": total,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+            }
@@ -1,5 +1,11 @@
-from typing import Generic, TypeVar, List, Optional, Dict, Any
+from typing import Generic, TypeVar, List, Optional, Dict, Any, NamedTuple
+from datetime import date, datetime
+import base64
+import binascii
+import json
 from pydantic import BaseModel
+from sqlalchemy import Date, DateTime, Select, and_, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Query
 from fastapi import Query as QueryParam
 
@@ -12,52 +18,235 @@ class PaginationParams:
         skip: int = 0,
         limit: int = 100,
         sort_by: Optional[str] = None,
-        sort_desc: bool = False
+        sort_desc: bool = False,
+        cursor: Optional[str] = None,
+        with_total: bool = False
     ):
         self.skip = skip
         self.limit = limit
         self.sort_by = sort_by
         self.sort_desc = sort_desc
+        # Curseur next_cursor/prev_cursor d'une page précédente : remplace skip
+        self.cursor = cursor
+        # En mode curseur, le total (COUNT de tout l'ensemble filtré) n'est calculé que sur demande
+        self.with_total = with_total
 
 
 class Page(BaseModel, Generic[T]):
     items: List[T]
-    total: int
+    # None en mode curseur sans with_total
+    total: Optional[int]
     page: int
     size: int
-    pages: int
+    pages: Optional[int]
+    # Positions opaques des pages voisines (None s'il n'y en a pas)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         arbitrary_types_allowed = True
 
 
-def paginate(query: Query, params: PaginationParams, schema) -> Page:
+class _Cursor(NamedTuple):
+    # Clé de tri et identifiant de l'élément de référence, numéro de la page visée
+    value: Any
+    id: int
+    page: int
+    # Page visée avant l'élément de référence (prev_cursor) ou après (next_cursor)
+    backward: bool
+
+
+def paginate(query: Query, params: PaginationParams, schema, keyset: bool = True) -> Page:
     """
     Pagine une requête SQLAlchemy.
+
+    keyset=False pour une requête déjà classée (pertinence) : ni curseurs, ni tri par identifiant.
+    En mode curseur, le total n'est compté que si params.with_total : le COUNT
+    parcourt tout l'ensemble filtré, quelle que soit la page.
     """
+    if params.cursor:
+        cursor = _decode_cursor(params, schema, keyset)
+        rows: List[Any] = []
+        for seek in _seek_statements(query.order_by(None), params, schema, cursor):
+            rows.extend(seek.limit(params.limit + 1 - len(rows)).all())
+            if len(rows) > params.limit:
+                break
+        total = query.count() if params.with_total else None
+        return _make_cursor_page(rows, total, params, schema, cursor)
+
     # Compter le nombre total d'éléments
     total = query.count()
 
     # Appliquer le tri si spécifié
-    if params.sort_by:
-        if hasattr(schema, params.sort_by):
-            column = getattr(schema, params.sort_by)
-            if params.sort_desc:
-                query = query.order_by(column.desc())
-            else:
-                query = query.order_by(column)
+    query = _apply_sort(query, params, schema, keyset)
 
     # Appliquer la pagination
     items = query.offset(params.skip).limit(params.limit).all()
 
+    return _make_page(items, total, params, schema if keyset else None)
+
+
+async def paginate_async(
+    db: AsyncSession, statement: Select, params: PaginationParams, schema, keyset: bool = True
+) -> Page:
+    """
+    Pagine une requête SQLAlchemy exécutée sur une session asynchrone.
+    """
+    if params.cursor:
+        cursor = _decode_cursor(params, schema, keyset)
+        rows: List[Any] = []
+        for seek in _seek_statements(statement.order_by(None), params, schema, cursor):
+            rows.extend(await db.scalars(seek.limit(params.limit + 1 - len(rows))))
+            if len(rows) > params.limit:
+                break
+        total = await _count_async(db, statement) if params.with_total else None
+        return _make_cursor_page(rows, total, params, schema, cursor)
+
+    total = await _count_async(db, statement)
+
+    statement = _apply_sort(statement, params, schema, keyset)
+    result = await db.scalars(statement.offset(params.skip).limit(params.limit))
+    return _make_page(list(result), total, params, schema if keyset else None)
+
+
+async def _count_async(db: AsyncSession, statement: Select) -> int:
+    return await db.scalar(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    ) or 0
+
+
+def _sort_column(params: PaginationParams, schema):
+    if params.sort_by and hasattr(schema, params.sort_by):
+        return getattr(schema, params.sort_by)
+    return None
+
+
+def _order(column, id_column, descending: bool):
+    columns = [id_column] if column is None else [column, id_column]
+    return [column.desc() for column in columns] if descending else columns
+
+
+def _apply_sort(query, params: PaginationParams, schema, keyset: bool = True):
+    column = _sort_column(params, schema)
+    if keyset:
+        # L'identifiant départage les égalités : ordre stable, repris par les curseurs
+        return query.order_by(*_order(column, schema.id, params.sort_desc))
+    if column is not None:
+        if params.sort_desc:
+            query = query.order_by(column.desc())
+        else:
+            query = query.order_by(column)
+    return query
+
+
+def _seek_statements(query, params: PaginationParams, schema, cursor: _Cursor):
+    """
+    Requêtes successives des éléments suivant le curseur dans le sens de parcours.
+
+    Chaque requête est une recherche d'intervalle sur l'index (colonne de tri,
+    identifiant), quelle que soit la profondeur de la page. Les NULL, en tête de
+    l'ordre croissant sous SQLite, forment un intervalle à part : une condition
+    OR empêcherait l'usage de l'index.
+    """
+    column = _sort_column(params, schema)
+    id_column = schema.id
+    descending = params.sort_desc != cursor.backward
+    after = id_column < cursor.id if descending else id_column > cursor.id
+    if column is None:
+        conditions = [after]
+    elif cursor.value is None:
+        conditions = [and_(column.is_(None), after)]
+        if not descending:
+            conditions.append(column.isnot(None))
+    elif descending:
+        conditions = [tuple_(column, id_column) < (cursor.value, cursor.id), column.is_(None)]
+    else:
+        conditions = [tuple_(column, id_column) > (cursor.value, cursor.id)]
+    order = _order(column, id_column, descending)
+    return [query.filter(condition).order_by(*order) for condition in conditions]
+
+
+def _encode_cursor(item: Any, params: PaginationParams, schema, page: int, backward: bool) -> str:
+    column = _sort_column(params, schema)
+    value = getattr(item, params.sort_by) if column is not None else None
+    payload = {
+        "s": params.sort_by, "d": params.sort_desc,
+        "v": value.isoformat() if isinstance(value, (date, datetime)) else value,
+        "i": item.id, "p": page, "b": backward,
+    }
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _decode_cursor(params: PaginationParams, schema, keyset: bool) -> _Cursor:
+    if not keyset:
+        raise ValueError("Pagination par curseur impossible avec le tri par pertinence")
+    try:
+        data = base64.urlsafe_b64decode(params.cursor + "=" * (-len(params.cursor) % 4))
+        payload = json.loads(data)
+        cursor = _Cursor(payload["v"], int(payload["i"]), int(payload["p"]), bool(payload["b"]))
+        sort = (payload["s"], payload["d"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Curseur de pagination invalide")
+    if not isinstance(cursor.value, (str, int, float, type(None))):
+        raise ValueError("Curseur de pagination invalide")
+    if sort != (params.sort_by, params.sort_desc):
+        raise ValueError("Curseur de pagination obtenu avec un autre tri")
+    column = _sort_column(params, schema)
+    # Dates sérialisées en ISO 8601
+    if isinstance(cursor.value, str) and column is not None and isinstance(column.type, (Date, DateTime)):
+        parse = datetime.fromisoformat if isinstance(column.type, DateTime) else date.fromisoformat
+        try:
+            cursor = cursor._replace(value=parse(cursor.value))
+        except ValueError:
+            raise ValueError("Curseur de pagination invalide")
+    return cursor
+
+
+def _make_cursor_page(
+    rows: List[Any], total: Optional[int], params: PaginationParams, schema, cursor: _Cursor
+) -> Page:
+    # Un élément de plus que la page : indique s'il reste des éléments dans le sens de parcours
+    more = len(rows) > params.limit
+    items = rows[:params.limit]
+    if cursor.backward:
+        items.reverse()
+    has_next = more or cursor.backward
+    has_prev = more if cursor.backward else True
+    page = cursor.page if has_prev else 1
+    pages = None
+    if total is not None:
+        pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
+    return Page(
+        items=items,
+        total=total,
+        page=page,
+        size=params.limit,
+        pages=pages,
+        next_cursor=_encode_cursor(items[-1], params, schema, page + 1, False) if items and has_next else None,
+        prev_cursor=_encode_cursor(items[0], params, schema, page - 1, True) if items and has_prev else None,
+    )
+
+
+def _make_page(items: List[Any], total: int, params: PaginationParams, schema=None) -> Page:
     # Calculer le nombre de pages
     pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
     page = (params.skip // params.limit) + 1 if params.limit > 0 else 1
 
+    # Curseurs des pages voisines (schema donné) : la suite peut être parcourue sans OFFSET
+    next_cursor = prev_cursor = None
+    if schema is not None and items:
+        if params.skip + len(items) < total:
+            next_cursor = _encode_cursor(items[-1], params, schema, page + 1, False)
+        if params.skip > 0:
+            prev_cursor = _encode_cursor(items[0], params, schema, page - 1, True)
+
     return Page(
         items=items,
         total=total,
         page=page,
         size=params.limit,
-        pages=pages
-    )
\ No newline at end of file
+        pages=pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
@@ -0,0 +1,48 @@
+from typing import Optional, Sequence, Set
+import re
+import unicodedata
+
+# Mots de la saisie utilisateur : la syntaxe FTS5 (guillemets, opérateurs, *) n'est jamais transmise telle quelle
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Ligatures françaises que la décomposition Unicode ne sépare pas
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE"})
+
+
+def normalize_text(text: Optional[str]) -> Optional[str]:
+    """
+    Retourne le texte sans accents ni majuscules, espaces superflus retirés ("  L'Élève " -> "l'eleve").
+    """
+    if text is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def fts_match_query(text: str, columns: Optional[Sequence[str]] = None, prefix: bool = True) -> Optional[str]:
+    """
+    Construit une expression MATCH FTS5 à partir d'une saisie libre.
+
+    Chaque mot devient un terme entre guillemets (recherche de préfixe si prefix),
+    tous les termes sont requis. Retourne None si la saisie ne contient aucun mot.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    suffix = "*" if prefix else ""
+    expression = " ".join(f'"{word}"{suffix}' for word in words)
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """
+    Retourne les trigrammes des mots du texte normalisé, chaque mot encadré d'espaces ("hugo" : "  h", " hu", "hug", "ugo", "go ").
+    """
+    grams = set()
+    for word in _WORD.findall(normalize_text(text) or ""):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
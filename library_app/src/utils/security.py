@@ -1,21 +1,31 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Callable, Dict, Union, Optional
+import asyncio
+import threading
+import time
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from ..config import settings
+from ..api.schemas.token import Principal
+from .cache import GLOBAL_NAMESPACE, cache_store
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 ALGORITHM = "HS256"
 
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None
 ) -> str:
     """
-    Crée un token JWT.
+    Crée un token JWT, avec des claims supplémentaires éventuels.
     """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -24,7 +34,7 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
 
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = dict(claims or {}, exp=expire, sub=str(subject))
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -40,4 +50,161 @@ def get_password_hash(password: str) -> str:
     """
     Génère un hash à partir d'un mot de passe en clair.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+class PasswordHashingBusy(RuntimeError):
+    """
+    Levée lorsque la file d'attente du pool de hachage est pleine.
+    """
+
+
+# Pool dédié au hachage : bcrypt libère le GIL, des threads suffisent et
+# une rafale de connexions n'occupe pas le pool partagé des requêtes
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_lock = threading.Lock()
+_hash_stats = {
+    "submitted": 0,
+    "completed": 0,
+    "rejected": 0,
+    "running": 0,
+    "queued": 0,
+    "max_queued": 0,
+    "wait_seconds": 0.0,
+    "run_seconds": 0.0,
+}
+
+
+def _submit_hashing(func: Callable[..., Any], *args: Any) -> Future:
+    """
+    Soumet un calcul bcrypt au pool dédié, ou lève PasswordHashingBusy si la file est pleine.
+    """
+    global _hash_executor
+    with _hash_lock:
+        if _hash_stats["queued"] >= settings.PASSWORD_HASH_QUEUE_SIZE:
+            _hash_stats["rejected"] += 1
+            raise PasswordHashingBusy("Trop de calculs de mot de passe en attente")
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+        executor = _hash_executor
+        _hash_stats["submitted"] += 1
+        _hash_stats["queued"] += 1
+        _hash_stats["max_queued"] = max(_hash_stats["max_queued"], _hash_stats["queued"])
+    submitted_at = time.perf_counter()
+
+    def run() -> Any:
+        started_at = time.perf_counter()
+        with _hash_lock:
+            _hash_stats["queued"] -= 1
+            _hash_stats["running"] += 1
+            _hash_stats["wait_seconds"] += started_at - submitted_at
+        try:
+            return func(*args)
+        finally:
+            with _hash_lock:
+                _hash_stats["running"] -= 1
+                _hash_stats["completed"] += 1
+                _hash_stats["run_seconds"] += time.perf_counter() - started_at
+
+    try:
+        return executor.submit(run)
+    except RuntimeError:
+        # Pool en cours d'arrêt
+        with _hash_lock:
+            _hash_stats["queued"] -= 1
+            _hash_stats["rejected"] += 1
+        raise PasswordHashingBusy("Le pool de hachage est arrêté")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Vérifie un mot de passe dans le pool de hachage, sans bloquer la boucle d'événements.
+    """
+    return await asyncio.wrap_future(
+        _submit_hashing(pwd_context.verify, plain_password, hashed_password)
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Génère un hash dans le pool de hachage, sans bloquer la boucle d'événements.
+    """
+    return await asyncio.wrap_future(_submit_hashing(pwd_context.hash, password))
+
+
+def hashing_info() -> Dict[str, Any]:
+    """
+    Retourne les métriques du pool de hachage (profondeur de file, temps d'attente et de calcul).
+    """
+    with _hash_lock:
+        info: Dict[str, Any] = dict(_hash_stats)
+    completed = info["completed"]
+    info.update({
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "queue_size": settings.PASSWORD_HASH_QUEUE_SIZE,
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "avg_wait_ms": info["wait_seconds"] * 1000 / completed if completed else 0.0,
+        "avg_run_ms": info["run_seconds"] * 1000 / completed if completed else 0.0,
+    })
+    return info
+
+
+def shutdown_password_hashing(wait: bool = True) -> None:
+    """
+    Arrête le pool de hachage (à l'arrêt de l'application).
+    """
+    global _hash_executor
+    with _hash_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def principal_stamp(user_id: int) -> tuple:
+    """
+    Retourne les générations courantes d'un utilisateur, à lire avant de le charger depuis la base.
+    """
+    return cache_store.generations((GLOBAL_NAMESPACE, f"user:{user_id}"))
+
+
+def get_cached_principal(token: str) -> Optional[Principal]:
+    """
+    Retourne l'identité associée à un token déjà vérifié, si elle est en cache et toujours valide.
+    """
+    if settings.PRINCIPAL_CACHE_TTL <= 0:
+        return None
+    cached = cache_store.get(("principal", token))
+    if cached is None:
+        return None
+    principal, stamp = cached
+    # Invalidé depuis par une modification de l'utilisateur
+    if principal_stamp(principal.id) != stamp:
+        return None
+    return principal
+
+
+def cache_principal(
+    token: str,
+    principal: Principal,
+    stamp: tuple,
+    expires_at: Optional[int] = None
+) -> None:
+    """
+    Met en cache l'identité associée à un token vérifié, sans dépasser l'expiration du token.
+    """
+    ttl = settings.PRINCIPAL_CACHE_TTL
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl <= 0:
+        return
+    cache_store.set(("principal", token), (principal, stamp), ttl)
+
+
+def invalidate_user_principals(user_id: int) -> None:
+    """
+    Invalide les identités en cache d'un utilisateur (modification, désactivation, suppression).
+    """
+    cache_store.bump(f"user:{user_id}")
@@ -0,0 +1,322 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import heapq
+import re
+import sys
+import threading
+import time
+
+from ..config import settings
+from .search import normalize_text
+
+# Borne supérieure des clés commençant par un préfixe donné
+_PREFIX_END = "\U0010ffff"
+# Début de chaque mot : une clé par mot, pour suggérer "Les Misérables" dès "mis"
+_WORD_START = re.compile(r"\w+", re.UNICODE)
+
+
+def suggestion_keys(*values: Optional[str], normalized: bool = False) -> List[str]:
+    """
+    Retourne les clés d'indexation de valeurs : chaque fin de valeur normalisée commençant à un mot.
+
+    normalized indique que les valeurs sortent déjà de normalize_text (colonnes title_norm, author_norm).
+    """
+    keys = []
+    for value in values:
+        normalized_value = value if normalized else normalize_text(value)
+        if normalized_value:
+            keys.extend(normalized_value[match.start():] for match in _WORD_START.finditer(normalized_value))
+    return keys
+
+
+class _MaxTree:
+    """
+    Arbre de segments sur la popularité des entrées : position du maximum d'un intervalle en O(log n).
+    """
+    def __init__(self, values: Sequence[int]):
+        size = 1
+        while size < max(len(values), 1):
+            size *= 2
+        self.size = size
+        # Feuilles : positions des entrées ; nœuds internes : position du maximum de leur intervalle
+        self.values = values = array("q", values)
+        self.tree = tree = array("q", [-1]) * (2 * size)
+        tree[size:size + len(values)] = array("q", range(len(values)))
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            # Le sous-arbre gauche précède le droit : à égalité, il l'emporte
+            tree[node] = left if right < 0 or (left >= 0 and values[left] >= values[right]) else right
+
+    def _best(self, first: int, second: int) -> int:
+        # À popularité égale, la première entrée (ordre alphabétique) l'emporte
+        if first < 0:
+            return second
+        if second < 0:
+            return first
+        if (-self.values[first], first) <= (-self.values[second], second):
+            return first
+        return second
+
+    def set(self, position: int, value: int) -> None:
+        self.values[position] = value
+        node = (self.size + position) // 2
+        while node:
+            self.tree[node] = self._best(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def argmax(self, lo: int, hi: int) -> int:
+        """
+        Position de l'entrée la plus populaire de [lo, hi), -1 si l'intervalle est vide.
+        """
+        best = -1
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                best = self._best(best, self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = self._best(best, self.tree[hi])
+            lo //= 2
+            hi //= 2
+        return best
+
+    @property
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self.tree)
+
+
+class _SortedKeys:
+    """
+    Tableau trié des clés, identifiant de l'élément de chaque clé et arbre de popularité.
+    """
+    def __init__(self, items: Dict[int, Tuple[List[str], Dict[str, Any]]], popularity: Dict[int, int]):
+        entries = sorted((key, item_id) for item_id, (keys, _) in items.items() for key in keys)
+        self.keys = [key for key, _ in entries]
+        self.ids = array("q", [item_id for _, item_id in entries])
+        self.tree = _MaxTree([popularity.get(item_id, 0) for item_id in self.ids])
+
+    def positions(self, item_id: int, keys: List[str]) -> List[int]:
+        """
+        Positions des entrées d'un élément, retrouvées par bisect sur ses clés.
+        """
+        positions = []
+        for key in set(keys):
+            position = bisect_left(self.keys, key)
+            while position < len(self.keys) and self.keys[position] == key:
+                if self.ids[position] == item_id:
+                    positions.append(position)
+                position += 1
+        return positions
+
+    def top(self, prefix: str, limit: int, skip) -> Dict[int, int]:
+        """
+        Les limit éléments les plus populaires ayant une clé commençant par prefix (hors skip), avec leur popularité.
+        """
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + _PREFIX_END, lo)
+        found: Dict[int, int] = {}
+        if lo >= hi:
+            return found
+        # Extraction des maxima successifs : l'intervalle est découpé autour de chaque entrée retenue
+        values = self.tree.values
+        best = self.tree.argmax(lo, hi)
+        heap = [(-values[best], best, lo, hi)]
+        while heap and len(found) < limit:
+            _, position, range_lo, range_hi = heapq.heappop(heap)
+            item_id = self.ids[position]
+            if item_id not in skip and item_id not in found:
+                found[item_id] = values[position]
+            for sub_lo, sub_hi in ((range_lo, position), (position + 1, range_hi)):
+                if sub_lo < sub_hi:
+                    best = self.tree.argmax(sub_lo, sub_hi)
+                    heapq.heappush(heap, (-values[best], best, sub_lo, sub_hi))
+        return found
+
+    @property
+    def memory_bytes(self) -> int:
+        keys = sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+        return keys + sys.getsizeof(self.ids) + self.tree.memory_bytes
+
+
+class PrefixIndex:
+    """
+    Index de préfixes en mémoire pour l'autocomplétion, classé par popularité.
+
+    Les clés normalisées sont conservées dans un tableau trié (recherche de
+    l'intervalle d'un préfixe par bisect) doublé d'un arbre de segments sur la
+    popularité : les k meilleurs résultats s'obtiennent sans parcourir tout
+    l'intervalle. Les écritures postérieures à la construction vont dans une
+    zone d'attente parcourue à chaque recherche ; au-delà de max_pending
+    éléments, un tableau trié à jour est construit dans un thread, les
+    recherches continuant sur l'ancien en attendant.
+    """
+    def __init__(self, name: str, max_pending: int = settings.SUGGEST_MAX_PENDING):
+        self.name = name
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Données courantes : clés et contenu renvoyé par élément, popularité
+        self._items: Dict[int, Tuple[List[str], Dict[str, Any]]] = {}
+        self._popularity: Dict[int, int] = {}
+        self._sorted = _SortedKeys({}, {})
+        # Éléments modifiés depuis la construction du tableau trié : leurs entrées y sont ignorées
+        self._pending: Dict[int, List[str]] = {}
+        # Popularités modifiées pendant une construction, à reporter sur le nouveau tableau
+        self._bumped: Optional[set] = None
+        self._compaction: Optional[threading.Thread] = None
+        self._ready = False
+        self._stats = {"queries": 0, "compactions": 0, "build_seconds": 0.0, "last_query_ms": 0.0}
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def rebuild(self, items: Iterable[Tuple[int, List[str], Dict[str, Any]]], popularity: Dict[int, int]) -> None:
+        """
+        Reconstruit l'index à partir de tous les éléments (identifiant, clés, contenu) et de leur popularité.
+        """
+        data = {item_id: (keys, payload) for item_id, keys, payload in items}
+        popularity = dict(popularity)
+        start = time.perf_counter()
+        sorted_keys = _SortedKeys(data, popularity)
+        with self._lock:
+            self._items = data
+            self._popularity = popularity
+            self._sorted = sorted_keys
+            self._pending = {}
+            self._ready = True
+            self._stats["build_seconds"] = time.perf_counter() - start
+
+    def reset(self) -> None:
+        """
+        Vide l'index et le marque comme non construit.
+        """
+        with self._lock:
+            self._items = {}
+            self._popularity = {}
+            self._sorted = _SortedKeys({}, {})
+            self._pending = {}
+            self._ready = False
+
+    def add(self, item_id: int, keys: List[str], payload: Dict[str, Any]) -> None:
+        """
+        Ajoute ou remplace un élément (sans effet tant que l'index n'est pas construit).
+        """
+        with self._lock:
+            if not self._ready:
+                return
+            self._items[item_id] = (keys, payload)
+            self._pending[item_id] = keys
+            self._maybe_compact()
+
+    def remove(self, item_id: int) -> None:
+        """
+        Retire un élément.
+        """
+        with self._lock:
+            if self._ready and self._items.pop(item_id, None) is not None:
+                self._pending[item_id] = []
+                self._popularity.pop(item_id, None)
+                self._maybe_compact()
+
+    def increment(self, item_id: int, amount: int = 1) -> None:
+        """
+        Augmente la popularité d'un élément (nouvel emprunt).
+        """
+        with self._lock:
+            if item_id not in self._items:
+                return
+            popularity = self._popularity.get(item_id, 0) + amount
+            self._popularity[item_id] = popularity
+            if item_id not in self._pending:
+                for position in self._sorted.positions(item_id, self._items[item_id][0]):
+                    self._sorted.tree.set(position, popularity)
+            if self._bumped is not None:
+                self._bumped.add(item_id)
+
+    def search(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Retourne le contenu (avec la popularité) des limit éléments les plus populaires dont une clé commence par prefix.
+        """
+        start = time.perf_counter()
+        prefix = normalize_text(prefix)
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            found = self._sorted.top(prefix, limit, skip=self._pending)
+            # Zone d'attente : parcours complet, bornée par max_pending
+            for item_id, keys in self._pending.items():
+                if any(key.startswith(prefix) for key in keys):
+                    found[item_id] = self._popularity.get(item_id, 0)
+            best = heapq.nsmallest(limit, found, key=lambda item_id: (-found[item_id], self._items[item_id][0]))
+            results = [dict(self._items[item_id][1], popularity=found[item_id]) for item_id in best]
+            self._stats["queries"] += 1
+            self._stats["last_query_ms"] = (time.perf_counter() - start) * 1000
+        return results
+
+    def compact(self) -> None:
+        """
+        Construit un tableau trié à jour puis vide la zone d'attente, sans bloquer les recherches pendant la construction.
+        """
+        with self._lock:
+            items = dict(self._items)
+            popularity = dict(self._popularity)
+            pending = dict(self._pending)
+            self._bumped = set()
+        sorted_keys = _SortedKeys(items, popularity)
+        with self._lock:
+            # Seuls les éléments modifiés pendant la construction restent en attente
+            self._pending = {
+                item_id: keys for item_id, keys in self._pending.items() if pending.get(item_id) is not keys
+            }
+            for item_id in self._bumped:
+                if item_id in self._items and item_id not in self._pending:
+                    for position in sorted_keys.positions(item_id, self._items[item_id][0]):
+                        sorted_keys.tree.set(position, self._popularity[item_id])
+            self._bumped = None
+            self._sorted = sorted_keys
+            self._stats["compactions"] += 1
+
+    def _maybe_compact(self) -> None:
+        if len(self._pending) > self.max_pending and self._compaction is None:
+            self._compaction = threading.Thread(target=self._compact_in_background, daemon=True)
+            self._compaction.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        finally:
+            with self._lock:
+                self._compaction = None
+
+    def memory_bytes(self) -> int:
+        """
+        Estime la mémoire occupée par l'index (clés, tableaux, contenu renvoyé).
+        """
+        with self._lock:
+            # Les chaînes des clés sont partagées avec le tableau trié : seules les listes sont comptées ici
+            items = sys.getsizeof(self._items) + sum(
+                sys.getsizeof(entry) + sys.getsizeof(keys) + sys.getsizeof(payload)
+                + sum(sys.getsizeof(value) for value in payload.values())
+                for entry in self._items.values()
+                for keys, payload in [entry]
+            )
+            return items + self._sorted.memory_bytes + sys.getsizeof(self._popularity)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques de l'index (taille, mémoire, durée de construction, recherches).
+        """
+        memory = self.memory_bytes()
+        with self._lock:
+            return dict(
+                self._stats,
+                name=self.name,
+                ready=self._ready,
+                items=len(self._items),
+                keys=len(self._sorted.keys),
+                pending=len(self._pending),
+                memory_bytes=memory,
+            )
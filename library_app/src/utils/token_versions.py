@@ -0,0 +1,95 @@
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import threading
+import time
+
+
+class TokenVersionTable:
+    """
+    Versions de token par utilisateur, gardées en mémoire pour le mode « fast path ».
+
+    Un token qui embarque ses droits n'est accepté sans lecture de la table user
+    que si sa version correspond à celle connue ici. La table est rechargée
+    depuis la base au démarrage puis périodiquement ; les modifications faites
+    par ce processus (désactivation, changement de rôle, suppression) y sont
+    appliquées immédiatement.
+    """
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._versions: Dict[int, int] = {}
+        self._revoked: Set[int] = set()
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stats = {"fast_path": 0, "fallbacks": 0, "reloads": 0}
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded_at is not None
+
+    def needs_reload(self) -> bool:
+        """
+        Indique si la table n'a jamais été chargée ou si son dernier chargement est trop ancien.
+        """
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at >= self.refresh_interval
+
+    def load(self, rows: Iterable[Tuple[int, int]]) -> None:
+        """
+        Remplace la table par les versions lues en base (couples id, version).
+        """
+        loaded = dict(rows)
+        with self._lock:
+            for user_id, version in self._versions.items():
+                # Les versions ne font que croître : une lecture antérieure à une modification locale ne l'annule pas
+                if user_id in loaded and version > loaded[user_id]:
+                    loaded[user_id] = version
+            for user_id in self._revoked:
+                loaded.pop(user_id, None)
+            self._versions = loaded
+            self._loaded_at = time.monotonic()
+            self._stats["reloads"] += 1
+
+    def set(self, user_id: int, version: int) -> None:
+        """
+        Enregistre la version courante d'un utilisateur.
+        """
+        with self._lock:
+            if version >= self._versions.get(user_id, 0) and user_id not in self._revoked:
+                self._versions[user_id] = version
+
+    def revoke(self, user_id: int) -> None:
+        """
+        Retire un utilisateur supprimé : ses tokens ne passent plus par le fast path.
+        """
+        with self._lock:
+            self._versions.pop(user_id, None)
+            self._revoked.add(user_id)
+
+    def reset(self) -> None:
+        """
+        Vide la table : tous les tokens repassent par la base jusqu'au prochain chargement.
+        """
+        with self._lock:
+            self._versions = {}
+            self._revoked = set()
+            self._loaded_at = None
+
+    def matches(self, user_id: int, version: int) -> bool:
+        """
+        Retourne True si la version du token est celle connue pour l'utilisateur.
+        """
+        with self._lock:
+            matched = self._loaded_at is not None and self._versions.get(user_id) == version
+            self._stats["fast_path" if matched else "fallbacks"] += 1
+        return matched
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques de la table (taille, tokens acceptés sans requête, replis sur la base).
+        """
+        with self._lock:
+            return dict(
+                self._stats,
+                users=len(self._versions),
+                revoked=len(self._revoked),
+                age_seconds=time.monotonic() - self._loaded_at if self._loaded_at is not None else None,
+            )
@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository, book_suggestions
+from src.utils.security import create_access_token
+
+
+def create_fixtures(db_session: Session):
+    admin = User(
+        email="async_admin@example.com",
+        hashed_password="hashed_password",
+        full_name="Async Admin",
+        is_active=True,
+        is_admin=True
+    )
+    category = Category(name="Roman")
+    book = Book(
+        title="Le Petit Prince",
+        author="Antoine de Saint-Exupéry",
+        isbn="9782070612758",
+        publication_year=1943,
+        quantity=2,
+        categories=[category]
+    )
+    db_session.add_all([admin, book])
+    db_session.flush()
+    loan = Loan(
+        user_id=admin.id,
+        book_id=book.id,
+        loan_date=datetime.utcnow(),
+        due_date=datetime.utcnow() + timedelta(days=14)
+    )
+    db_session.add(loan)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=admin.id)}"}
+    return admin, book, loan, headers
+
+
+def test_async_book_routes(client, db_session: Session):
+    """
+    Teste les routes de lecture des livres servies par la session asynchrone.
+    """
+    _, book, _, headers = create_fixtures(db_session)
+
+    page = client.get("/api/v1/books/", headers=headers).json()
+    assert page["total"] == 1
+    assert page["items"][0]["categories"][0]["name"] == "Roman"
+
+    response = client.get(f"/api/v1/books/{book.id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["isbn"] == "9782070612758"
+    assert client.get("/api/v1/books/999", headers=headers).status_code == 404
+
+    page = client.get("/api/v1/books/search/", params={"query": "prince"}, headers=headers).json()
+    assert [item["id"] for item in page["items"]] == [book.id]
+
+    # Recherche plein texte combinée aux filtres auteur et année
+    params = {"query": "pet", "author": "exupery", "publication_year": 1943}
+    page = client.get("/api/v1/books/search/", params=params, headers=headers).json()
+    assert page["total"] == 1
+    params["publication_year"] = 1944
+    assert client.get("/api/v1/books/search/", params=params, headers=headers).json()["total"] == 0
+
+
+def test_async_loan_routes(client, db_session: Session):
+    """
+    Teste les routes de lecture des emprunts servies par la session asynchrone.
+    """
+    admin, book, loan, headers = create_fixtures(db_session)
+
+    assert [item["id"] for item in client.get("/api/v1/loans/", headers=headers).json()] == [loan.id]
+    assert client.get(f"/api/v1/loans/{loan.id}", headers=headers).json()["book_id"] == book.id
+    assert len(client.get("/api/v1/loans/active/", headers=headers).json()) == 1
+    assert client.get("/api/v1/loans/overdue/", headers=headers).json() == []
+    assert len(client.get(f"/api/v1/loans/user/{admin.id}", headers=headers).json()) == 1
+    assert len(client.get(f"/api/v1/loans/book/{book.id}", headers=headers).json()) == 1
+
+
+def test_fuzzy_search_route(client, db_session: Session):
+    """
+    Teste la recherche tolérante aux fautes de /books/search/ (fuzzy=true).
+    """
+    _, book, _, headers = create_fixtures(db_session)
+    BookRepository(Book, db_session).create(obj_in={
+        "title": "Vol de nuit", "author": "Antoine de Saint-Exupéry", "isbn": "9782070360253",
+        "publication_year": 1931, "quantity": 1
+    })
+
+    params = {"query": "Saint-Exupery vol de nui", "fuzzy": "true"}
+    page = client.get("/api/v1/books/search/", params=params, headers=headers).json()
+    # Livre de create_fixtures inséré directement, sans trigrammes : seul le livre créé par le repository est indexé
+    assert [item["isbn"] for item in page["items"]] == ["9782070360253"]
+    assert page["total"] == 1
+
+    params = {"query": "Germinal", "fuzzy": "true"}
+    assert client.get("/api/v1/books/search/", params=params, headers=headers).json()["total"] == 0
+
+
+def test_cursor_pagination_routes(client, db_session: Session):
+    """
+    Teste la pagination par curseur de /books/ et /books/search/ (next_cursor, prev_cursor).
+    """
+    _, book, _, headers = create_fixtures(db_session)
+    repository = BookRepository(Book, db_session)
+    for i, title in enumerate(("Germinal", "Nana", "L'Assommoir")):
+        repository.create(obj_in={
+            "title": title, "author": "Émile Zola", "isbn": f"978207036{i:04d}", "publication_year": 1880, "quantity": 1
+        })
+
+    params = {"limit": 2, "sort_by": "title"}
+    first = client.get("/api/v1/books/search/", params=params, headers=headers).json()
+    assert first["prev_cursor"] is None
+    second = client.get("/api/v1/books/search/", params=dict(params, cursor=first["next_cursor"]), headers=headers).json()
+    # Titre normalisé renseigné aussi pour le livre de create_fixtures, inséré sans le repository
+    assert [item["title"] for item in first["items"] + second["items"]] == [
+        "Germinal", "L'Assommoir", "Le Petit Prince", "Nana"
+    ]
+    assert second["page"] == 2 and second["next_cursor"] is None
+    # Pas de COUNT en mode curseur, sauf with_total
+    assert (second["total"], second["pages"]) == (None, None)
+    params_total = dict(params, cursor=first["next_cursor"], with_total="true")
+    total = client.get("/api/v1/books/search/", params=params_total, headers=headers).json()
+    assert (total["total"], total["pages"], total["items"]) == (4, 2, second["items"])
+    back = client.get("/api/v1/books/search/", params=dict(params, cursor=second["prev_cursor"]), headers=headers).json()
+    assert back["items"] == first["items"]
+
+    page = client.get("/api/v1/books/", params={"limit": 3, "cursor": first["next_cursor"]}, headers=headers)
+    assert page.status_code == 400
+    page = client.get("/api/v1/books/", params={"limit": 3}, headers=headers).json()
+    page = client.get("/api/v1/books/", params={"limit": 3, "cursor": page["next_cursor"]}, headers=headers).json()
+    assert [item["title"] for item in page["items"]] == ["L'Assommoir"]
+
+    # Classement par pertinence : pas de curseur
+    page = client.get("/api/v1/books/search/", params={"query": "zola", "limit": 2}, headers=headers).json()
+    assert page["next_cursor"] is None
+    params = {"query": "zola", "cursor": first["next_cursor"]}
+    assert client.get("/api/v1/books/search/", params=params, headers=headers).status_code == 400
+
+
+def test_suggest_books(client, db_session: Session):
+    """
+    Teste l'autocomplétion : lecture en base avant construction de l'index, puis index en mémoire.
+    """
+    _, book, _, headers = create_fixtures(db_session)
+    expected = {
+        "id": book.id, "title": "Le Petit Prince", "author": "Antoine de Saint-Exupéry",
+        "isbn": "9782070612758", "popularity": 1
+    }
+
+    # Index construit au démarrage de l'application sur une autre base
+    book_suggestions.reset()
+    response = client.get("/api/v1/books/suggest", params={"q": "978207"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [expected]
+
+    # ISBN à clé de contrôle X : même résultat en base et dans l'index, X saisi en minuscule ou non
+    other = Book(title="Vol de nuit", author="Antoine de Saint-Exupéry", isbn="207036024X", publication_year=1931, quantity=1)
+    db_session.add(other)
+    db_session.commit()
+    for q in ("207036024X", " 207036024x"):
+        assert [item["id"] for item in client.get("/api/v1/books/suggest", params={"q": q}, headers=headers).json()] == [other.id]
+
+    BookRepository(Book, db_session).rebuild_suggestions()
+    try:
+        assert client.get("/api/v1/books/suggest", params={"q": "SAINT-EX"}, headers=headers).json()[0] == expected
+        assert client.get("/api/v1/books/suggest", params={"q": "zola"}, headers=headers).json() == []
+        for q in ("207036024X", " 207036024x"):
+            assert [item["id"] for item in client.get("/api/v1/books/suggest", params={"q": q}, headers=headers).json()] == [other.id]
+    finally:
+        book_suggestions.reset()
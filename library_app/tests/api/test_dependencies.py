@@ -0,0 +1,129 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models.users import User
+from src.repositories.users import token_versions
+from src.utils.security import create_access_token
+
+
+def create_user(db_session: Session, email: str, is_admin: bool = False) -> User:
+    user = User(
+        email=email,
+        hashed_password="hashed_password",
+        full_name="Auth Test User",
+        is_active=True,
+        is_admin=is_admin
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def count_user_selects(db_session: Session, func) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM user" in statement:
+            statements.append(statement)
+
+    # Tous les moteurs : les routes async def lisent par la session asynchrone
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        func()
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+def test_principal_cache_skips_user_lookup(client, db_session: Session):
+    """
+    Teste qu'un token déjà vérifié n'entraîne plus de requête sur la table user.
+    """
+    user = create_user(db_session, "principal@example.com")
+    headers = {"Authorization": f"Bearer {create_access_token(subject=user.id)}"}
+
+    assert count_user_selects(db_session, lambda: client.get("/api/v1/books/", headers=headers)) == 1
+    assert count_user_selects(db_session, lambda: client.get("/api/v1/books/", headers=headers)) == 0
+
+
+def test_async_route_reads_user_on_async_session(client, db_session: Session):
+    """
+    Teste qu'une route async def vérifie l'utilisateur par la session asynchrone, sans session synchrone.
+    """
+    user = create_user(db_session, "async_principal@example.com")
+    headers = {"Authorization": f"Bearer {create_access_token(subject=user.id)}"}
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert count_user_selects(db_session, lambda: client.get("/api/v1/books/", headers=headers)) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == []
+
+
+def test_principal_cache_invalidated_on_user_update(client, db_session: Session):
+    """
+    Teste que la désactivation d'un utilisateur invalide son identité en cache.
+    """
+    admin = create_user(db_session, "admin_principal@example.com", is_admin=True)
+    user = create_user(db_session, "deactivated@example.com")
+    admin_headers = {"Authorization": f"Bearer {create_access_token(subject=admin.id)}"}
+    user_headers = {"Authorization": f"Bearer {create_access_token(subject=user.id)}"}
+
+    assert client.get("/api/v1/books/", headers=user_headers).status_code == 200
+
+    response = client.put(f"/api/v1/users/{user.id}", json={"is_active": False}, headers=admin_headers)
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/books/", headers=user_headers).status_code == 400
+
+
+def fast_path_headers(user: User) -> dict:
+    claims = {"is_active": user.is_active, "is_admin": user.is_admin, "ver": user.token_version}
+    return {"Authorization": f"Bearer {create_access_token(subject=user.id, claims=claims)}"}
+
+
+def test_fast_path_token_skips_user_lookup(client, db_session: Session, monkeypatch):
+    """
+    Teste qu'un token porteur de droits à jour n'entraîne aucune requête sur la table user.
+    """
+    monkeypatch.setattr(settings, "TOKEN_FAST_PATH", True)
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_TTL", 0)
+    token_versions.reset()
+    user = create_user(db_session, "fast@example.com")
+    headers = fast_path_headers(user)
+
+    # Premier appel : chargement de la table des versions
+    assert client.get("/api/v1/books/", headers=headers).status_code == 200
+    assert count_user_selects(db_session, lambda: client.get("/api/v1/books/", headers=headers)) == 0
+    token_versions.reset()
+
+
+def test_fast_path_token_rejected_after_demotion(client, db_session: Session, monkeypatch):
+    """
+    Teste qu'un changement de rôle rend les droits embarqués dans les tokens existants caducs.
+    """
+    monkeypatch.setattr(settings, "TOKEN_FAST_PATH", True)
+    token_versions.reset()
+    admin = create_user(db_session, "fast_admin@example.com", is_admin=True)
+    demoted = create_user(db_session, "demoted@example.com", is_admin=True)
+    admin_headers = fast_path_headers(admin)
+    demoted_headers = fast_path_headers(demoted)
+
+    assert client.get("/api/v1/stats/cache", headers=demoted_headers).status_code == 200
+
+    response = client.put(f"/api/v1/users/{demoted.id}", json={"is_admin": False}, headers=admin_headers)
+    assert response.status_code == 200
+
+    # La version a changé : le token repasse par la base, qui ne le reconnaît plus comme admin
+    assert client.get("/api/v1/stats/cache", headers=demoted_headers).status_code == 403
+    assert client.get("/api/v1/books/", headers=demoted_headers).status_code == 200
+    token_versions.reset()
@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .test_async_routes import create_fixtures
+
+
+@contextmanager
+def count_queries(db_session: Session):
+    """
+    Compte les requêtes SQL émises sur le moteur de la session pendant le bloc.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_book_writes_query_count(client, db_session: Session):
+    """
+    Teste qu'une écriture de livre ne relit pas la ligne écrite (pas de SELECT de rafraîchissement).
+    """
+    _, book, _, headers = create_fixtures(db_session)
+
+    with count_queries(db_session) as statements:
+        response = client.post(
+            "/api/v1/books/",
+            json={"title": "Vol de nuit", "author": "Saint-Exupéry", "isbn": "9782070360253",
+                  "publication_year": 1931, "quantity": 3},
+            headers=headers
+        )
+    assert response.status_code == 201
+    assert response.json()["id"] is not None
+    # Identité (première requête du token), INSERT, trigrammes (un seul executemany), catégories du livre renvoyé
+    assert len(statements) == 4
+
+    with count_queries(db_session) as statements:
+        response = client.put(f"/api/v1/books/{book.id}", json={"quantity": 4}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 4
+    # SELECT du livre + UPDATE
+    assert len(statements) == 2
+
+
+def test_loan_writes_query_count(client, db_session: Session):
+    """
+    Teste le nombre de requêtes des écritures d'emprunt.
+    """
+    admin, book, loan, headers = create_fixtures(db_session)
+
+    with count_queries(db_session) as statements:
+        response = client.post(f"/api/v1/loans/{loan.id}/return", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["return_date"] is not None
+    # Identité, SELECT et UPDATE de l'emprunt, UPDATE conditionnel du stock
+    assert len(statements) == 4
+
+    with count_queries(db_session) as statements:
+        response = client.post(
+            "/api/v1/loans/", params={"user_id": admin.id, "book_id": book.id}, headers=headers
+        )
+    assert response.status_code == 201
+    # Utilisateur, UPDATE conditionnel du stock, EXISTS et COUNT d'éligibilité, INSERT de l'emprunt
+    assert len(statements) == 5
+
+
+def test_user_writes_query_count(client, db_session: Session):
+    """
+    Teste qu'une écriture d'utilisateur tient en une requête d'écriture.
+    """
+    _, _, _, headers = create_fixtures(db_session)
+
+    with count_queries(db_session) as statements:
+        response = client.post(
+            "/api/v1/users/",
+            json={"email": "count@example.com", "password": "password123", "full_name": "Count"},
+            headers=headers
+        )
+    assert response.status_code == 201
+    # Identité puis INSERT : le filtre d'existence évite la vérification de l'email
+    assert len(statements) == 2
+
+    with count_queries(db_session) as statements:
+        response = client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed"
+    # Utilisateur courant (objet ORM) + UPDATE
+    assert len(statements) == 2
@@ -0,0 +1,36 @@
+from sqlalchemy.orm import Session
+
+from .test_async_routes import create_fixtures
+
+
+def test_stats_refreshed_after_loan_write(client, db_session: Session):
+    """
+    Teste que les statistiques en cache sont invalidées par un emprunt, un retour ou un nouvel utilisateur.
+    """
+    admin, book, loan, headers = create_fixtures(db_session)
+
+    stats = client.get("/api/v1/stats/general", headers=headers).json()
+    assert (stats["total_loans"], stats["active_loans"], stats["total_books"]) == (1, 1, 2)
+    # Servi depuis le cache tant qu'aucune écriture n'est validée
+    assert client.get("/api/v1/stats/general", headers=headers).json() == stats
+    assert client.get("/api/v1/stats/monthly-loans", headers=headers).json()[0]["loan_count"] == 1
+
+    response = client.post(f"/api/v1/loans/{loan.id}/return", headers=headers)
+    assert response.status_code == 200
+    stats = client.get("/api/v1/stats/general", headers=headers).json()
+    assert (stats["total_loans"], stats["active_loans"], stats["total_books"]) == (1, 0, 3)
+
+    response = client.post("/api/v1/loans/", params={"user_id": admin.id, "book_id": book.id}, headers=headers)
+    assert response.status_code == 201
+    stats = client.get("/api/v1/stats/general", headers=headers).json()
+    assert (stats["total_loans"], stats["active_loans"], stats["total_books"]) == (2, 1, 2)
+    assert client.get("/api/v1/stats/monthly-loans", headers=headers).json()[0]["loan_count"] == 2
+    assert client.get("/api/v1/stats/most-borrowed-books", headers=headers).json()[0]["loan_count"] == 2
+
+    response = client.post(
+        "/api/v1/users/",
+        json={"email": "stats_reader@example.com", "password": "secret123", "full_name": "Stats Reader"},
+        headers=headers
+    )
+    assert response.status_code == 201
+    assert client.get("/api/v1/stats/general", headers=headers).json()["total_users"] == 2
@@ -1,10 +1,14 @@
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from src.models.base import Base
-from src.db.session import get_db
+from src.db.session import get_async_db, get_db, get_read_db
+from src.db.sqlite import enable_sqlite_query_only
 from src.main import app
+from src.utils.cache import invalidate_cache
 
 
 # Créer une base de données SQLite en mémoire pour les tests
@@ -12,7 +16,20 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Même base pour les routes asynchrones (sans pool : chaque TestClient a sa propre boucle)
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+# Lecture seule, comme le moteur asynchrone de l'application
+enable_sqlite_query_only(async_engine.sync_engine)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Les résultats mis en cache ne doivent pas survivre d'un test à l'autre
+    invalidate_cache()
+    yield
 
 
 @pytest.fixture(scope="function")
@@ -40,7 +57,13 @@ def client(db_session):
         finally:
             pass
 
+    async def get_test_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_read_db] = get_test_db
+    app.dependency_overrides[get_async_db] = get_test_async_db
 
     from fastapi.testclient import TestClient
     with TestClient(app) as client:
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.services.stats import StatsService
+
+
+def query_plan(db_session: Session, run: Callable[[], object]) -> str:
+    """
+    Exécute run() puis retourne le plan (EXPLAIN QUERY PLAN) de la dernière requête émise.
+    """
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    statement, parameters = executed[-1]
+    rows = db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+    return "\n".join(row[-1] for row in rows)
+
+
+def create_loans(db_session: Session) -> List[int]:
+    """
+    Crée un historique d'emprunts majoritairement rendus, puis met à jour les statistiques du planificateur.
+    """
+    users = [
+        User(email=f"plan{i}@example.com", hashed_password="x", full_name="Plan", is_active=True)
+        for i in range(5)
+    ]
+    books = [
+        Book(title=f"Plan {i}", author="Auteur", isbn=f"{7770000000000 + i}", publication_year=2000, quantity=5)
+        for i in range(5)
+    ]
+    db_session.add_all(users + books)
+    db_session.flush()
+    now = datetime.utcnow()
+    for day in range(40):
+        for user in users:
+            for book in books:
+                # Seuls les emprunts du dernier jour sont encore en cours
+                returned = None if day == 0 else now - timedelta(days=day)
+                db_session.add(Loan(
+                    user_id=user.id, book_id=book.id, loan_date=now - timedelta(days=day + 20),
+                    due_date=now - timedelta(days=day + 6), return_date=returned
+                ))
+    db_session.commit()
+    db_session.connection().exec_driver_sql("ANALYZE")
+    return [user.id for user in users]
+
+
+def test_active_loan_queries_use_partial_indexes(db_session: Session):
+    """
+    Teste que les requêtes sur les emprunts en cours utilisent les index partiels.
+    """
+    user_ids = create_loans(db_session)
+    repository = LoanRepository(Loan, db_session)
+
+    plan = query_plan(db_session, lambda: repository.get_active_loans_by_user(user_id=user_ids[0]))
+    assert "USING INDEX idx_loan_active_user_book" in plan
+
+    plan = query_plan(db_session, lambda: repository.has_active_loan(user_id=user_ids[0], book_id=1))
+    assert "idx_loan_active_user_book" in plan
+
+    plan = query_plan(db_session, lambda: repository.count_active_loans_by_user(user_id=user_ids[0]))
+    assert "idx_loan_active_user_book" in plan
+
+    plan = query_plan(db_session, repository.get_overdue_loans)
+    assert "USING INDEX idx_loan_active_due_date" in plan
+
+
+def test_stats_queries_use_indexes(db_session: Session):
+    """
+    Teste que les requêtes de statistiques sur les emprunts ne parcourent pas toute la table.
+    """
+    create_loans(db_session)
+    # Cache vidé avant chaque test : chaque appel exécute ses requêtes
+    service = StatsService(db_session)
+
+    plan = query_plan(db_session, service.get_monthly_loans)
+    assert "idx_loan_loan_date" in plan
+
+    plan = query_plan(db_session, service.get_most_borrowed_books)
+    assert "idx_loan_book_id" in plan
+
+    plan = query_plan(db_session, service.get_general_stats)
+    # Dernière requête : nombre d'emprunts en retard
+    assert "idx_loan_active_due_date" in plan
+
+
+def test_title_lookup_uses_normalized_index(db_session: Session):
+    """
+    Teste que la recherche par début de titre parcourt un intervalle de l'index de la colonne normalisée.
+    """
+    repository = BookRepository(Book, db_session)
+    for i in range(300):
+        repository.create(obj_in={
+            "title": f"Tome {i}", "author": "Auteur", "isbn": f"{8880000000000 + i}",
+            "publication_year": 2000, "quantity": 1
+        })
+    db_session.connection().exec_driver_sql("ANALYZE")
+
+    plan = query_plan(db_session, lambda: repository.get_by_title(title="Tome 12"))
+    assert "USING INDEX ix_book_title_norm (title_norm>? AND title_norm<?)" in plan
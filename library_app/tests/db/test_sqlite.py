@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from src.db.sqlite import (
+    configure_sqlite, enable_sqlite_query_only, log_sqlite_pragmas, read_pragmas, resolve_pragmas
+)
+
+
+def test_fast_profile_applied_on_connect(tmp_path):
+    """
+    Teste l'application du profil « fast » à chaque connexion.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'fast.db'}")
+    configure_sqlite(engine, "fast")
+
+    pragmas = read_pragmas(engine, ["journal_mode", "synchronous", "busy_timeout", "cache_size", "temp_store"])
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 5000,
+        "cache_size": -64_000,
+        "temp_store": 2,  # MEMORY
+    }
+    assert log_sqlite_pragmas(engine, "fast")["journal_mode"] == "wal"
+    engine.dispose()
+
+
+def test_profile_overrides():
+    """
+    Teste la surcharge d'un pragma et le rejet d'un profil inconnu.
+    """
+    pragmas = resolve_pragmas("safe", {"busy_timeout": 100})
+    assert pragmas["busy_timeout"] == 100
+    assert pragmas["synchronous"] == "full"
+
+    with pytest.raises(ValueError):
+        resolve_pragmas("turbo")
+
+
+def test_query_only_engine_rejects_writes(tmp_path):
+    """
+    Teste que le moteur des lectures lit la base mais refuse toute écriture.
+    """
+    path = tmp_path / "read.db"
+    writer = create_engine(f"sqlite:///{path}")
+    configure_sqlite(writer, "safe")
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE book (id INTEGER PRIMARY KEY)")
+        conn.exec_driver_sql("INSERT INTO book (id) VALUES (1)")
+
+    reader = create_engine(f"sqlite:///{path}")
+    configure_sqlite(reader, "safe")
+    enable_sqlite_query_only(reader)
+    assert read_pragmas(reader, ["query_only", "journal_mode"]) == {"query_only": 1, "journal_mode": "wal"}
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM book").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("INSERT INTO book (id) VALUES (2)")
+    reader.dispose()
+    writer.dispose()
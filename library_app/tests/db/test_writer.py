@@ -0,0 +1,268 @@
+import threading
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.db import writer
+from src.db.sqlite import enable_sqlite_savepoints
+from src.db.unit_of_work import UnitOfWork
+from src.db.writer import WriteCoordinator, WriteQueueFull, start_write_coordinator, stop_write_coordinator
+from src.models.books import Book
+from src.repositories.base import DEFER_COMMIT
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+from src.utils.security import create_access_token
+
+
+def writer_factory(db_session: Session) -> sessionmaker:
+    return sessionmaker(autoflush=False, expire_on_commit=False, bind=db_session.get_bind())
+
+
+def insert_book(index: int):
+    def unit(session: Session) -> int:
+        book = Book(title=f"Livre {index}", author="Auteur", isbn=f"{index:013d}", publication_year=2000, quantity=1)
+        session.add(book)
+        session.commit()
+        return book.id
+    return unit
+
+
+def test_concurrent_writes_are_serialized(db_session: Session):
+    """
+    Teste que les écritures de plusieurs threads passent toutes par l'écrivain unique.
+    """
+    coordinator = WriteCoordinator(writer_factory(db_session))
+    coordinator.start()
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(coordinator.run(insert_book(i))))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    coordinator.stop()
+
+    assert len(set(results)) == 20
+    assert db_session.query(Book).count() == 20
+    stats = coordinator.stats()
+    assert stats["completed"] == 20
+    assert stats["failed"] == 0
+    assert 1 <= stats["batches"] <= 20
+
+
+def test_unit_error_propagates_and_is_isolated(db_session: Session):
+    """
+    Teste qu'une unité en échec est annulée sans affecter les suivantes.
+    """
+    coordinator = WriteCoordinator(writer_factory(db_session))
+    coordinator.start()
+
+    def failing(session: Session):
+        session.add(Book(title="Annulé", author="Auteur", isbn="0000000000099", publication_year=2000, quantity=1))
+        session.flush()
+        raise ValueError("refusé")
+
+    with pytest.raises(ValueError):
+        coordinator.run(failing)
+    coordinator.run(insert_book(1))
+    coordinator.stop()
+
+    assert [book.title for book in db_session.query(Book).all()] == ["Livre 1"]
+    assert coordinator.stats()["failed"] == 1
+
+
+def test_queue_full_rejects(db_session: Session):
+    """
+    Teste le rejet des unités au-delà de la taille de la file.
+    """
+    coordinator = WriteCoordinator(writer_factory(db_session), max_queue=1)
+    coordinator.start()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(session: Session):
+        started.set()
+        release.wait(5)
+
+    try:
+        running = coordinator.submit(blocking)
+        started.wait(5)
+        queued = coordinator.submit(blocking)
+        with pytest.raises(WriteQueueFull):
+            coordinator.submit(blocking)
+    finally:
+        release.set()
+    running.result(5)
+    queued.result(5)
+    coordinator.stop()
+    assert coordinator.stats()["rejected"] == 1
+
+
+def test_loan_route_through_coordinator(client, db_session: Session):
+    """
+    Teste la création d'un emprunt par l'API quand le coordinateur est démarré.
+    """
+    admin = User(email="writer@example.com", hashed_password="x", full_name="Writer", is_active=True, is_admin=True)
+    book = Book(title="Livre", author="Auteur", isbn="9782070612758", publication_year=2000, quantity=1)
+    db_session.add_all([admin, book])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=admin.id)}"}
+
+    start_write_coordinator(writer_factory(db_session))
+    try:
+        response = client.post(
+            "/api/v1/loans/", params={"user_id": admin.id, "book_id": book.id}, headers=headers
+        )
+        assert response.status_code == 201, response.text
+        assert writer.write_coordinator.stats()["completed"] == 1
+    finally:
+        stop_write_coordinator()
+
+    db_session.refresh(book)
+    assert book.quantity == 0
+
+
+def test_group_commit_isolates_failures(db_session: Session):
+    """
+    Teste qu'un lot partage un commit tandis qu'une unité en échec est seule annulée.
+    """
+    engine = create_engine(str(db_session.get_bind().url), connect_args={"check_same_thread": False})
+    enable_sqlite_savepoints(engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    user = User(email="group@example.com", hashed_password="x", full_name="Group", is_active=True)
+    books = [
+        Book(title=f"Livre {i}", author="Auteur", isbn=f"{i:013d}", publication_year=2000, quantity=1)
+        for i in range(5)
+    ]
+    db_session.add_all([user, *books])
+    db_session.commit()
+
+    def create_loan(book_id: int, fail: bool = False):
+        def unit(session: Session):
+            service = LoanService(
+                LoanRepository(Loan, session), BookRepository(Book, session), UserRepository(User, session)
+            )
+            loan = service.create_loan(user_id=user.id, book_id=book_id)
+            if fail:
+                raise ValueError("refusé")
+            return loan
+        return unit
+
+    coordinator = WriteCoordinator(factory, group_commit=True, group_max_size=16, group_window=0.2)
+    coordinator.start()
+    futures = [coordinator.submit(create_loan(book.id)) for book in books[:4]]
+    # L'unité échoue après avoir écrit l'emprunt et décrémenté le stock
+    futures.append(coordinator.submit(create_loan(books[4].id, fail=True)))
+    for future in futures[:4]:
+        assert future.result(5).id is not None
+    with pytest.raises(ValueError):
+        futures[4].result(5)
+    coordinator.stop()
+    engine.dispose()
+
+    assert db_session.query(Loan).count() == 4
+    db_session.expire_all()
+    assert [book.quantity for book in db_session.query(Book).order_by(Book.id)] == [0, 0, 0, 0, 1]
+    stats = coordinator.stats()
+    assert stats["completed"] == 4
+    assert stats["failed"] == 1
+    assert stats["commits"] < 5
+
+
+def test_after_commit_skips_rolled_back_units(db_session: Session):
+    """
+    Teste que les callbacks after_commit d'une unité annulée ne s'exécutent pas, dans un lot comme après un rollback.
+    """
+    engine = create_engine(str(db_session.get_bind().url), connect_args={"check_same_thread": False})
+    enable_sqlite_savepoints(engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+    called = []
+
+    def unit(index: int, fail: bool = False):
+        def run(session: Session):
+            repository = BookRepository(Book, session)
+            repository.after_commit(lambda: called.append(index))
+            session.add(Book(title=f"Livre {index}", author="Auteur", isbn=f"{index:013d}", publication_year=2000, quantity=1))
+            repository.commit()
+            if fail:
+                raise ValueError("refusé")
+        return run
+
+    coordinator = WriteCoordinator(factory, group_commit=True, group_max_size=16, group_window=0.2)
+    coordinator.start()
+    futures = [coordinator.submit(unit(1)), coordinator.submit(unit(2, fail=True)), coordinator.submit(unit(3))]
+    futures[0].result(5)
+    with pytest.raises(ValueError):
+        futures[1].result(5)
+    futures[2].result(5)
+    coordinator.stop()
+    engine.dispose()
+    assert sorted(called) == [1, 3]
+
+    # Transaction annulée puis nouvelle transaction validée sur la même session
+    called.clear()
+    with pytest.raises(ValueError):
+        with UnitOfWork(db_session):
+            unit(4, fail=True)(db_session)
+    with UnitOfWork(db_session):
+        unit(5)(db_session)
+    assert called == [5]
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_group_commit_failure_replays_only_successful_units(db_session: Session):
+    """
+    Teste le repli après l'échec du commit groupé : seules les unités réussies sont rejouées, les échecs gardent leur exception.
+    """
+    engine = create_engine(str(db_session.get_bind().url), connect_args={"check_same_thread": False})
+    enable_sqlite_savepoints(engine)
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    @event.listens_for(factory, "before_commit")
+    def fail_group_commit(session: Session):
+        if session.info.get(DEFER_COMMIT) and not session.in_nested_transaction():
+            raise RuntimeError("disque plein")
+
+    runs = []
+
+    def unit(index: int, error: Optional[BaseException] = None):
+        def run(session: Session) -> int:
+            runs.append(index)
+            if error is not None:
+                raise error
+            book = Book(title=f"Livre {index}", author="Auteur", isbn=f"{index:013d}", publication_year=2000, quantity=1)
+            session.add(book)
+            BookRepository(Book, session).commit()
+            return book.id
+        return run
+
+    coordinator = WriteCoordinator(factory, group_commit=True, group_max_size=16, group_window=0.2)
+    coordinator.start()
+    futures = [
+        coordinator.submit(unit(1)),
+        coordinator.submit(unit(2, ValueError("refusé"))),
+        coordinator.submit(unit(3, Interrupted())),
+    ]
+    assert futures[0].result(5) is not None
+    with pytest.raises(ValueError):
+        futures[1].result(5)
+    with pytest.raises(Interrupted):
+        futures[2].result(5)
+    # L'écrivain survit à une BaseException levée par une unité
+    assert coordinator.running
+    coordinator.stop()
+    engine.dispose()
+
+    assert sorted(runs) == [1, 1, 2, 3]
+    assert coordinator.stats()["group_fallbacks"] == 1
@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from src.models.books import Book
@@ -103,6 +104,39 @@ def test_search_books(db_session: Session):
     assert isbn_books[0].isbn == "2222222222222"
 
 
+
+def test_full_text_search(db_session: Session):
+    """
+    Teste l'index plein texte : préfixes, accents, classement par pertinence et synchronisation.
+    """
+    repository = BookRepository(Book, db_session)
+    novel = repository.create(obj_in={
+        "title": "L'Élève du professeur",
+        "author": "Marie Martin",
+        "isbn": "6666666666661",
+        "publication_year": 2001,
+        "quantity": 1
+    })
+    repository.create(obj_in={
+        "title": "Carnets",
+        "author": "Paul Élève",
+        "isbn": "6666666666662",
+        "publication_year": 2002,
+        "quantity": 1
+    })
+
+    # Préfixe, sans accent ni majuscule : le titre pèse plus que l'auteur
+    assert [book.isbn for book in repository.search(query="elev")] == ["6666666666661", "6666666666662"]
+    assert [book.isbn for book in repository.get_by_author(author="eleve")] == ["6666666666662"]
+    assert repository.search(query="*") == []
+
+    # L'index suit les modifications et suppressions
+    repository.update(db_obj=novel, obj_in={"title": "Le Professeur"})
+    assert [book.isbn for book in repository.get_by_title(title="eleve")] == []
+    assert [book.isbn for book in repository.get_by_title(title="professeur")] == ["6666666666661"]
+    repository.remove(id=novel.id)
+    assert repository.get_by_title(title="professeur") == []
+
 def test_book_categories(db_session: Session):
     """
     Teste les relations entre livres et catégories.
@@ -144,4 +178,153 @@ def test_book_categories(db_session: Session):
     # Vérifier que la catégorie a été supprimée
     book_with_categories = book_repository.get_with_categories(id=book.id)
     assert len(book_with_categories.categories) == 1
-    assert book_with_categories.categories[0].name == "Python"
\ No newline at end of file
+    assert book_with_categories.categories[0].name == "Python"
+
+
+def test_get_stats_cached_across_repositories(db_session: Session):
+    """
+    Teste la mise en cache des statistiques entre instances de repository et leur invalidation.
+    """
+    repository = BookRepository(Book, db_session)
+    repository.create(obj_in={
+        "title": "Stats Book",
+        "author": "Stats Author",
+        "isbn": "5555555555555",
+        "publication_year": 2020,
+        "quantity": 4
+    })
+
+    stats = repository.get_stats()
+    assert stats["unique_books"] == 1
+    assert stats["total_books"] == 4
+
+    # Ajout hors repository : le résultat en cache est réutilisé par une autre instance
+    db_session.add(Book(title="Hidden", author="Hidden", isbn="6666666666666", publication_year=2021, quantity=1))
+    db_session.commit()
+    assert BookRepository(Book, db_session).get_stats()["unique_books"] == 1
+
+    # Une écriture via le repository invalide le tag "books"
+    repository.create(obj_in={
+        "title": "Another Book",
+        "author": "Stats Author",
+        "isbn": "7777777777777",
+        "publication_year": 2022,
+        "quantity": 2
+    })
+    stats = BookRepository(Book, db_session).get_stats()
+    assert stats["unique_books"] == 3
+    assert stats["total_books"] == 7
+
+
+def test_update_writes_only_changed_columns(db_session: Session):
+    """
+    Teste que la mise à jour n'écrit que les colonnes modifiées et ignore une mise à jour sans effet.
+    """
+    repository = BookRepository(Book, db_session)
+    book = repository.create(obj_in={
+        "title": "Diff Book",
+        "author": "Diff Author",
+        "isbn": "5555555555555",
+        "publication_year": 2020,
+        "description": "x" * 10_000,
+        "quantity": 5
+    })
+    updated_at = book.updated_at
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        repository.update(db_obj=book, obj_in={"title": "Diff Book", "description": "x" * 10_000})
+        assert statements == []
+        assert book.updated_at == updated_at
+
+        repository.update(db_obj=book, obj_in={"title": "Diff Book", "quantity": 4})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    updates = [statement for statement in statements if statement.startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "quantity" in updates[0]
+    assert "title" not in updates[0]
+    assert "description" not in updates[0]
+    assert book.quantity == 4
+
+
+def test_normalized_columns(db_session: Session):
+    """
+    Teste les colonnes normalisées : tenue à jour à l'écriture et recherches sans accents ni majuscules.
+    """
+    repository = BookRepository(Book, db_session)
+    book = repository.create(obj_in={
+        "title": "Les Misérables",
+        "author": "Victor HUGO",
+        "isbn": "7777777777771",
+        "publication_year": 2000,
+        "quantity": 1
+    })
+    assert (book.title_norm, book.author_norm) == ("les miserables", "victor hugo")
+
+    # Début du titre ou de l'auteur, quelle que soit la graphie
+    assert [b.isbn for b in repository.get_by_title(title="LES MISÉ")] == ["7777777777771"]
+    assert [b.isbn for b in repository.get_by_author(author="victor hu")] == ["7777777777771"]
+    assert repository.get_by_title(title="   ") == []
+    # Fragment en milieu de mot : repli sur la recherche de sous-chaîne
+    assert [b.isbn for b in repository.get_by_title(title="SÉRABLE")] == ["7777777777771"]
+    assert [b.isbn for b in repository.get_by_author(author="ugo")] == ["7777777777771"]
+    assert repository.get_by_title(title="%") == []
+
+    # Livre écrit sans le repository : colonnes renseignées à l'insertion et à la mise à jour
+    other = Book(title="Vingt mille lieues", author="Jules Verne", isbn="7777777777772", publication_year=2000, quantity=1)
+    db_session.add(other)
+    db_session.commit()
+    assert (other.title_norm, other.author_norm) == ("vingt mille lieues", "jules verne")
+    other.author = "Jules VERNE-Éditions"
+    db_session.commit()
+    assert other.author_norm == "jules verne-editions"
+
+    # Colonnes renormalisées avec le titre modifié
+    repository.update(db_obj=book, obj_in={"title": "Œuvres complètes"})
+    assert (book.title_norm, book.author_norm) == ("oeuvres completes", "victor hugo")
+    assert [b.isbn for b in repository.get_by_title(title="oeuvres")] == ["7777777777771"]
+    assert repository.get_by_title(title="les mise") == []
+
+
+def test_fuzzy_search(db_session: Session):
+    """
+    Teste la recherche par trigrammes : fautes de frappe, classement et mise à jour incrémentale.
+    """
+    repository = BookRepository(Book, db_session)
+    miserables = repository.create(obj_in={
+        "title": "Les Misérables",
+        "author": "Victor Hugo",
+        "isbn": "8888888888881",
+        "publication_year": 2000,
+        "quantity": 1
+    })
+    repository.create(obj_in={
+        "title": "Misery",
+        "author": "Stephen King",
+        "isbn": "8888888888882",
+        "publication_year": 2000,
+        "quantity": 1
+    })
+
+    # Introuvables par l'index plein texte, retrouvés par trigrammes
+    assert repository.search(query="Hugoo") == []
+    assert [book.isbn for book in repository.fuzzy_search(query="Hugoo")] == ["8888888888881"]
+    # "misery" partage la moitié des trigrammes : retenu au seuil de 0.5, mais classé après
+    assert [book.isbn for book in repository.fuzzy_search(query="Miserable")] == ["8888888888881", "8888888888882"]
+    scores = repository.fuzzy_scores(query="misery")
+    assert [book_id for book_id, _ in scores][0] != miserables.id and scores[0][1] == 1.0
+    assert repository.fuzzy_search(query="zola") == [] and repository.fuzzy_search(query="!") == []
+
+    repository.update(db_obj=miserables, obj_in={"author": "Émile Zola"})
+    assert repository.fuzzy_search(query="Hugoo") == []
+    assert [book.isbn for book in repository.fuzzy_search(query="Zolla")] == ["8888888888881"]
+    repository.remove(id=miserables.id)
+    assert repository.fuzzy_search(query="Zolla") == []
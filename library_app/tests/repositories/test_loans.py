@@ -127,4 +127,24 @@ def test_get_overdue_loans(db_session: Session):
     db_session.add(overdue_loan)
     db_session.commit()
     overdue_loans = loan_repository.get_overdue_loans()
-    assert any(l.id == overdue_loan.id for l in overdue_loans)
\ No newline at end of file
+    assert any(l.id == overdue_loan.id for l in overdue_loans)
+
+def test_active_loan_eligibility_checks(db_session: Session):
+    """
+    Teste les vérifications d'éligibilité en SQL (emprunt en cours, nombre d'emprunts actifs).
+    """
+    loan_repository = LoanRepository(Loan, db_session)
+    user, book = create_user_and_book(db_session)
+    now = datetime.utcnow()
+    db_session.add_all([
+        Loan(user_id=user.id, book_id=book.id, loan_date=now - timedelta(days=20),
+             due_date=now - timedelta(days=6), return_date=now - timedelta(days=7)),
+        Loan(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14)),
+    ])
+    db_session.commit()
+
+    assert loan_repository.has_active_loan(user_id=user.id, book_id=book.id) is True
+    assert loan_repository.has_active_loan(user_id=user.id, book_id=book.id + 1) is False
+    assert loan_repository.count_active_loans_by_user(user_id=user.id) == 1
+    assert loan_repository.count_active_loans_by_user(user_id=user.id + 1) == 0
+    assert [loan.return_date for loan in loan_repository.get_active_loans_by_user(user_id=user.id)] == [None]
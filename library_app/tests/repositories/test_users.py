@@ -2,7 +2,8 @@ import pytest
 from sqlalchemy.orm import Session
 
 from src.models.users import User
-from src.repositories.users import UserRepository
+from src.db.unit_of_work import UnitOfWork
+from src.repositories.users import UserRepository, token_versions
 
 def test_create_user(db_session: Session):
     """
@@ -82,4 +83,30 @@ def test_delete_user(db_session: Session):
     user = repository.create(obj_in=user_data)
     deleted = repository.remove(id=user.id)
     assert deleted.id == user.id
-    assert repository.get(id=user.id) is None
\ No newline at end of file
+    assert repository.get(id=user.id) is None
+
+
+def test_token_version_applied_after_commit(db_session: Session):
+    """
+    Teste que la version de token en mémoire ne change qu'une fois la mise à jour validée.
+    """
+    repository = UserRepository(User, db_session)
+    user = repository.create(obj_in={
+        "email": "version@example.com", "hashed_password": "hashed_password", "full_name": "Version", "is_active": True
+    })
+    # Table vidée : test_delete_user a pu révoquer le même identifiant
+    token_versions.reset()
+    token_versions.load([(user.id, 0)])
+    try:
+        with pytest.raises(ValueError):
+            with UnitOfWork(db_session):
+                repository.update(db_obj=user, obj_in={"token_version": user.token_version + 1})
+                raise ValueError("annulé")
+        assert token_versions.matches(user.id, 0)
+
+        with UnitOfWork(db_session):
+            repository.update(db_obj=db_session.get(User, user.id), obj_in={"token_version": 1})
+            assert token_versions.matches(user.id, 0)
+        assert token_versions.matches(user.id, 1)
+    finally:
+        token_versions.reset()
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from src.models.books import Book as BookModel
-from src.repositories.books import BookRepository
+from src.repositories.books import BookRepository, isbn_filter
 from src.services.books import BookService
 from src.api.schemas.books import BookCreate, BookUpdate
 
@@ -257,4 +257,64 @@ def test_search_books(db_session: Session):
 
     # Assert
     assert len(python_books) == 2
-    assert all("Python" in book.title for book in python_books)
\ No newline at end of file
+    assert all("Python" in book.title for book in python_books)
+
+def test_create_book_duplicate_isbn_with_existence_filter(db_session: Session):
+    """
+    Test du contrôle d'unicité de l'ISBN une fois le filtre d'existence construit.
+    """
+    # Arrange
+    repository = BookRepository(BookModel, db_session)
+    service = BookService(repository)
+    repository.rebuild_isbn_filter()
+
+    book_data = {
+        "title": "Filtered Book",
+        "author": "Filter Author",
+        "isbn": "1234567890123",
+        "publication_year": 2023,
+        "quantity": 1
+    }
+
+    # Act
+    service.create(obj_in=BookCreate(**book_data))
+
+    # Assert
+    assert repository.isbn_exists(isbn="1234567890123") is True
+    assert repository.isbn_exists(isbn="9999999999999") is False
+    with pytest.raises(ValueError):
+        service.create(obj_in=BookCreate(**book_data))
+
+    # ISBN inséré sans passer par le repository (autre worker) : la contrainte d'unicité prend le relais
+    db_session.add(BookModel(**dict(book_data, isbn="5555555555555")))
+    db_session.commit()
+    with pytest.raises(ValueError):
+        service.create(obj_in=BookCreate(**dict(book_data, isbn="5555555555555")))
+
+    isbn_filter.reset()
+
+
+def test_update_quantity(db_session: Session):
+    """
+    Teste la mise à jour atomique de la quantité, refusée si elle deviendrait négative.
+    """
+    repository = BookRepository(BookModel, db_session)
+    service = BookService(repository)
+    book = service.create(obj_in=BookCreate(
+        title="Stock Book",
+        author="Stock Author",
+        isbn="4444444444444",
+        publication_year=2023,
+        quantity=2
+    ))
+
+    assert service.update_quantity(book_id=book.id, quantity_change=3).quantity == 5
+    assert service.update_quantity(book_id=book.id, quantity_change=-5).quantity == 0
+
+    with pytest.raises(ValueError):
+        service.update_quantity(book_id=book.id, quantity_change=-1)
+    with pytest.raises(ValueError):
+        service.update_quantity(book_id=999, quantity_change=1)
+
+    db_session.refresh(book)
+    assert book.quantity == 0
@@ -1,5 +1,8 @@
+import threading
+
 import pytest
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
 from datetime import datetime, timedelta
 
 from src.models.loans import Loan as LoanModel
@@ -350,4 +353,121 @@ def test_get_overdue_loans(db_session: Session):
     assert overdue_loans[0].user_id == user.id
     assert overdue_loans[0].book_id == book1.id
     assert overdue_loans[0].due_date < datetime.utcnow()
-    assert overdue_loans[0].return_date is None
\ No newline at end of file
+    assert overdue_loans[0].return_date is None
+
+
+def _make_user_and_book(db_session: Session, isbn: str):
+    user = UserModel(
+        email=f"uow_{isbn}@example.com",
+        hashed_password="hashed_password",
+        full_name="Unit Of Work User",
+        is_active=True
+    )
+    book = BookModel(
+        title="Unit Of Work Book",
+        author="Unit Of Work Author",
+        isbn=isbn,
+        publication_year=2023,
+        quantity=2
+    )
+    db_session.add_all([user, book])
+    db_session.commit()
+    return user, book
+
+
+def test_create_loan_commits_once(db_session: Session):
+    """
+    Teste que la création d'un emprunt (emprunt + stock) ne fait qu'un seul commit.
+    """
+    service = LoanService(
+        LoanRepository(LoanModel, db_session),
+        BookRepository(BookModel, db_session),
+        UserRepository(UserModel, db_session)
+    )
+    user, book = _make_user_and_book(db_session, "1111111111111")
+
+    commits = []
+
+    def count_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", count_commit)
+    try:
+        service.create_loan(user_id=user.id, book_id=book.id)
+    finally:
+        event.remove(db_session, "after_commit", count_commit)
+
+    assert len(commits) == 1
+    db_session.refresh(book)
+    assert book.quantity == 1
+
+
+def test_create_loan_is_atomic(db_session: Session, monkeypatch):
+    """
+    Teste qu'un échec de l'insertion de l'emprunt annule aussi la réservation de l'exemplaire.
+    """
+    loan_repository = LoanRepository(LoanModel, db_session)
+    service = LoanService(
+        loan_repository,
+        BookRepository(BookModel, db_session),
+        UserRepository(UserModel, db_session)
+    )
+    user, book = _make_user_and_book(db_session, "2222222222222")
+
+    def failing_create(**kwargs):
+        raise RuntimeError("insertion impossible")
+
+    monkeypatch.setattr(loan_repository, "create", failing_create)
+    with pytest.raises(RuntimeError):
+        service.create_loan(user_id=user.id, book_id=book.id)
+
+    assert db_session.query(LoanModel).count() == 0
+    db_session.refresh(book)
+    assert book.quantity == 2
+
+
+def test_concurrent_loans_do_not_oversell(db_session: Session):
+    """
+    Teste que des emprunts concurrents sur le même livre ne prêtent pas plus d'exemplaires qu'il n'y en a.
+    """
+    copies = 3
+    users = [
+        UserModel(email=f"stress{i}@example.com", hashed_password="hashed_password", full_name="Stress", is_active=True)
+        for i in range(12)
+    ]
+    book = BookModel(title="Stress Book", author="Stress Author", isbn="3333333333333",
+                     publication_year=2023, quantity=copies)
+    db_session.add_all(users + [book])
+    db_session.commit()
+
+    factory = sessionmaker(autoflush=False, expire_on_commit=False, bind=db_session.get_bind())
+    barrier = threading.Barrier(len(users))
+    outcomes = []
+
+    def borrow(user_id: int):
+        session = factory()
+        service = LoanService(
+            LoanRepository(LoanModel, session),
+            BookRepository(BookModel, session),
+            UserRepository(UserModel, session)
+        )
+        barrier.wait()
+        try:
+            service.create_loan(user_id=user_id, book_id=book.id)
+            outcomes.append("created")
+        except ValueError:
+            outcomes.append("refused")
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=borrow, args=(user.id,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count("created") == copies
+    assert outcomes.count("refused") == len(users) - copies
+    assert db_session.query(LoanModel).count() == copies
+    db_session.refresh(book)
+    assert book.quantity == 0
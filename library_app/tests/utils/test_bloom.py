@@ -0,0 +1,44 @@
+from src.utils.bloom import BloomFilter, ExistenceFilter
+
+
+def test_bloom_filter_no_false_negatives():
+    """
+    Teste qu'un élément ajouté est toujours reconnu et que le taux de faux positifs reste borné.
+    """
+    bloom = BloomFilter(expected_items=1000, false_positive_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"isbn-{i}")
+
+    assert all(f"isbn-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    assert bloom.estimated_false_positive_rate() < 0.02
+
+
+def test_existence_filter():
+    """
+    Teste le filtre d'existence : absent certain, cache négatif et ajout.
+    """
+    existence = ExistenceFilter("test", expected_items=100, false_positive_rate=0.01)
+
+    # Filtre non construit : la base doit être consultée
+    assert existence.might_exist("a@example.com") is True
+
+    existence.rebuild(["a@example.com", "b@example.com"], count=2)
+    assert existence.might_exist("a@example.com") is True
+    assert existence.might_exist("c@example.com") is False
+
+    # Absence confirmée en base : mémorisée dans le cache négatif
+    existence.record_missing("a@example.com")
+    assert existence.might_exist("a@example.com") is False
+
+    existence.add("a@example.com")
+    existence.add("d@example.com")
+    assert existence.might_exist("a@example.com") is True
+    assert existence.might_exist("d@example.com") is True
+
+    stats = existence.stats()
+    assert stats["ready"] is True
+    assert stats["bloom_negatives"] == 1
+    assert stats["negative_cache_hits"] == 1
+    assert stats["memory_bytes"] > 0
@@ -0,0 +1,234 @@
+import threading
+import time
+
+from src.utils.cache import LRUCache, cache, cache_info, invalidate_cache, invalidate_tags, shutdown_cache
+
+
+def test_lru_eviction_by_entry_count():
+    """
+    Teste l'éviction de l'entrée la moins récemment utilisée.
+    """
+    store = LRUCache(max_entries=2, max_bytes=1024 * 1024)
+    store.set("a", 1)
+    store.set("b", 2)
+
+    # "a" devient la plus récente
+    assert store.get("a") == 1
+    store.set("c", 3)
+
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+    assert store.stats()["evictions"] == 1
+
+
+def test_byte_budget():
+    """
+    Teste le respect du budget en octets.
+    """
+    store = LRUCache(max_entries=100, max_bytes=2000)
+    for i in range(20):
+        store.set(i, "x" * 200)
+
+    stats = store.stats()
+    assert stats["bytes"] <= 2000
+    assert stats["entries"] < 20
+    assert store.get(19) is not None
+
+    # Une valeur plus grande que le budget n'est pas stockée
+    store.set("big", "x" * 5000)
+    assert store.get("big") is None
+
+
+def test_ttl_expiry_and_sweep():
+    """
+    Teste l'expiration des entrées et leur retrait incrémental.
+    """
+    store = LRUCache(max_entries=100, max_bytes=1024 * 1024)
+    for i in range(10):
+        store.set(i, i, ttl=0.01)
+    store.set("durable", "ok", ttl=60)
+    time.sleep(0.02)
+
+    assert store.get(0) is None
+    assert store.sweep() == 10
+    assert len(store) == 1
+    assert store.get("durable") == "ok"
+
+
+def test_stats_hit_ratio():
+    """
+    Teste les métriques de succès et d'échec.
+    """
+    store = LRUCache(max_entries=10, max_bytes=1024 * 1024)
+    store.set("key", {"value": 1})
+    store.get("key")
+    store.get("key")
+    store.get("missing")
+
+    stats = store.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert abs(stats["hit_ratio"] - 2 / 3) < 1e-9
+
+
+def test_generation_invalidation():
+    """
+    Teste l'invalidation d'une entrée par changement de génération.
+    """
+    store = LRUCache(max_entries=10, max_bytes=1024 * 1024)
+    stamp = store.generations(("ns",))
+    store.set("key", "value", stamp=stamp)
+    assert store.get("key", stamp=store.generations(("ns",))) == "value"
+
+    store.bump("ns")
+    assert store.get("key", stamp=store.generations(("ns",))) is None
+    assert store.stats()["invalidations"] == 1
+
+
+def test_cache_decorator_tags():
+    """
+    Teste l'invalidation des résultats du décorateur par tag et par préfixe.
+    """
+    calls = []
+
+    @cache(expiry=60, tags=("test-books",))
+    def compute(value):
+        calls.append(value)
+        return value * 2
+
+    assert compute(2) == 4
+    assert compute(2) == 4
+    assert len(calls) == 1
+
+    invalidate_tags("test-books")
+    assert compute(2) == 4
+    assert len(calls) == 2
+
+    invalidate_tags("other")
+    compute(2)
+    assert len(calls) == 2
+
+    invalidate_cache(compute.__module__)
+    compute(2)
+    assert len(calls) == 3
+
+    invalidate_cache()
+    compute(2)
+    assert len(calls) == 4
+
+
+def test_cache_key_ignores_self_and_session():
+    """
+    Teste que la clé ignore l'instance et la session, et applique les valeurs par défaut.
+    """
+    calls = []
+
+    class Repository:
+        def __init__(self, db):
+            self.db = db
+
+        @cache(expiry=60)
+        def get_page(self, *, skip: int = 0, limit: int = 100):
+            calls.append((skip, limit))
+            return [skip, limit]
+
+    Repository(db=object()).get_page()
+    Repository(db=object()).get_page(skip=0)
+    Repository(db=object()).get_page(limit=100)
+    assert len(calls) == 1
+
+    Repository(db=object()).get_page(skip=10)
+    assert len(calls) == 2
+
+
+def test_cache_key_args():
+    """
+    Teste la sélection explicite des arguments composant la clé.
+    """
+    calls = []
+
+    @cache(expiry=60, key_args=("user_id",))
+    def get_loans(db, user_id: int, request_id: str = ""):
+        calls.append(user_id)
+        return user_id
+
+    get_loans(object(), 1, request_id="a")
+    get_loans(object(), 1, request_id="b")
+    get_loans(object(), user_id=2)
+    assert calls == [1, 2]
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """
+    Teste qu'un seul appelant recalcule une clé manquante.
+    """
+    calls = []
+    release = threading.Event()
+
+    @cache(expiry=60, single_flight=True)
+    def slow_stats():
+        calls.append(1)
+        release.wait(5)
+        return {"total": 42}
+
+    coalesced_before = cache_info()["single_flight"]["coalesced"]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(slow_stats())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"total": 42}] * 8
+    assert cache_info()["single_flight"]["coalesced"] - coalesced_before == 7
+
+
+def test_single_flight_timeout_serves_previous_value():
+    """
+    Teste qu'un appelant qui attend trop longtemps reçoit la valeur précédente.
+    """
+    release = threading.Event()
+    values = iter(["old", "new"])
+
+    @cache(expiry=0.05, single_flight=True, lock_timeout=0.05)
+    def refresh():
+        value = next(values)
+        if value == "new":
+            release.wait(5)
+        return value
+
+    assert refresh() == "old"
+    time.sleep(0.06)
+
+    leader = threading.Thread(target=refresh)
+    leader.start()
+    time.sleep(0.02)
+    assert refresh() == "old"
+    release.set()
+    leader.join()
+
+
+def test_stale_while_revalidate():
+    """
+    Teste qu'une valeur périmée est servie immédiatement puis recalculée en arrière-plan.
+    """
+    values = iter([1, 2])
+
+    @cache(expiry=60, stale_after=0.05)
+    def counter():
+        return next(values)
+
+    assert counter() == 1
+    time.sleep(0.06)
+
+    # TTL souple dépassé : l'ancienne valeur est servie sans attendre
+    assert counter() == 1
+    deadline = time.monotonic() + 2
+    while cache_info()["background_refresh"]["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert counter() == 2
+    shutdown_cache()
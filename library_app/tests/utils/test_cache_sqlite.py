@@ -0,0 +1,97 @@
+from datetime import date
+import os
+import subprocess
+import sys
+import time
+
+from src.utils.cache import normalize_key_part
+from src.utils.cache_sqlite import SQLiteCacheBackend, stable_key_repr
+
+
+def test_values_shared_between_workers(tmp_path):
+    """
+    Teste que deux instances sur le même fichier (deux workers) partagent les valeurs.
+    """
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+
+    worker_a.set(("stats", ()), {"total_books": 12}, ttl=60)
+    assert worker_b.get(("stats", ())) == {"total_books": 12}
+
+    worker_b.delete(("stats", ()))
+    assert worker_a.get(("stats", ())) is None
+
+
+def test_invalidation_reaches_other_workers(tmp_path):
+    """
+    Teste qu'une invalidation par génération faite par un worker est vue par les autres.
+    """
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+    scopes = ("*", "tag:books")
+
+    worker_a.set("key", "value", stamp=worker_a.generations(scopes))
+    assert worker_b.get("key", stamp=worker_b.generations(scopes)) == "value"
+
+    worker_b.bump("tag:books")
+    assert worker_a.generations(scopes) == (0, 1)
+    assert worker_a.get("key", stamp=worker_a.generations(scopes)) is None
+
+
+def test_expiry_and_capacity(tmp_path):
+    """
+    Teste l'expiration, le TTL souple et la limite du nombre d'entrées.
+    """
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=5)
+    backend.set("short", 1, ttl=0.01)
+    backend.set("soft", 2, ttl=60, stale_after=0.01)
+    time.sleep(0.02)
+
+    assert backend.get("short") is None
+    assert backend.peek("short") == 1
+    assert backend.lookup("soft") == (2, False)
+    assert backend.sweep() == 1
+
+    for i in range(10):
+        backend.set(i, i, ttl=60 + i)
+    backend._trim()
+    assert backend.stats()["entries"] == 5
+    assert backend.get(9) == 9
+
+
+def test_only_stable_keys_persisted(tmp_path):
+    """
+    Teste que seules les clés de représentation stable entre processus sont stockées.
+    """
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+
+    # Adresse mémoire dans le repr (object.__repr__) : clé propre au processus, non mise en cache
+    opaque = ("stats", normalize_key_part(object()))
+    assert stable_key_repr(opaque) is None
+    backend.set(opaque, "value", ttl=60)
+    assert backend.get(opaque) is None
+    assert backend.delete(opaque) is False
+
+    # Argument non hachable : repr conservé pour le cache en mémoire, refusé ici
+    unhashable = ("stats", normalize_key_part(bytearray(b"x")))
+    assert unhashable == ("stats", "bytearray(b'x')")
+    assert stable_key_repr(unhashable) is None
+
+    # Même clé dans un autre processus, avec un autre hachage des chaînes (ordre des frozensets)
+    key = ("books", normalize_key_part({"title", "author", "isbn"}), date(2024, 1, 31), ("bool", True), None, 1.5)
+    backend.set(key, "value", ttl=60)
+    script = (
+        "from datetime import date; from src.utils.cache import normalize_key_part; "
+        "from src.utils.cache_sqlite import stable_key_repr; "
+        "print(stable_key_repr(('books', normalize_key_part({'title', 'author', 'isbn'}), "
+        "date(2024, 1, 31), ('bool', True), None, 1.5)))"
+    )
+    for seed in ("1", "2"):
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONHASHSEED=seed)
+        ).stdout.strip()
+        assert output == stable_key_repr(key)
+    assert backend.get(key) == "value"
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.utils.pagination import PaginationParams, paginate
+
+
+def walk(db: Session, params: PaginationParams):
+    """
+    Parcourt toutes les pages par next_cursor à partir de la première (OFFSET 0).
+    """
+    pages = [paginate(db.query(Book), params, Book)]
+    while pages[-1].next_cursor:
+        params.cursor = pages[-1].next_cursor
+        pages.append(paginate(db.query(Book), params, Book))
+    return pages
+
+
+def test_cursor_pagination(db_session: Session):
+    """
+    Teste la pagination par curseur : mêmes éléments que OFFSET, égalités et NULL compris, dans les deux sens.
+    """
+    # Titres en double et livres sans titre normalisé : l'identifiant départage.
+    # INSERT Core : les colonnes normalisées ne sont pas recalculées comme à une écriture ORM
+    db_session.execute(insert(Book.__table__), [
+        {
+            "title": f"Livre {i}", "author": "Auteur", "isbn": f"97800000000{i:02d}", "publication_year": 2000,
+            "quantity": 1, "title_norm": None if i % 5 == 0 else f"livre {i % 4}",
+        }
+        for i in range(23)
+    ])
+    db_session.commit()
+
+    for sort_by, sort_desc in ((None, False), ("title_norm", False), ("title_norm", True), ("publication_year", True)):
+        offset = [
+            paginate(db_session.query(Book), PaginationParams(skip=skip, limit=5, sort_by=sort_by, sort_desc=sort_desc), Book)
+            for skip in range(0, 25, 5)
+        ]
+        pages = walk(db_session, PaginationParams(limit=5, sort_by=sort_by, sort_desc=sort_desc))
+        assert [[book.id for book in page.items] for page in pages] == [[book.id for book in page.items] for page in offset]
+        assert [page.page for page in pages] == [1, 2, 3, 4, 5]
+        assert pages[0].prev_cursor is None and pages[-1].next_cursor is None
+        assert len({book.id for page in pages for book in page.items}) == 23
+        # Total compté pour la première page (OFFSET), puis seulement sur demande
+        assert pages[0].total == 23 and all(page.total is None and page.pages is None for page in pages[1:])
+
+        # Retour en arrière depuis la dernière page
+        params = PaginationParams(limit=5, sort_by=sort_by, sort_desc=sort_desc, cursor=pages[-1].prev_cursor)
+        previous = paginate(db_session.query(Book), params, Book)
+        assert previous.items == pages[-2].items
+        assert previous.page == 4
+        counted = paginate(db_session.query(Book), PaginationParams(
+            limit=5, sort_by=sort_by, sort_desc=sort_desc, cursor=pages[-1].prev_cursor, with_total=True
+        ), Book)
+        assert (counted.items, counted.total, counted.pages) == (previous.items, 23, 5)
+        params.cursor = previous.next_cursor
+        assert paginate(db_session.query(Book), params, Book).items == pages[-1].items
+
+    # Curseur illisible, obtenu avec un autre tri, ou sur une requête classée par pertinence
+    cursor = pages[0].next_cursor
+    with pytest.raises(ValueError):
+        paginate(db_session.query(Book), PaginationParams(limit=5, cursor="pas-un-curseur"), Book)
+    with pytest.raises(ValueError):
+        paginate(db_session.query(Book), PaginationParams(limit=5, sort_by="title_norm", cursor=cursor), Book)
+    with pytest.raises(ValueError):
+        params = PaginationParams(limit=5, sort_by="publication_year", sort_desc=True, cursor=cursor)
+        paginate(db_session.query(Book), params, Book, keyset=False)
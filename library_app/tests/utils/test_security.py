@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.utils import security
+from src.utils.security import (
+    PasswordHashingBusy,
+    get_password_hash,
+    get_password_hash_async,
+    hashing_info,
+    verify_password_async,
+)
+
+
+def test_async_hash_and_verify():
+    """
+    Teste le hachage et la vérification à travers le pool dédié.
+    """
+    async def run():
+        hashed = await get_password_hash_async("password123")
+        return (
+            await verify_password_async("password123", hashed),
+            await verify_password_async("wrong-password", hashed),
+        )
+
+    completed_before = hashing_info()["completed"]
+    assert asyncio.run(run()) == (True, False)
+    info = hashing_info()
+    assert info["completed"] - completed_before == 3
+    assert info["queued"] == 0
+    assert info["running"] == 0
+
+
+def test_async_hash_compatible_with_sync_verify():
+    """
+    Teste qu'un hash produit par le pool est vérifiable par la fonction synchrone.
+    """
+    hashed = asyncio.run(get_password_hash_async("password123"))
+    assert security.verify_password("password123", hashed)
+    assert asyncio.run(verify_password_async("password123", get_password_hash("password123")))
+
+
+def test_queue_full_rejects(monkeypatch):
+    """
+    Teste le rejet des calculs au-delà de la taille de la file d'attente.
+    """
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_QUEUE_SIZE", 1)
+    security.shutdown_password_hashing()
+
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    rejected_before = hashing_info()["rejected"]
+    try:
+        running = security._submit_hashing(blocking)
+        started.wait(5)
+        queued = security._submit_hashing(blocking)
+        with pytest.raises(PasswordHashingBusy):
+            security._submit_hashing(blocking)
+    finally:
+        release.set()
+    running.result(5)
+    queued.result(5)
+    assert hashing_info()["rejected"] - rejected_before == 1
+    security.shutdown_password_hashing()
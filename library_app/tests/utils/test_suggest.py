@@ -0,0 +1,80 @@
+import random
+
+from src.utils.suggest import PrefixIndex, suggestion_keys
+
+
+def make_index(books, popularity=None, max_pending=1000):
+    index = PrefixIndex("test", max_pending=max_pending)
+    index.rebuild(
+        ((id, suggestion_keys(title, author), {"id": id, "title": title}) for id, title, author in books),
+        popularity or {}
+    )
+    return index
+
+
+def test_suggestion_keys():
+    """
+    Teste les clés d'indexation : une par début de mot, sans accents ni majuscules.
+    """
+    assert suggestion_keys("L'Élève", None, "9782070612758") == ["l'eleve", "eleve", "9782070612758"]
+
+
+def test_prefix_index_ranks_by_popularity():
+    """
+    Teste que les suggestions sont les éléments les plus populaires, puis par ordre alphabétique.
+    """
+    index = make_index(
+        [(1, "Les Misérables", "Victor Hugo"), (2, "Misery", "Stephen King"), (3, "Mister Pip", "Lloyd Jones")],
+        popularity={2: 5, 3: 1}
+    )
+
+    assert [s["id"] for s in index.search("mis")] == [2, 3, 1]
+    assert [s["id"] for s in index.search("MIS", limit=1)] == [2]
+    assert [s["id"] for s in index.search("hugo")] == [1]
+    assert index.search("zola") == [] and index.search("  ") == []
+
+    index.increment(1, 10)
+    assert index.search("mis", limit=2) == [
+        {"id": 1, "title": "Les Misérables", "popularity": 10},
+        {"id": 2, "title": "Misery", "popularity": 5},
+    ]
+
+
+def test_prefix_index_incremental_updates():
+    """
+    Teste les ajouts, modifications et suppressions avant et après fusion de la zone d'attente.
+    """
+    index = make_index([(1, "Germinal", "Émile Zola")])
+
+    index.add(2, suggestion_keys("Nana", "Émile Zola"), {"id": 2, "title": "Nana"})
+    index.add(1, suggestion_keys("L'Assommoir", "Émile Zola"), {"id": 1, "title": "L'Assommoir"})
+    assert [s["title"] for s in index.search("emile")] == ["L'Assommoir", "Nana"]
+    assert index.search("germ") == []
+
+    # Fusion de la zone d'attente dans le tableau trié
+    index.add(3, suggestion_keys("Thérèse Raquin", "Émile Zola"), {"id": 3, "title": "Thérèse Raquin"})
+    index.compact()
+    assert index.stats()["compactions"] >= 1
+    index.remove(2)
+    assert [s["title"] for s in index.search("emile")] == ["L'Assommoir", "Thérèse Raquin"]
+    assert [s["title"] for s in index.search("ther")] == ["Thérèse Raquin"]
+
+    stats = index.stats()
+    assert stats["items"] == 2 and stats["pending"] == 1
+    assert stats["memory_bytes"] > 0 and stats["build_seconds"] >= 0
+
+
+def test_prefix_index_matches_brute_force():
+    """
+    Teste le classement par l'arbre de segments contre un parcours complet.
+    """
+    rng = random.Random(7)
+    words = ["ab", "abc", "abd", "b", "ba", "bac", "c"]
+    books = [(id, " ".join(rng.choices(words, k=2)), "") for id in range(1, 300)]
+    popularity = {id: rng.randint(0, 20) for id, _, _ in books}
+    index = make_index(books, popularity)
+
+    for prefix in ("a", "ab", "abc", "b", "ba", "c", "z"):
+        matching = [id for id, title, _ in books if any(key.startswith(prefix) for key in suggestion_keys(title))]
+        expected = sorted(popularity[id] for id in matching)[::-1][:10]
+        assert [s["popularity"] for s in index.search(prefix)] == expected